@@ -0,0 +1,7 @@
+"""Headless benchmarks over synthetic dialogue corpora"""
+
+from .corpus import CorpusConfig, generate_corpus, write_corpus
+from .runner import run_benchmarks
+
+__all__ = ['CorpusConfig', 'generate_corpus', 'write_corpus', 'run_benchmarks']
+
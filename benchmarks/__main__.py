@@ -0,0 +1,65 @@
+"""Command line entry point: python -m benchmarks"""
+
+import argparse
+import json
+import sys
+
+from .corpus import CorpusConfig, write_corpus
+from .runner import run_benchmarks
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse benchmark options"""
+    defaults = CorpusConfig()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the headless benchmarks")
+    parser.add_argument("--sizes", default="500,2000", help="Comma separated topic counts (default: 500,2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    parser.add_argument("--only", default="", help="Comma separated benchmark names to run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--write-corpus", metavar="FILE", help="Only write a corpus of the first size to FILE")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--branching", type=float, default=defaults.branching)
+    parser.add_argument("--trial-ratio", type=float, default=defaults.trial_ratio)
+    parser.add_argument("--condition-ratio", type=float, default=defaults.condition_ratio)
+    parser.add_argument("--condition-depth", type=int, default=defaults.condition_depth)
+    parser.add_argument("--broken-ratio", type=float, default=defaults.broken_ratio)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks and print or save the results"""
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    config = CorpusConfig(
+        topics=sizes[0],
+        branching=args.branching,
+        trial_ratio=args.trial_ratio,
+        condition_ratio=args.condition_ratio,
+        condition_depth=args.condition_depth,
+        broken_ratio=args.broken_ratio,
+        seed=args.seed,
+    )
+    
+    if args.write_corpus:
+        write_corpus(config, args.write_corpus)
+        return 0
+    
+    names = [name.strip() for name in args.only.split(",") if name.strip()] or None
+    try:
+        results = run_benchmarks(sizes, repeat=args.repeat, names=names, base_config=config,
+                                 log=lambda line: print(line, file=sys.stderr))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Seeded generator for synthetic talk_topic corpora"""
+
+import json
+import random
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List
+
+
+AREAS = ["MISSION", "SHOP", "FRIEND", "CAMP", "TRAIN", "RUMORS", "FACTION", "QUEST"]
+SPECIAL_TOPICS = ["TALK_DONE", "TALK_NONE", "TALK_TRAIN"]
+TRIAL_TYPES = ["PERSUADE", "LIE", "INTIMIDATE", "CONDITION"]
+WORDS = (
+    "the a you we they survivor camp road night fire food water ammo zombie trader "
+    "mission help need want know heard north south evac shelter quiet careful good "
+    "bad deal trust money work stay leave come back later now soon friend"
+).split()
+
+
+@dataclass
+class CorpusConfig:
+    """Shape of a generated corpus"""
+    topics: int = 1000
+    branching: float = 3.0  # Mean responses per topic
+    trial_ratio: float = 0.15  # Share of responses that are trials with success/failure
+    condition_ratio: float = 0.3  # Share of responses and dynamic lines with a condition
+    condition_depth: int = 2  # Nesting depth of and/or/not condition trees
+    special_ratio: float = 0.1  # Share of responses leading to TALK_DONE/TALK_NONE
+    broken_ratio: float = 0.0  # Share of responses pointing at missing topics
+    # Relative weights of dynamic_line shapes: plain string, random list, conditional dict
+    line_string: float = 0.6
+    line_list: float = 0.25
+    line_conditional: float = 0.15
+    seed: int = 1234
+
+
+class CorpusGenerator:
+    """Builds talk_topic JSON data that looks like real dialogue files"""
+    
+    def __init__(self, config: CorpusConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.topic_ids = self._make_ids()
+    
+    def _make_ids(self) -> List[str]:
+        """Create IDs grouped by area, like TALK_MISSION_12"""
+        ids = []
+        for i in range(self.config.topics):
+            area = AREAS[i % len(AREAS)]
+            ids.append(f"TALK_{area}_{i // len(AREAS)}")
+        return ids
+    
+    def sentence(self, low: int = 4, high: int = 14) -> str:
+        """Random sentence of filler words"""
+        words = [self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high))]
+        return " ".join(words).capitalize() + self.rng.choice([".", "?", "!"])
+    
+    def condition(self, depth: int) -> Dict[str, Any]:
+        """Random condition tree of the given depth"""
+        if depth <= 0:
+            kind = self.rng.randrange(5)
+            if kind == 0:
+                return {"u_has_var": f"var_{self.rng.randrange(50)}", "type": "dialogue", "context": "bench", "value": "yes"}
+            if kind == 1:
+                return {"npc_has_effect": self.rng.choice(["asked_to_follow", "npc_said", "bleed"])}
+            if kind == 2:
+                return {self.rng.choice(["u_male", "u_female", "npc_male", "npc_female"]): True}
+            if kind == 3:
+                return {"days_since_cataclysm": self.rng.randint(1, 60)}
+            return {"u_has_mission": f"MISSION_{self.rng.randrange(30)}"}
+        operator = self.rng.choice(["and", "or", "not"])
+        if operator == "not":
+            return {"not": self.condition(depth - 1)}
+        return {operator: [self.condition(depth - 1) for _ in range(self.rng.randint(2, 3))]}
+    
+    def dynamic_line(self) -> Any:
+        """Random dynamic_line in one of the three shapes"""
+        config = self.config
+        shape = self.rng.choices(
+            ["string", "list", "conditional"],
+            weights=[config.line_string, config.line_list, config.line_conditional]
+        )[0]
+        if shape == "string":
+            return self.sentence()
+        if shape == "list":
+            return [self.sentence() for _ in range(self.rng.randint(2, 4))]
+        line = {"yes": self.sentence(), "no": self.sentence()}
+        line.update(self.condition(self.rng.randint(0, max(0, config.condition_depth - 1))))
+        return line
+    
+    def target(self) -> str:
+        """Pick where a response leads"""
+        roll = self.rng.random()
+        if roll < self.config.special_ratio:
+            return self.rng.choice(SPECIAL_TOPICS)
+        if roll < self.config.special_ratio + self.config.broken_ratio:
+            return f"TALK_MISSING_{self.rng.randrange(1000)}"
+        return self.rng.choice(self.topic_ids)
+    
+    def response(self) -> Dict[str, Any]:
+        """Random response, sometimes a trial, sometimes conditional or with effects"""
+        response: Dict[str, Any] = {"text": self.sentence(2, 8)}
+        if self.rng.random() < self.config.trial_ratio:
+            trial_type = self.rng.choice(TRIAL_TYPES)
+            trial: Dict[str, Any] = {"type": trial_type}
+            if trial_type == "CONDITION":
+                trial["condition"] = self.condition(self.config.condition_depth)
+            else:
+                trial["difficulty"] = self.rng.randint(-5, 10)
+            response["trial"] = trial
+            response["success"] = {"topic": self.target()}
+            response["failure"] = {"topic": self.target()}
+            if self.rng.random() < 0.3:
+                response["success"]["effect"] = {"npc_add_effect": "asked_to_follow", "duration": 3600}
+        else:
+            response["topic"] = self.target()
+        if self.rng.random() < self.config.condition_ratio:
+            response["condition"] = self.condition(self.config.condition_depth)
+        return response
+    
+    def topic(self, topic_id: str) -> Dict[str, Any]:
+        """Random talk_topic"""
+        data: Dict[str, Any] = {"type": "talk_topic", "id": topic_id, "dynamic_line": self.dynamic_line()}
+        count = max(0, int(round(self.rng.gauss(self.config.branching, self.config.branching / 2))))
+        if count:
+            data["responses"] = [self.response() for _ in range(count)]
+        if self.rng.random() < 0.1:
+            data["speaker_effect"] = {"effect": {"npc_add_var": "met", "type": "dialogue", "context": "bench", "value": "yes"}}
+        return data
+    
+    def generate(self) -> List[Dict[str, Any]]:
+        """Generate the whole corpus"""
+        return [self.topic(topic_id) for topic_id in self.topic_ids]
+
+
+def generate_corpus(config: CorpusConfig) -> List[Dict[str, Any]]:
+    """Generate a corpus for a config (the same config always gives the same data)"""
+    return CorpusGenerator(config).generate()
+
+
+def write_corpus(config: CorpusConfig, path: str) -> None:
+    """Write a generated corpus as a dialogue JSON file"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_corpus(config), f, indent=2)
+
+
+def config_dict(config: CorpusConfig) -> Dict[str, Any]:
+    """Config as plain data for result files"""
+    return asdict(config)
@@ -0,0 +1,130 @@
+"""Benchmark registry, timing loop and JSON results"""
+
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .corpus import CorpusConfig, config_dict, write_corpus
+
+
+@dataclass
+class BenchContext:
+    """Inputs shared by the benchmarks of one corpus size"""
+    config: CorpusConfig
+    corpus_path: str
+    work_dir: str
+    _graph: Any = None
+    
+    @property
+    def graph(self):
+        """The corpus parsed once (benchmarks that mutate it must copy)"""
+        if self._graph is None:
+            from src.parsers.json_parser import JSONParser
+            self._graph = JSONParser.parse_file(self.corpus_path)
+        return self._graph
+    
+    def graph_manager(self):
+        """A fresh graph manager over the parsed corpus"""
+        from src.graph.graph_manager import GraphManager
+        return GraphManager(self.graph)
+
+
+# name -> (setup(context) returning the timed callable, max topics it is run at)
+BENCHMARKS: Dict[str, Any] = {}
+
+
+def benchmark(name: str, max_topics: Optional[int] = None):
+    """Register a benchmark; setup work happens outside the timed callable"""
+    def decorator(setup: Callable[[BenchContext], Callable[[], Any]]):
+        BENCHMARKS[name] = (setup, max_topics)
+        return setup
+    return decorator
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code version so results can be compared"""
+    info = {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        info["commit"] = None
+    return info
+
+
+def time_callable(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Run func repeat times and return each duration in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run_benchmarks(
+    sizes: List[int],
+    repeat: int = 5,
+    names: Optional[List[str]] = None,
+    base_config: Optional[CorpusConfig] = None,
+    log: Callable[[str], None] = print
+) -> Dict[str, Any]:
+    """Run the selected benchmarks for every corpus size"""
+    # Registers the benchmark functions
+    from . import suite  # noqa: F401
+    
+    base_config = base_config or CorpusConfig()
+    selected = names or list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            config = CorpusConfig(**{**config_dict(base_config), "topics": size})
+            corpus_path = os.path.join(work_dir, f"corpus_{size}.json")
+            write_corpus(config, corpus_path)
+            context = BenchContext(config=config, corpus_path=corpus_path, work_dir=work_dir)
+            
+            for name in selected:
+                setup, max_topics = BENCHMARKS[name]
+                if max_topics is not None and size > max_topics:
+                    log(f"{name} @ {size}: skipped (limit {max_topics} topics)")
+                    continue
+                func = setup(context)
+                durations = time_callable(func, repeat)
+                row = {
+                    "name": name,
+                    "topics": size,
+                    "repeat": repeat,
+                    "min_ms": round(min(durations), 3),
+                    "median_ms": round(statistics.median(durations), 3),
+                    "mean_ms": round(statistics.mean(durations), 3),
+                    "max_ms": round(max(durations), 3),
+                }
+                results.append(row)
+                log(f"{name} @ {size}: median {row['median_ms']:.2f} ms (min {row['min_ms']:.2f})")
+    
+    return {
+        "environment": environment(),
+        "corpus": config_dict(base_config),
+        "sizes": sizes,
+        "results": results,
+    }
@@ -0,0 +1,84 @@
+"""Editor startup time from process start to the first idle event"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .runner import environment
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child: build the main window and report the wall clock time once
+# Tk goes idle, which is after the first layout and draw have been processed
+CHILD = """
+import time
+from src.ui.main_window import MainWindow
+imported = time.time()
+app = MainWindow()
+def report():
+    print(imported, time.time(), flush=True)
+    app.destroy()
+app.after_idle(report)
+app.mainloop()
+"""
+
+
+def measure_once() -> dict:
+    """Start the editor in a fresh interpreter and time it to first idle"""
+    start = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else "editor failed to start")
+    imported, idle = (float(value) for value in completed.stdout.split()[-2:])
+    return {"import_ms": (imported - start) * 1000, "idle_ms": (idle - start) * 1000}
+
+
+def main(argv=None) -> int:
+    """Measure startup several times and print or save the results"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Time editor startup to the first idle event")
+    parser.add_argument("--repeat", type=int, default=5, help="editor launches to time (default: 5)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    runs = []
+    try:
+        # One untimed launch so bytecode caches are warm for every timed run
+        measure_once()
+        for _ in range(args.repeat):
+            runs.append(measure_once())
+    except (RuntimeError, subprocess.SubprocessError) as e:
+        print(f"Could not start the editor (is a display available?): {e}", file=sys.stderr)
+        return 1
+    
+    results = []
+    for key in ("import_ms", "idle_ms"):
+        values = [run[key] for run in runs]
+        results.append({
+            "name": f"startup.{key[:-3]}",
+            "repeat": args.repeat,
+            "min_ms": round(min(values), 3),
+            "median_ms": round(statistics.median(values), 3),
+            "mean_ms": round(statistics.mean(values), 3),
+            "max_ms": round(max(values), 3),
+        })
+        print(f"startup.{key[:-3]}: median {results[-1]['median_ms']:.1f} ms", file=sys.stderr)
+    
+    text = json.dumps({"environment": environment(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
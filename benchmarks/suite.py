@@ -0,0 +1,201 @@
+"""Benchmarks of the parser, validator, graph queries, layouts and scene building"""
+
+import copy
+import io
+import os
+
+from src.graph.layout import LayoutManager
+from src.graph.search import MODE_PREFIX, MODE_REGEX, MODE_SUBSTRING, SearchIndex
+from src.parsers.json_parser import JSONParser
+from src.parsers.parallel import validate_parallel
+from src.parsers.validator import IncrementalValidator, Validator
+from src.render.scene import build_scene
+from src.render.svg_writer import SVGWriter
+from src.simulation.engine import DialogueSimulator
+
+from .runner import BenchContext, benchmark
+
+
+SIMULATION_STEPS = 1000  # Responses chosen per simulator run
+
+# Queries over the corpus filler words, one per search mode
+SEARCH_QUERIES = [("evac shelter", MODE_SUBSTRING), ("trad", MODE_PREFIX), (r"zombie\w* road", MODE_REGEX)]
+
+# Pairwise-force layouts are quadratic per iteration, so they run with fewer
+# iterations than the editor defaults and are skipped on the largest corpora
+FORCE_MAX_TOPICS = 2000
+FORCE_ITERATIONS = 10
+
+
+@benchmark("parser.parse_file")
+def bench_parse_file(context: BenchContext):
+    return lambda: JSONParser.parse_file(context.corpus_path)
+
+
+@benchmark("parser.export_file")
+def bench_export_file(context: BenchContext):
+    graph = context.graph
+    path = os.path.join(context.work_dir, f"export_{context.config.topics}.json")
+    return lambda: JSONParser.export_file(graph, path)
+
+
+@benchmark("validator.validate_graph")
+def bench_validate(context: BenchContext):
+    graph = context.graph
+    return lambda: Validator.validate_graph(graph)
+
+
+@benchmark("validator.incremental_edit")
+def bench_incremental_validate(context: BenchContext):
+    # One response added or removed, then re-validated, as after an edit in the editor
+    graph = JSONParser.parse_file(context.corpus_path)
+    validator = IncrementalValidator(graph)
+    validator.validate()
+    topic_id = next(iter(graph.topics))
+    responses = graph.topics[topic_id].responses
+    
+    def run():
+        if len(responses) % 2:
+            responses.pop()
+        else:
+            responses.append({"text": "Bench edit", "topic": "TALK_MISSING_BENCH"})
+        graph.notify_topic_changed(topic_id)
+        validator.validate()
+    return run
+
+
+def _register_parallel_validate(workers: int) -> None:
+    """Register validate_parallel at one worker count (1 is the sequential baseline)"""
+    @benchmark(f"validator.parallel_{workers}")
+    def bench_parallel_validate(context: BenchContext):
+        graph = context.graph
+        return lambda: validate_parallel(graph, workers, min_topics=0)
+
+
+for _workers in (1, 2, 4, 8):
+    _register_parallel_validate(_workers)
+
+
+@benchmark("simulator.random_walk")
+def bench_simulate(context: BenchContext):
+    # Compiled topics are kept between repeats, as in the editor's simulator window
+    simulator = DialogueSimulator(context.graph, seed=context.config.seed)
+    topic_ids = list(context.graph.topics)
+    
+    def run():
+        steps = 0
+        start = 0
+        while steps < SIMULATION_STEPS:
+            steps += len(simulator.run(topic_ids[start % len(topic_ids)], SIMULATION_STEPS - steps))
+            start += 1
+    return run
+
+
+@benchmark("search.build_index")
+def bench_search_build(context: BenchContext):
+    graph = context.graph
+    
+    def run():
+        index = SearchIndex(graph)
+        index.build()
+        index.close()
+    return run
+
+
+@benchmark("search.query")
+def bench_search_query(context: BenchContext):
+    # The index is built once, as in the editor's search panel
+    index = SearchIndex(context.graph)
+    index.build()
+    
+    def run():
+        for query, mode in SEARCH_QUERIES:
+            index.search(query, mode)
+    return run
+
+
+@benchmark("graph.snapshot")
+def bench_snapshot(context: BenchContext):
+    # A topic edited between snapshots, as between two exports in the editor
+    graph = JSONParser.parse_file(context.corpus_path)
+    graph.snapshot()
+    topic_id = next(iter(graph.topics))
+    responses = graph.topics[topic_id].responses
+    
+    def run():
+        if len(responses) % 2:
+            responses.pop()
+        else:
+            responses.append({"text": "Bench edit", "topic": "TALK_DONE"})
+        graph.notify_topic_changed(topic_id)
+        graph.snapshot()
+    return run
+
+
+@benchmark("graph.get_connections")
+def bench_get_connections(context: BenchContext):
+    graph = context.graph
+    topic_ids = list(graph.topics)
+    
+    def run():
+        for topic_id in topic_ids:
+            graph.get_connections(topic_id)
+    return run
+
+
+@benchmark("graph.get_incoming_connections")
+def bench_get_incoming(context: BenchContext):
+    # A fresh copy per run so the lazily built reverse index is part of the cost
+    graph = context.graph
+    topic_ids = list(graph.topics)
+    
+    def run():
+        fresh = copy.copy(graph)
+        fresh._successors = None
+        fresh._predecessors = None
+        for topic_id in topic_ids:
+            fresh.get_incoming_connections(topic_id)
+    return run
+
+
+@benchmark("layout.force_directed", max_topics=FORCE_MAX_TOPICS)
+def bench_force_directed(context: BenchContext):
+    graph_manager = context.graph_manager()
+    return lambda: LayoutManager.force_directed_layout(graph_manager, iterations=FORCE_ITERATIONS)
+
+
+@benchmark("layout.grid")
+def bench_grid(context: BenchContext):
+    graph_manager = context.graph_manager()
+    return lambda: LayoutManager.grid_layout(graph_manager)
+
+
+@benchmark("layout.untangle", max_topics=FORCE_MAX_TOPICS)
+def bench_untangle(context: BenchContext):
+    graph_manager = context.graph_manager()
+    LayoutManager.grid_layout(graph_manager)
+    return lambda: LayoutManager.untangle_layout(graph_manager, iterations=FORCE_ITERATIONS)
+
+
+@benchmark("layout.group")
+def bench_group(context: BenchContext):
+    graph_manager = context.graph_manager()
+    LayoutManager.grid_layout(graph_manager)
+    # The same share of topics the editor lays out when a large group is expanded
+    members = list(graph_manager.dialogue_graph.topics)[:max(2, len(graph_manager.dialogue_graph.topics) // 10)]
+    return lambda: LayoutManager.group_layout(graph_manager, members, (0.0, 0.0))
+
+
+@benchmark("render.build_scene")
+def bench_build_scene(context: BenchContext):
+    graph_manager = context.graph_manager()
+    LayoutManager.grid_layout(graph_manager)
+    return lambda: build_scene(graph_manager)
+
+
+@benchmark("render.svg")
+def bench_svg(context: BenchContext):
+    graph_manager = context.graph_manager()
+    LayoutManager.grid_layout(graph_manager)
+    scene = build_scene(graph_manager)
+    return lambda: SVGWriter.write_stream(scene, io.StringIO())
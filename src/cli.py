@@ -0,0 +1,337 @@
+"""Headless command line tools: python -m src.cli <command> FILES"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List
+
+from .models.dialogue import DialogueGraph
+from .parsers.json_parser import JSONParser
+from .parsers.validator import Validator
+
+# Only the model and parser modules are imported up front; layout and render
+# pull in the graph package (and Tk font metrics) inside their workers
+
+
+EXIT_OK = 0
+EXIT_PROBLEMS = 1  # Validation errors, or files format --check would change
+EXIT_ERROR = 2  # Unreadable files or bad arguments
+
+SIDECAR_SUFFIX = ".layout.json"
+LAYOUTS = ("grid", "force", "untangle")
+
+
+def load(file_path: str):
+    """Read a dialogue file, returning the raw JSON data and its graph"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data, JSONParser.parse_data(data)
+
+
+def sidecar_path(file_path: str, output_dir: str = "") -> str:
+    """Get the positions sidecar of a dialogue file, preferring one that layout -o wrote into output_dir"""
+    if output_dir:
+        path = output_path(file_path, output_dir, SIDECAR_SUFFIX)
+        if os.path.exists(path):
+            return path
+    return output_path(file_path, "", SIDECAR_SUFFIX)
+
+
+def output_path(file_path: str, output_dir: str, extension: str) -> str:
+    """Get an output path next to the input, or inside output_dir if given"""
+    root, _ = os.path.splitext(file_path)
+    if output_dir:
+        root = os.path.join(output_dir, os.path.basename(root))
+    return root + extension
+
+
+def result(file_path: str, status: int = EXIT_OK, messages: List[str] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Build the picklable result a worker hands back to the main process"""
+    return {"file": file_path, "status": status, "messages": messages or [], "data": data or {}}
+
+
+def run_validate(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate one file"""
+    data, graph = load(file_path)
+    if options["workers"] > 1:
+        from .parsers.parallel import validate_parallel
+        errors = JSONParser.validate_structure(data) + validate_parallel(graph, options["workers"])
+    else:
+        errors = JSONParser.validate_structure(data) + Validator.validate_graph(graph)
+    return result(file_path, EXIT_PROBLEMS if errors else EXIT_OK, errors, {"topics": len(graph.topics)})
+
+
+def run_format(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Rewrite one file in the editor's export format"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        original = f.read()
+    data = json.loads(original)
+    graph = JSONParser.parse_data(data)
+    if len(data) != len(graph.topics):
+        # Non-dialogue entries and duplicate IDs would be lost on export
+        return result(file_path, EXIT_ERROR, [
+            f"{len(data) - len(graph.topics)} entries are not unique dialogue topics; refusing to format"
+        ])
+    
+    text = JSONParser.dumps(graph)
+    changed = original != text
+    if changed and options["check"]:
+        return result(file_path, EXIT_PROBLEMS, ["would reformat"])
+    if changed:
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(text)
+    return result(file_path, messages=["reformatted" if changed else "unchanged"])
+
+
+def graph_stats(graph: DialogueGraph) -> Dict[str, Any]:
+    """Count topics, responses, edges and structural problems"""
+    responses = trials = conditional = dead_ends = edges = max_out = 0
+    for topic_id, topic in graph.topics.items():
+        responses += len(topic.responses)
+        trials += sum(1 for response in topic.responses if response.get("trial"))
+        conditional += sum(1 for response in topic.responses if response.get("condition"))
+        targets = graph.get_successors(topic_id)
+        edges += len(targets)
+        max_out = max(max_out, len(targets))
+        if not topic.responses:
+            dead_ends += 1
+    unreferenced = sum(1 for topic_id in graph.topics if not graph.get_predecessors(topic_id))
+    return {
+        "topics": len(graph.topics),
+        "responses": responses,
+        "trials": trials,
+        "conditional_responses": conditional,
+        "edges": edges,
+        "max_out_degree": max_out,
+        "topics_without_responses": dead_ends,
+        "unreferenced_topics": unreferenced,
+        "missing_references": len(graph.validate_references()),
+    }
+
+
+def run_stats(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Collect statistics for one file"""
+    _, graph = load(file_path)
+    stats = graph_stats(graph)
+    return result(file_path, messages=[f"{key}: {value}" for key, value in stats.items()], data=stats)
+
+
+def positioned_manager(file_path: str, graph: DialogueGraph, algorithm: str, use_sidecar: bool, output_dir: str = ""):
+    """Create a graph manager with positions from the sidecar or a fresh layout"""
+    from .graph.graph_manager import GraphManager
+    from .graph.layout import LayoutManager
+    
+    graph_manager = GraphManager(graph)
+    sidecar = sidecar_path(file_path, output_dir)
+    if use_sidecar and os.path.exists(sidecar):
+        with open(sidecar, "r", encoding="utf-8") as f:
+            positions = json.load(f).get("positions", {})
+        for topic_id, (x, y) in positions.items():
+            if topic_id in graph.topics:
+                graph_manager.set_node_position(topic_id, x, y)
+    
+    # Topics the sidecar does not know about still need a place
+    if len(graph_manager.node_positions) < len(graph.topics):
+        LayoutManager.grid_layout(graph_manager)
+        if algorithm == "force":
+            LayoutManager.force_directed_layout(graph_manager)
+        elif algorithm == "untangle":
+            LayoutManager.untangle_layout(graph_manager)
+    return graph_manager
+
+
+def run_layout(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Lay out one file and write its positions sidecar"""
+    _, graph = load(file_path)
+    graph_manager = positioned_manager(file_path, graph, options["algorithm"], use_sidecar=False)
+    path = output_path(file_path, options["output_dir"], SIDECAR_SUFFIX)
+    sidecar = {
+        "source": os.path.basename(file_path),
+        "algorithm": options["algorithm"],
+        "positions": {
+            topic_id: [round(x, 1), round(y, 1)]
+            for topic_id, (x, y) in sorted(graph_manager.node_positions.items())
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, indent=2)
+    return result(file_path, messages=[f"wrote {path}"])
+
+
+def run_render(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one file as SVG or PNG, using its sidecar positions if present"""
+    from .render.scene import build_scene
+    from .render.svg_writer import SVGWriter
+    from .render.png_writer import PNGWriter
+    
+    _, graph = load(file_path)
+    graph_manager = positioned_manager(file_path, graph, options["algorithm"], use_sidecar=True, output_dir=options["output_dir"])
+    scene = build_scene(graph_manager, bundle_edges=options["bundle_edges"])
+    path = output_path(file_path, options["output_dir"], "." + options["format"])
+    if options["format"] == "png":
+        PNGWriter.write(scene, path)
+    else:
+        SVGWriter.write(scene, path)
+    return result(file_path, messages=[f"wrote {path}"])
+
+
+def run_coverage(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Explore every play-through of one file and report what none of them reaches"""
+    from .simulation.explorer import MAX_STATES, explore
+    
+    _, graph = load(file_path)
+    report = explore(graph, options["workers"], max_states=options["max_states"] or MAX_STATES)
+    messages = report.messages()
+    data = {
+        "topics": report.topics,
+        "reached_topics": report.reached_topics,
+        "unreachable_topics": len(report.unreachable_topics),
+        "unreachable_responses": len(report.unreachable_responses),
+        "unreachable_outcomes": len(report.unreachable_outcomes),
+        "unreachable_lines": len(report.unreachable_lines),
+        "states_visited": report.states_visited,
+        "complete": report.complete,
+    }
+    return result(file_path, EXIT_PROBLEMS if messages else EXIT_OK, messages + [report.summary()], data)
+
+
+def run_diff(file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare one file with the base version: topics, responses, conditions and effects"""
+    from .graph.diff import diff_graphs
+    
+    _, base = load(options["base"])
+    _, graph = load(file_path)
+    diff = diff_graphs(base, graph)
+    return result(file_path, EXIT_OK if diff.empty else EXIT_PROBLEMS, diff.messages() + [diff.summary()], diff.counts())
+
+
+COMMANDS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    "validate": run_validate,
+    "format": run_format,
+    "stats": run_stats,
+    "layout": run_layout,
+    "render": run_render,
+    "coverage": run_coverage,
+    "diff": run_diff,
+}
+
+
+def run_file(command: str, file_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a command on one file, turning read and parse failures into error results"""
+    try:
+        return COMMANDS[command](file_path, options)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        return result(file_path, EXIT_ERROR, [f"{type(e).__name__}: {e}"])
+
+
+def collect_files(paths: List[str]) -> List[str]:
+    """Expand directories into the dialogue JSON files they contain"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.endswith(".json") and not name.endswith(SIDECAR_SUFFIX)
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def run_all(command: str, files: List[str], options: Dict[str, Any], jobs: int):
+    """Yield results in input order, using a process pool for more than one file"""
+    if jobs <= 1 or len(files) <= 1:
+        for file_path in files:
+            yield run_file(command, file_path, options)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+        futures = [pool.submit(run_file, command, file_path, options) for file_path in files]
+        for future in futures:
+            yield future.result()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Validate, format, inspect, lay out, render, check coverage of and compare dialogue files without a display"
+    )
+    # Shared options are accepted after the command name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for multiple files (default: %(default)s)")
+    common.add_argument("--json", action="store_true", help="print one JSON result per file")
+    common.add_argument("-q", "--quiet", action="store_true", help="only print files with problems")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("validate", parents=[common], help="check references, IDs and topic structure")
+    
+    format_parser = commands.add_parser("format", parents=[common], help="rewrite files in the editor's export format")
+    format_parser.add_argument("--check", action="store_true", help="report files that would change without writing")
+    
+    commands.add_parser("stats", parents=[common], help="print topic, response and edge counts")
+    
+    layout_parser = commands.add_parser("layout", parents=[common], help=f"write node positions to a {SIDECAR_SUFFIX} sidecar")
+    render_parser = commands.add_parser("render", parents=[common], help="export the graph as SVG or PNG")
+    for sub in (layout_parser, render_parser):
+        sub.add_argument("--algorithm", choices=LAYOUTS, default="grid", help="layout algorithm (default: grid)")
+        sub.add_argument("-o", "--output-dir", default="", help="write output here instead of next to each file")
+    render_parser.add_argument("--format", choices=("svg", "png"), default="svg",
+                               help="svg (default) or png; PNG output has no labels and is scaled down "
+                                    "to at most 4096 px a side")
+    render_parser.add_argument("--bundle-edges", action="store_true", help="bundle edges into hub topics")
+    
+    coverage_parser = commands.add_parser("coverage", parents=[common], help="find responses and lines no play-through reaches")
+    coverage_parser.add_argument("--max-states", type=int, help="stop after this many (topic, state) pairs")
+    
+    diff_parser = commands.add_parser("diff", parents=[common], help="list topics, responses, conditions and effects changed since a base version")
+    diff_parser.add_argument("--base", required=True, help="earlier version of the dialogue file to compare with")
+    
+    for sub in commands.choices.values():
+        sub.add_argument("files", nargs="+", help="dialogue JSON files or directories")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run a command over all given files and return the worst exit code"""
+    args = parse_args(argv)
+    options = {
+        "check": getattr(args, "check", False),
+        "algorithm": getattr(args, "algorithm", "grid"),
+        "output_dir": getattr(args, "output_dir", ""),
+        "format": getattr(args, "format", "svg"),
+        "bundle_edges": getattr(args, "bundle_edges", False),
+        "max_states": getattr(args, "max_states", None),
+        "base": getattr(args, "base", None),
+    }
+    if options["output_dir"]:
+        os.makedirs(options["output_dir"], exist_ok=True)
+    
+    files = collect_files(args.files)
+    if not files:
+        print("No dialogue files found", file=sys.stderr)
+        return EXIT_ERROR
+    # A single file is validated or explored in shards instead of one file per worker
+    options["workers"] = args.jobs if len(files) == 1 else 1
+    
+    status = EXIT_OK
+    for item in run_all(args.command, files, options, args.jobs):
+        status = max(status, item["status"])
+        if args.json:
+            print(json.dumps(item))
+        elif item["status"] != EXIT_OK or not args.quiet:
+            stream = sys.stderr if item["status"] == EXIT_ERROR else sys.stdout
+            label = {EXIT_OK: "ok", EXIT_PROBLEMS: "problems", EXIT_ERROR: "error"}[item["status"]]
+            print(f"{item['file']}: {label}", file=stream)
+            for message in item["messages"]:
+                print(f"  {message}", file=stream)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 """Graph management and layout"""
 
+from .analysis import GraphAnalysis
+from .diff import GraphDiff, LiveDiff, diff_graphs
 from .graph_manager import GraphManager
+from .grouping import GroupManager, TopicGroup
+from .history import UndoHistory
 from .layout import LayoutManager
+from .replace import BulkReplace
+from .search import SearchIndex
 
-__all__ = ['GraphManager', 'LayoutManager']
+__all__ = ['GraphAnalysis', 'GraphDiff', 'LiveDiff', 'diff_graphs', 'GraphManager', 'GroupManager', 'TopicGroup', 'UndoHistory', 'LayoutManager', 'BulkReplace', 'SearchIndex']
 
 
 
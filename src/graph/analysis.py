@@ -0,0 +1,167 @@
+"""Reachability, dead-end and cycle analysis from conversation entry points"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..models.dialogue import SPECIAL_TOPICS
+from .grouping import strongly_connected_components
+
+
+class GraphAnalysis:
+    """Finds unreachable topics, topics without exits and cycles, kept current as topics change"""
+    
+    # Each result is computed in linear time on first use. Edits then update
+    # it through the graph's change listeners: dead ends per affected topic,
+    # reachability by extending the search when edges are only added, and
+    # cycles by recomputing on the next request.
+    
+    def __init__(self, dialogue_graph, entry_points: Optional[Iterable[str]] = None):
+        self.dialogue_graph = dialogue_graph
+        # None means the NPC chat topics of the loaded file (or graph roots)
+        self.custom_entry_points: Optional[List[str]] = list(entry_points) if entry_points is not None else None
+        self._reachable: Optional[Set[str]] = None
+        # Successors of each reachable topic when it was reached, to tell additions from removals
+        self._reached_edges: Dict[str, Set[str]] = {}
+        self._from_roots = False
+        self._dead_ends: Optional[Set[str]] = None
+        self._cycles: Optional[List[List[str]]] = None
+        self.version = 0  # Bumped whenever a result may have changed
+        dialogue_graph.add_change_listener(self.on_topic_changed)
+    
+    def close(self) -> None:
+        """Stop following edits to the graph"""
+        self.dialogue_graph.remove_change_listener(self.on_topic_changed)
+    
+    def set_entry_points(self, entry_points: Optional[Iterable[str]]) -> None:
+        """Use these topics as entry points, or the defaults when None"""
+        self.custom_entry_points = list(entry_points) if entry_points is not None else None
+        self._reachable = None
+        self.version += 1
+    
+    def uses_roots(self) -> bool:
+        """Check if no entry point exists, so topics nothing leads to are used instead"""
+        return not self._configured_entry_points()
+    
+    def _configured_entry_points(self) -> List[str]:
+        """Get the configured or NPC entry points that exist in the graph"""
+        graph = self.dialogue_graph
+        entries = self.custom_entry_points if self.custom_entry_points is not None else graph.entry_points
+        return [topic_id for topic_id in dict.fromkeys(entries) if topic_id in graph.topics]
+    
+    def entry_points(self) -> List[str]:
+        """Get the topics conversations can start with"""
+        entries = self._configured_entry_points()
+        if entries:
+            return entries
+        graph = self.dialogue_graph
+        return [topic_id for topic_id in graph.topics if not graph.get_predecessors(topic_id)]
+    
+    @property
+    def reachable(self) -> Set[str]:
+        """Topics reachable from an entry point"""
+        if self._reachable is None:
+            self._reachable = set()
+            self._reached_edges = {}
+            self._from_roots = self.uses_roots()
+            self._extend(self.entry_points())
+        return self._reachable
+    
+    def unreachable(self) -> List[str]:
+        """Topics no conversation can get to, in graph order"""
+        reachable = self.reachable
+        return [topic_id for topic_id in self.dialogue_graph.topics if topic_id not in reachable]
+    
+    @property
+    def dead_ends(self) -> Set[str]:
+        """Topics with no response leading to an existing or special topic"""
+        if self._dead_ends is None:
+            self._dead_ends = {topic_id for topic_id in self.dialogue_graph.topics if self._is_dead_end(topic_id)}
+        return self._dead_ends
+    
+    @property
+    def cycles(self) -> List[List[str]]:
+        """Strongly connected components that contain a cycle"""
+        if self._cycles is None:
+            graph = self.dialogue_graph
+            self._cycles = [
+                component for component in strongly_connected_components(graph)
+                if len(component) > 1 or component[0] in graph.get_successors(component[0])
+            ]
+        return self._cycles
+    
+    def cycle_members(self) -> Set[str]:
+        """Topics that are part of some cycle"""
+        return {topic_id for component in self.cycles for topic_id in component}
+    
+    def summary(self) -> str:
+        """Describe the results in one line"""
+        entries = self.entry_points()
+        source = "graph roots" if self.uses_roots() else "entry points"
+        return (
+            f"{len(self.unreachable())} unreachable from {len(entries)} {source}, "
+            f"{len(self.dead_ends)} without exits, {len(self.cycles)} cycles"
+        )
+    
+    def _is_dead_end(self, topic_id: str) -> bool:
+        """Check if none of a topic's responses lead anywhere"""
+        topics = self.dialogue_graph.topics
+        return not any(
+            target in topics or target in SPECIAL_TOPICS
+            for target in self.dialogue_graph.get_successors(topic_id)
+        )
+    
+    def _extend(self, starts: Iterable[str]) -> None:
+        """Breadth-first search from new starting topics, skipping what is already reached"""
+        graph = self.dialogue_graph
+        reachable = self._reachable
+        queue = deque()
+        for topic_id in starts:
+            if topic_id in graph.topics and topic_id not in reachable:
+                reachable.add(topic_id)
+                queue.append(topic_id)
+        while queue:
+            topic_id = queue.popleft()
+            successors = set(graph.get_successors(topic_id))
+            self._reached_edges[topic_id] = successors
+            for target in successors:
+                if target in graph.topics and target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+    
+    def on_topic_changed(self, topic_id: str) -> None:
+        """Update the results after a topic was added, edited or removed"""
+        graph = self.dialogue_graph
+        self.version += 1
+        self._cycles = None
+        
+        if self._dead_ends is not None:
+            # Adding or removing a topic gives or takes exits from topics leading to it
+            for affected in {topic_id} | graph.get_predecessors(topic_id):
+                if affected in graph.topics and self._is_dead_end(affected):
+                    self._dead_ends.add(affected)
+                else:
+                    self._dead_ends.discard(affected)
+        
+        if self._reachable is not None:
+            self._update_reachable(topic_id)
+    
+    def _update_reachable(self, topic_id: str) -> None:
+        """Extend reachability for added edges; start over when an edge or topic went away"""
+        graph = self.dialogue_graph
+        reachable = self._reachable
+        if self._from_roots or self.uses_roots() or (topic_id in reachable and topic_id not in graph.topics):
+            # Roots change with any edge, and removals can disconnect anything downstream
+            self._reachable = None
+            return
+        if topic_id in reachable:
+            old = self._reached_edges.get(topic_id, set())
+            new = graph.get_successors(topic_id)
+            if not old <= new:
+                self._reachable = None
+                return
+            self._reached_edges[topic_id] = set(new)
+            self._extend(new - old)
+        elif topic_id in graph.topics:
+            # Edges out of an unreachable topic change nothing until something reaches it
+            if topic_id in self._configured_entry_points() or graph.get_predecessors(topic_id) & reachable:
+                self._extend([topic_id])
@@ -0,0 +1,325 @@
+"""Structural diff of two dialogue graphs: topics matched by ID, responses aligned by text and target"""
+
+import json
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+DIFF_ADDED = "added"
+DIFF_REMOVED = "removed"
+DIFF_CHANGED = "changed"
+
+TOPIC_FIELDS = ("type", "dynamic_line", "speaker_effect")
+BRANCH_KEYS = ("success", "failure")  # Trial outcomes are compared key by key
+CONDITION_KEYS = ("condition",)
+EFFECT_KEYS = ("effect", "speaker_effect", "opinion")
+MAX_VALUE_CHARS = 80  # Longer values are cut short in reports
+
+MARKS = {DIFF_ADDED: "+", DIFF_REMOVED: "-", DIFF_CHANGED: "~"}
+
+
+def same(a: Any, b: Any) -> bool:
+    """Compare JSON values, treating lists and tuples (as in snapshots) alike"""
+    if a is b or a == b:
+        return True
+    if isinstance(a, dict):
+        return isinstance(b, dict) and len(a) == len(b) and all(
+            key in b and same(value, b[key]) for key, value in a.items()
+        )
+    if isinstance(a, (list, tuple)):
+        return isinstance(b, (list, tuple)) and len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return False
+
+
+def show(value: Any) -> str:
+    """Write a value as compact JSON on one line, cut short if long"""
+    if value is None:
+        return "(none)"
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return text if len(text) <= MAX_VALUE_CHARS else text[:MAX_VALUE_CHARS - 1] + "…"
+
+
+@dataclass
+class FieldChange:
+    """One topic field or response key before and after"""
+    path: str  # e.g. "dynamic_line", "condition", "success/effect"
+    old: Any
+    new: Any
+    
+    @property
+    def category(self) -> str:
+        """Get what kind of value changed: condition, effect, target or other"""
+        key = self.path.rsplit("/", 1)[-1]
+        if key in CONDITION_KEYS:
+            return "condition"
+        if key in EFFECT_KEYS:
+            return "effect"
+        if key == "topic":
+            return "target"
+        return "other"
+    
+    def line(self) -> str:
+        """Describe the change on one line"""
+        return f"{self.path}: {show(self.old)} -> {show(self.new)}"
+
+
+@dataclass
+class ResponseDiff:
+    """A response added, removed, or matched and changed"""
+    kind: str
+    old_index: Optional[int]
+    new_index: Optional[int]
+    response: Any  # The new response, or the old one if removed
+    changes: List[FieldChange] = field(default_factory=list)
+    
+    def lines(self) -> List[str]:
+        """Describe the response and its changed keys"""
+        index = self.new_index if self.new_index is not None else self.old_index
+        lines = [f"{MARKS[self.kind]} response {index}: {response_label(self.response)}"]
+        lines.extend(f"    {change.line()}" for change in self.changes)
+        return lines
+
+
+@dataclass
+class TopicDiff:
+    """A topic added, removed, or present in both and changed"""
+    topic_id: str
+    kind: str
+    changes: List[FieldChange] = field(default_factory=list)  # Topic fields
+    responses: List[ResponseDiff] = field(default_factory=list)
+    
+    def lines(self) -> List[str]:
+        """Describe the topic and everything changed in it"""
+        lines = [f"{MARKS[self.kind]} {self.topic_id}"]
+        lines.extend(f"  {change.line()}" for change in self.changes)
+        for response in self.responses:
+            lines.extend(f"  {line}" for line in response.lines())
+        return lines
+
+
+@dataclass
+class GraphDiff:
+    """Every topic that differs between two graphs, and the NPC entry points added or removed"""
+    topics: Dict[str, TopicDiff] = field(default_factory=dict)  # New file order, then removed topics
+    entry_points_added: List[str] = field(default_factory=list)
+    entry_points_removed: List[str] = field(default_factory=list)
+    
+    @property
+    def empty(self) -> bool:
+        """Whether the graphs are the same"""
+        return not (self.topics or self.entry_points_added or self.entry_points_removed)
+    
+    def ids(self, kind: str) -> Set[str]:
+        """Get the IDs of the topics added, removed or changed"""
+        return {topic_id for topic_id, diff in self.topics.items() if diff.kind == kind}
+    
+    def counts(self) -> Dict[str, int]:
+        """Count changed topics, responses, conditions and effects"""
+        counts = {
+            "topics_added": 0, "topics_removed": 0, "topics_changed": 0,
+            "responses_added": 0, "responses_removed": 0, "responses_changed": 0,
+            "conditions_changed": 0, "effects_changed": 0,
+        }
+        for diff in self.topics.values():
+            counts[f"topics_{diff.kind}"] += 1
+            changes = list(diff.changes)
+            for response in diff.responses:
+                counts[f"responses_{response.kind}"] += 1
+                changes.extend(response.changes)
+            for change in changes:
+                if change.category == "condition":
+                    counts["conditions_changed"] += 1
+                elif change.category == "effect":
+                    counts["effects_changed"] += 1
+        return counts
+    
+    def summary(self) -> str:
+        """Describe the differences in one line"""
+        if self.empty:
+            return "No differences"
+        counts = self.counts()
+        summary = (
+            f"{counts['topics_added']} topics added, {counts['topics_removed']} removed, "
+            f"{counts['topics_changed']} changed; {counts['responses_added']} responses added, "
+            f"{counts['responses_removed']} removed, {counts['responses_changed']} changed; "
+            f"{counts['conditions_changed']} conditions and {counts['effects_changed']} effects changed"
+        )
+        if self.entry_points_added or self.entry_points_removed:
+            summary += f"; {len(self.entry_points_added)} entry points added, {len(self.entry_points_removed)} removed"
+        return summary
+    
+    def messages(self) -> List[str]:
+        """Describe every difference, one line per topic, response or changed value"""
+        lines = []
+        for diff in self.topics.values():
+            lines.extend(diff.lines())
+        lines.extend(f"+ entry point {topic_id}" for topic_id in self.entry_points_added)
+        lines.extend(f"- entry point {topic_id}" for topic_id in self.entry_points_removed)
+        return lines
+
+
+def response_label(response: Any) -> str:
+    """Describe a response by its text and where it leads"""
+    if not isinstance(response, dict):
+        return show(response)
+    text = response.get("text")
+    label = show(text) if text is not None else "(no text)"
+    targets = response_targets(response)
+    return f"{label} -> {' / '.join(targets)}" if targets else label
+
+
+def response_targets(response: dict) -> Tuple[str, ...]:
+    """Get the topics a response (or its trial outcomes) leads to"""
+    targets = [response.get("topic")]
+    for key in BRANCH_KEYS:
+        branch = response.get(key)
+        targets.append(branch.get("topic") if isinstance(branch, dict) else None)
+    return tuple(target for target in targets if isinstance(target, str))
+
+
+def _response_key(response: Any) -> Tuple:
+    """Get what responses are aligned by: their text and targets"""
+    if not isinstance(response, dict):
+        return (show(response),)
+    text = response.get("text")
+    return (text if isinstance(text, str) else show(text), response_targets(response))
+
+
+def diff_fields(old: dict, new: dict, prefix: str = "") -> List[FieldChange]:
+    """List the keys whose values differ between two responses (or trial outcomes)"""
+    changes = []
+    keys = list(old) + [key for key in new if key not in old]
+    for key in keys:
+        a, b = old.get(key), new.get(key)
+        if same(a, b):
+            continue
+        if key in BRANCH_KEYS and isinstance(a, dict) and isinstance(b, dict):
+            changes.extend(diff_fields(a, b, f"{prefix}{key}/"))
+        else:
+            changes.append(FieldChange(prefix + key, a, b))
+    return changes
+
+
+def diff_responses(old: List[Any], new: List[Any]) -> List[ResponseDiff]:
+    """Align two response lists by text and target (longest matching runs first) and list the differences"""
+    matcher = SequenceMatcher(None, [_response_key(r) for r in old], [_response_key(r) for r in new], autojunk=False)
+    result = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                result.extend(_matched(old, new, i, j))
+            continue
+        # Within a replaced run, a response keeping its text or its targets was edited
+        unused = list(range(j1, j2))
+        for i in range(i1, i2):
+            old_key = _response_key(old[i])
+            j = next((j for j in unused if _similar(old_key, _response_key(new[j]))), None)
+            if j is None:
+                result.append(ResponseDiff(DIFF_REMOVED, i, None, old[i]))
+            else:
+                unused.remove(j)
+                result.extend(_matched(old, new, i, j))
+        result.extend(ResponseDiff(DIFF_ADDED, None, j, new[j]) for j in unused)
+    return result
+
+
+def _similar(old_key: Tuple, new_key: Tuple) -> bool:
+    """Check if two responses share their text or their targets"""
+    return len(old_key) == len(new_key) == 2 and (old_key[0] == new_key[0] or (old_key[1] and old_key[1] == new_key[1]))
+
+
+def _matched(old: List[Any], new: List[Any], i: int, j: int) -> List[ResponseDiff]:
+    """Compare two aligned responses"""
+    a, b = old[i], new[j]
+    if same(a, b):
+        return []
+    if isinstance(a, dict) and isinstance(b, dict):
+        changes = diff_fields(a, b)
+    else:
+        changes = [FieldChange("response", a, b)]
+    return [ResponseDiff(DIFF_CHANGED, i, j, b, changes)]
+
+
+def diff_topic(topic_id: str, old, new) -> Optional[TopicDiff]:
+    """Compare one topic's versions (either may be None); None if they are the same"""
+    if old is new:
+        return None
+    if old is None:
+        return TopicDiff(topic_id, DIFF_ADDED)
+    if new is None:
+        return TopicDiff(topic_id, DIFF_REMOVED)
+    changes = []
+    for name in TOPIC_FIELDS:
+        a, b = getattr(old, name), getattr(new, name)
+        if not same(a, b):
+            changes.append(FieldChange(name, a, b))
+    responses = [] if same(old.responses, new.responses) else diff_responses(old.responses, new.responses)
+    if not changes and not responses:
+        return None
+    return TopicDiff(topic_id, DIFF_CHANGED, changes, responses)
+
+
+def changed_topic_ids(old, new) -> Optional[Set[str]]:
+    """Get the IDs that may differ, from shared structure of two snapshots (None to compare every topic)"""
+    old_map, new_map = getattr(old, "_map", None), getattr(new, "_map", None)
+    if old_map is None or new_map is None:
+        return None
+    return set(old_map.changed_keys(new_map))
+
+
+def diff_graphs(old, new) -> GraphDiff:
+    """Compare two graphs (or snapshots) topic by topic in linear time; snapshots of one graph only compare what changed"""
+    result = GraphDiff()
+    candidates = changed_topic_ids(old, new)
+    for topic_id in new.topics:
+        if candidates is None or topic_id in candidates:
+            diff = diff_topic(topic_id, old.topics.get(topic_id), new.topics[topic_id])
+            if diff is not None:
+                result.topics[topic_id] = diff
+    for topic_id in old.topics:
+        if (candidates is None or topic_id in candidates) and topic_id not in new.topics:
+            result.topics[topic_id] = TopicDiff(topic_id, DIFF_REMOVED)
+    result.entry_points_added, result.entry_points_removed = diff_entry_points(old, new)
+    return result
+
+
+def diff_entry_points(old, new) -> Tuple[List[str], List[str]]:
+    """Get the NPC entry points added and removed"""
+    old_entries, new_entries = set(old.entry_points), set(new.entry_points)
+    added = [topic_id for topic_id in new.entry_points if topic_id not in old_entries]
+    removed = [topic_id for topic_id in old.entry_points if topic_id not in new_entries]
+    return added, removed
+
+
+class LiveDiff:
+    """Differences of an edited graph from a baseline (such as the last save), kept current as topics change"""
+    
+    def __init__(self, baseline, dialogue_graph):
+        self.baseline = baseline
+        self.dialogue_graph = dialogue_graph
+        self.result = diff_graphs(baseline, dialogue_graph)
+        self.version = 0  # Bumped whenever a topic's difference may have changed
+        dialogue_graph.add_change_listener(self.on_topic_changed)
+    
+    def close(self) -> None:
+        """Stop following edits to the graph"""
+        self.dialogue_graph.remove_change_listener(self.on_topic_changed)
+    
+    def on_topic_changed(self, topic_id: str) -> None:
+        """Compare a topic again after it was added, edited or removed"""
+        diff = diff_topic(topic_id, self.baseline.topics.get(topic_id), self.dialogue_graph.topics.get(topic_id))
+        if diff is None:
+            self.result.topics.pop(topic_id, None)
+        else:
+            self.result.topics[topic_id] = diff
+        self.version += 1
+    
+    def diff(self) -> GraphDiff:
+        """Get the current differences"""
+        self.result.entry_points_added, self.result.entry_points_removed = diff_entry_points(self.baseline, self.dialogue_graph)
+        return self.result
+    
+    def summary(self) -> str:
+        """Describe the current differences in one line"""
+        return self.diff().summary()
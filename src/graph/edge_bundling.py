@@ -0,0 +1,113 @@
+"""Edge aggregation and hierarchical bundling for dense hub topics"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+Point = Tuple[float, float]
+Edge = Tuple[str, str, int]  # (from_id, to_id, parallel response count)
+
+
+@dataclass
+class EdgeBundle:
+    """Incoming edges of a hub topic that share a trunk into it"""
+    target: str
+    control: Point
+    sources: List[Tuple[str, int]] = field(default_factory=list)
+    
+    @property
+    def total(self) -> int:
+        """Total number of responses carried by the bundle"""
+        return sum(count for _, count in self.sources)
+
+
+@dataclass
+class BundlingResult:
+    """Edges split into bundles and edges that are drawn on their own"""
+    bundles: List[EdgeBundle] = field(default_factory=list)
+    plain_edges: List[Edge] = field(default_factory=list)
+
+
+class EdgeBundler:
+    """Collapses parallel edges and bundles edges converging on hub topics"""
+    
+    HUB_THRESHOLD = 8  # Minimum distinct sources before a target is bundled
+    SECTORS = 8  # Angular sectors around a hub; each sector shares one trunk
+    CONTROL_PULL = 0.5  # How far the trunk reaches from the hub toward its sources
+    
+    @staticmethod
+    def collect_edges(dialogue_graph) -> List[Edge]:
+        """Collapse parallel responses into one edge per topic pair with a count"""
+        edges = []
+        for topic_id in dialogue_graph.topics:
+            for target, count in dialogue_graph.get_connection_counts(topic_id).items():
+                if target in dialogue_graph.topics:
+                    edges.append((topic_id, target, count))
+        return edges
+    
+    @classmethod
+    def bundle(
+        cls,
+        positions: Dict[str, Point],
+        edges: List[Edge],
+        hub_threshold: int = HUB_THRESHOLD,
+        sectors: int = SECTORS
+    ) -> BundlingResult:
+        """Group edges into hub bundles by the direction they arrive from"""
+        # Pure function of its inputs, so it can run on a worker thread with
+        # copies of the positions and edges
+        incoming: Dict[str, List[Tuple[str, int]]] = {}
+        for from_id, to_id, count in edges:
+            incoming.setdefault(to_id, []).append((from_id, count))
+        
+        result = BundlingResult()
+        for target, sources in incoming.items():
+            target_pos = positions.get(target)
+            if target_pos is None or len(sources) < hub_threshold:
+                result.plain_edges.extend((from_id, target, count) for from_id, count in sources)
+                continue
+            
+            # Bucket sources by the angle they approach the hub from
+            buckets: Dict[int, List[Tuple[str, int]]] = {}
+            for from_id, count in sources:
+                pos = positions.get(from_id)
+                if pos is None or from_id == target:
+                    result.plain_edges.append((from_id, target, count))
+                    continue
+                angle = math.atan2(pos[1] - target_pos[1], pos[0] - target_pos[0])
+                sector = int((angle + math.pi) / (2 * math.pi) * sectors) % sectors
+                buckets.setdefault(sector, []).append((from_id, count))
+            
+            for members in buckets.values():
+                if len(members) < 2:
+                    result.plain_edges.extend((from_id, target, count) for from_id, count in members)
+                    continue
+                # Trunk starts partway between the hub and the sources' centroid
+                cx = sum(positions[from_id][0] for from_id, _ in members) / len(members)
+                cy = sum(positions[from_id][1] for from_id, _ in members) / len(members)
+                control = (
+                    target_pos[0] + (cx - target_pos[0]) * cls.CONTROL_PULL,
+                    target_pos[1] + (cy - target_pos[1]) * cls.CONTROL_PULL
+                )
+                result.bundles.append(EdgeBundle(target=target, control=control, sources=members))
+        
+        return result
+    
+    @staticmethod
+    def fan_points(bundle: EdgeBundle, positions: Dict[str, Point]) -> List[Point]:
+        """Build one smoothable polyline running from the trunk out to every source and back"""
+        # Doubled points make Tk's spline pass through them, so the curve
+        # touches each source and converges on the control point between them
+        control = bundle.control
+        target = positions[bundle.target]
+        points: List[Point] = [control, control]
+        for from_id, _ in bundle.sources:
+            source = positions[from_id]
+            # Bend each feeder toward the straight source-to-hub line
+            bend = (
+                (source[0] + control[0]) / 4 + (source[0] + target[0]) / 4,
+                (source[1] + control[1]) / 4 + (source[1] + target[1]) / 4
+            )
+            points.extend([bend, source, source, bend, control, control])
+        return points
@@ -1,25 +1,89 @@
 """Graph state management"""
 
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from ..models.dialogue import DialogueGraph
+from ..utils.helpers import calculate_node_size, get_preview_text
+from .grouping import GroupManager
 
 
 class GraphManager:
     """Manages graph state including node positions"""
     
+    NODE_MIN_WIDTH = 120
+    NODE_MAX_WIDTH = 200
+    NODE_HEIGHT = 80
+    NODE_FONT = ("Arial", 9, "bold")  # Widest font used inside a node
+    
     def __init__(self, dialogue_graph: DialogueGraph):
         self.dialogue_graph = dialogue_graph
         self.node_positions: Dict[str, Tuple[float, float]] = {}
         self.selected_nodes: set = set()
+        self.position_listeners: List[Callable[[str], None]] = []
+        # Bumped on every move so caches keyed on positions can tell they are stale
+        self.position_version = 0
+        # Measured node extents in world units, shared by layout, hit-testing and rendering
+        self.node_sizes: Dict[str, Tuple[float, float]] = {}
+        self.groups = GroupManager(self)
+    
+    def add_position_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the topic ID whenever a node moves"""
+        if listener not in self.position_listeners:
+            self.position_listeners.append(listener)
+    
+    def remove_position_listener(self, listener: Callable[[str], None]) -> None:
+        """Unregister a position callback"""
+        if listener in self.position_listeners:
+            self.position_listeners.remove(listener)
     
     def set_node_position(self, topic_id: str, x: float, y: float) -> None:
         """Set position of a node"""
         self.node_positions[topic_id] = (x, y)
+        self.position_version += 1
+        for listener in self.position_listeners:
+            listener(topic_id)
     
     def get_node_position(self, topic_id: str) -> Optional[Tuple[float, float]]:
         """Get position of a node"""
         return self.node_positions.get(topic_id)
     
+    def get_node_size(self, topic_id: str) -> Tuple[float, float]:
+        """Get a node's width and height in world units, measured from its text"""
+        size = self.node_sizes.get(topic_id)
+        if size is not None:
+            return size
+        topic = self.dialogue_graph.get_topic(topic_id)
+        if topic is None:
+            return (self.NODE_MAX_WIDTH, self.NODE_HEIGHT)
+        width, _ = calculate_node_size(
+            [topic.id, get_preview_text(topic.dynamic_line)],
+            min_width=self.NODE_MIN_WIDTH,
+            min_height=self.NODE_HEIGHT,
+            max_width=self.NODE_MAX_WIDTH,
+            font=self.NODE_FONT
+        )
+        size = (width, self.NODE_HEIGHT)
+        self.node_sizes[topic_id] = size
+        return size
+    
+    def invalidate_node_size(self, topic_id: Optional[str] = None) -> None:
+        """Forget measured sizes after text changed (all nodes when no ID is given)"""
+        if topic_id is None:
+            self.node_sizes.clear()
+        else:
+            self.node_sizes.pop(topic_id, None)
+    
+    def rename_nodes(self, renames: Dict[str, str]) -> None:
+        """Carry renamed topics' positions, selection and groups over to their new IDs (IDs may be swapped)"""
+        moved = {new_id: self.node_positions.pop(old_id) for old_id, new_id in renames.items() if old_id in self.node_positions}
+        self.node_positions.update(moved)
+        self.position_version += 1
+        # The ID is drawn in the node, so its width may change
+        for old_id, new_id in renames.items():
+            self.node_sizes.pop(old_id, None)
+            self.node_sizes.pop(new_id, None)
+        self.selected_nodes = {renames.get(topic_id, topic_id) for topic_id in self.selected_nodes}
+        self.groups.rename_topics(renames)
+    
     def select_node(self, topic_id: str) -> None:
         """Select a node"""
         self.selected_nodes.add(topic_id)
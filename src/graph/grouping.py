@@ -0,0 +1,310 @@
+"""Collapsible topic groups"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+GROUP_PREFIX = "group:"
+
+
+@dataclass
+class TopicGroup:
+    """A set of topics that can be drawn as one summary node"""
+    id: str
+    name: str
+    members: Set[str] = field(default_factory=set)
+    collapsed: bool = True
+    # Where the summary node is drawn while collapsed
+    position: Tuple[float, float] = (0.0, 0.0)
+
+
+def strongly_connected_components(dialogue_graph) -> List[List[str]]:
+    """Find strongly connected components of the topic graph (iterative Tarjan)"""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+    topics = dialogue_graph.topics
+    
+    for root in topics:
+        if root in index:
+            continue
+        # Explicit call stack of (topic, iterator over its successors) - dialogue
+        # chains can be far deeper than Python's recursion limit
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(dialogue_graph.get_connections(root)))]
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for target in successors:
+                if target not in topics:
+                    continue
+                if target not in index:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(dialogue_graph.get_connections(target))))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index[target])
+            if advanced:
+                continue
+            
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    
+    return components
+
+
+class GroupManager:
+    """Tracks topic groups and maps topics to the node that currently represents them"""
+    
+    def __init__(self, graph_manager):
+        self.graph_manager = graph_manager
+        self.groups: Dict[str, TopicGroup] = {}
+        self.topic_groups: Dict[str, str] = {}  # topic ID -> group ID
+        self._hidden: Optional[Set[str]] = None
+    
+    def add_group(self, name: str, members) -> TopicGroup:
+        """Create a collapsed group (topics leave any group they were in)"""
+        group_id = GROUP_PREFIX + name
+        if group_id in self.groups:
+            self.remove_group(group_id)
+        members = {topic_id for topic_id in members if topic_id in self.graph_manager.dialogue_graph.topics}
+        for topic_id in members:
+            old_group = self.topic_groups.get(topic_id)
+            if old_group is not None:
+                self.groups[old_group].members.discard(topic_id)
+        
+        group = TopicGroup(id=group_id, name=name, members=members, position=self._centroid(members))
+        self.groups[group_id] = group
+        for topic_id in members:
+            self.topic_groups[topic_id] = group_id
+        # Groups emptied by the move are dropped
+        for other_id in [gid for gid, other in self.groups.items() if not other.members]:
+            self.remove_group(other_id)
+        self._hidden = None
+        return group
+    
+    def remove_group(self, group_id: str) -> None:
+        """Dissolve a group, leaving its topics where they are"""
+        group = self.groups.pop(group_id, None)
+        if group is None:
+            return
+        for topic_id in group.members:
+            if self.topic_groups.get(topic_id) == group_id:
+                del self.topic_groups[topic_id]
+        self._hidden = None
+    
+    def clear(self) -> None:
+        """Dissolve all groups"""
+        self.groups.clear()
+        self.topic_groups.clear()
+        self._hidden = None
+    
+    def group_by_prefix(self, depth: int = 2, min_size: int = 3) -> List[TopicGroup]:
+        """Group topics sharing the first ID parts, e.g. TALK_MISSION_* for depth 2"""
+        buckets: Dict[str, List[str]] = {}
+        for topic_id in self.graph_manager.dialogue_graph.topics:
+            parts = topic_id.split("_")
+            if len(parts) > depth:
+                buckets.setdefault("_".join(parts[:depth]), []).append(topic_id)
+        return [
+            self.add_group(prefix + "_*", members)
+            for prefix, members in sorted(buckets.items())
+            if len(members) >= min_size
+        ]
+    
+    def group_by_cycles(self, min_size: int = 2) -> List[TopicGroup]:
+        """Group each strongly connected component (topics that lead back to each other)"""
+        created = []
+        for component in strongly_connected_components(self.graph_manager.dialogue_graph):
+            if len(component) >= min_size:
+                name = f"{min(component)} (+{len(component) - 1})"
+                created.append(self.add_group(name, component))
+        return created
+    
+    def rename_topics(self, renames: Dict[str, str]) -> None:
+        """Keep renamed topics in their groups (old to new ID; IDs may be swapped)"""
+        moved = {new_id: self.topic_groups.pop(old_id) for old_id, new_id in renames.items() if old_id in self.topic_groups}
+        for old_id in renames:
+            for group_id in moved.values():
+                self.groups[group_id].members.discard(old_id)
+        for new_id, group_id in moved.items():
+            self.topic_groups[new_id] = group_id
+            self.groups[group_id].members.add(new_id)
+        self._hidden = None
+    
+    def get_group(self, group_id: str) -> Optional[TopicGroup]:
+        """Get a group by ID"""
+        return self.groups.get(group_id)
+    
+    def group_of(self, topic_id: str) -> Optional[TopicGroup]:
+        """Get the group a topic belongs to"""
+        group_id = self.topic_groups.get(topic_id)
+        return self.groups.get(group_id) if group_id else None
+    
+    def is_group(self, node_id: str) -> bool:
+        """Check if a node ID refers to a group summary node"""
+        return node_id in self.groups
+    
+    def collapse(self, group_id: str) -> None:
+        """Collapse a group into its summary node, placed at the members' centroid"""
+        group = self.groups.get(group_id)
+        if group is None or group.collapsed:
+            return
+        group.collapsed = True
+        group.position = self._centroid(group.members)
+        self._hidden = None
+    
+    def expand(self, group_id: str) -> None:
+        """Show a group's members again"""
+        group = self.groups.get(group_id)
+        if group is None or not group.collapsed:
+            return
+        group.collapsed = False
+        self._hidden = None
+    
+    def has_collapsed(self) -> bool:
+        """Check if any group is currently collapsed"""
+        return bool(self.hidden_topics())
+    
+    def collapsed_groups(self) -> List[TopicGroup]:
+        """Get the groups drawn as summary nodes"""
+        return [group for group in self.groups.values() if group.collapsed and group.members]
+    
+    def hidden_topics(self) -> Set[str]:
+        """Get the topics hidden inside collapsed groups"""
+        if self._hidden is None:
+            self._hidden = set()
+            for group in self.collapsed_groups():
+                self._hidden.update(group.members)
+        return self._hidden
+    
+    def representative(self, topic_id: str) -> str:
+        """Get the node a topic is drawn as: itself, or its collapsed group"""
+        group_id = self.topic_groups.get(topic_id)
+        if group_id is not None and self.groups[group_id].collapsed:
+            return group_id
+        return topic_id
+    
+    def visible_positions(self) -> Dict[str, Tuple[float, float]]:
+        """Get positions of every drawn node, with collapsed groups as single nodes"""
+        positions = self.graph_manager.node_positions
+        hidden = self.hidden_topics()
+        if not hidden:
+            return positions
+        visible = {topic_id: pos for topic_id, pos in positions.items() if topic_id not in hidden}
+        for group in self.collapsed_groups():
+            visible[group.id] = group.position
+        return visible
+    
+    def aggregate_edges(self, edges) -> List[Tuple[str, str, int]]:
+        """Reroute edges to summary nodes, summing counts and dropping edges inside a group"""
+        if not self.hidden_topics():
+            return edges
+        totals: Dict[Tuple[str, str], int] = {}
+        for from_id, to_id, count in edges:
+            source = self.representative(from_id)
+            target = self.representative(to_id)
+            if source == target and source in self.groups:
+                continue
+            totals[(source, target)] = totals.get((source, target), 0) + count
+        return [(source, target, count) for (source, target), count in totals.items()]
+    
+    def _centroid(self, members) -> Tuple[float, float]:
+        """Average position of the positioned members"""
+        points = [self.graph_manager.node_positions[m] for m in members if m in self.graph_manager.node_positions]
+        if not points:
+            return (0.0, 0.0)
+        return (sum(p[0] for p in points) / len(points), sum(p[1] for p in points) / len(points))
+
+
+class _ViewGraph:
+    """Minimal graph with the topic and connection lookups the layouts use"""
+    
+    def __init__(self, topics: Dict[str, None], connections: Dict[str, List[str]]):
+        self.topics = topics
+        self._connections = connections
+    
+    def get_connections(self, topic_id: str) -> List[str]:
+        """Get the nodes a node connects to"""
+        return self._connections.get(topic_id, [])
+
+
+class GroupedLayoutView:
+    """Stand-in for a GraphManager that presents collapsed groups as single nodes to layouts"""
+    
+    # Layouts move positions many times per node; they are buffered here and
+    # written back once by apply(), and collapsed members cost nothing
+    
+    def __init__(self, group_manager: GroupManager):
+        self.group_manager = group_manager
+        graph_manager = group_manager.graph_manager
+        graph = graph_manager.dialogue_graph
+        representative = group_manager.representative
+        
+        topics: Dict[str, None] = {}
+        connections: Dict[str, List[str]] = {}
+        for topic_id in graph.topics:
+            source = representative(topic_id)
+            topics[source] = None
+            targets = connections.setdefault(source, [])
+            for target in graph.get_connections(topic_id):
+                if target not in graph.topics:
+                    continue
+                target = representative(target)
+                if target != source and target not in targets:
+                    targets.append(target)
+        
+        self.dialogue_graph = _ViewGraph(topics, connections)
+        visible = group_manager.visible_positions()
+        self.node_positions = {node_id: visible[node_id] for node_id in topics if node_id in visible}
+    
+    def get_node_position(self, node_id: str) -> Optional[Tuple[float, float]]:
+        """Get position of a node"""
+        return self.node_positions.get(node_id)
+    
+    def set_node_position(self, node_id: str, x: float, y: float) -> None:
+        """Set position of a node (buffered until apply)"""
+        self.node_positions[node_id] = (x, y)
+    
+    def get_node_size(self, node_id: str) -> Tuple[float, float]:
+        """Get size of a node"""
+        if node_id in self.group_manager.groups:
+            return (self.group_manager.graph_manager.NODE_MAX_WIDTH, self.group_manager.graph_manager.NODE_HEIGHT)
+        return self.group_manager.graph_manager.get_node_size(node_id)
+    
+    def apply(self) -> None:
+        """Write laid-out positions back, moving collapsed members along with their group"""
+        graph_manager = self.group_manager.graph_manager
+        for node_id, (x, y) in self.node_positions.items():
+            group = self.group_manager.get_group(node_id)
+            if group is None:
+                graph_manager.set_node_position(node_id, x, y)
+                continue
+            dx = x - group.position[0]
+            dy = y - group.position[1]
+            group.position = (x, y)
+            for topic_id in group.members:
+                pos = graph_manager.get_node_position(topic_id)
+                if pos is not None:
+                    graph_manager.set_node_position(topic_id, pos[0] + dx, pos[1] + dy)
@@ -0,0 +1,317 @@
+"""Undo and redo of graph edits, each step keeping only the values it changed"""
+
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .replace import ReplaceTransaction
+from .search import get_path, set_path
+
+
+MAX_STEPS = 200  # Undo steps kept before the oldest are dropped
+MAX_BYTES = 8 * 1024 * 1024  # Approximate size of the kept steps before the oldest are dropped
+STEP_OVERHEAD = 200  # Approximate bytes per step besides its values
+
+Position = Tuple[float, float]
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a JSON-like value"""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    return len(json.dumps(value, default=str))
+
+
+class Command:
+    """One undoable edit, made by do() and reverted by undo()"""
+    label = "Edit"
+    
+    @property
+    def renames(self) -> Dict[str, str]:
+        """Old to new ID of each topic do() renames"""
+        return {}
+    
+    def do(self) -> None:
+        """Make the edit"""
+        raise NotImplementedError
+    
+    def undo(self) -> None:
+        """Revert the edit"""
+        raise NotImplementedError
+    
+    def size(self) -> int:
+        """Approximate bytes held by the step"""
+        return STEP_OVERHEAD
+    
+    def merge(self, other: "Command") -> bool:
+        """Fold a later edit (already made) into this step, if both belong to one gesture"""
+        return False
+
+
+@dataclass
+class TopicFieldEdit(Command):
+    """Replaces the dynamic line or speaker effect of a topic"""
+    dialogue_graph: Any
+    topic_id: str
+    attribute: str  # "dynamic_line" or "speaker_effect"
+    old: Any
+    new: Any
+    
+    @property
+    def label(self) -> str:
+        return f"{self.attribute.replace('_', ' ')} of {self.topic_id}"
+    
+    def do(self) -> None:
+        self._set(self.new)
+    
+    def undo(self) -> None:
+        self._set(self.old)
+    
+    def size(self) -> int:
+        return STEP_OVERHEAD + estimate_size(self.old) + estimate_size(self.new)
+    
+    def _set(self, value: Any) -> None:
+        setattr(self.dialogue_graph.topics[self.topic_id], self.attribute, value)
+        self.dialogue_graph.notify_topic_changed(self.topic_id)
+
+
+@dataclass
+class ResponseEdit(Command):
+    """Adds (no old), removes (no new) or replaces one response of a topic"""
+    dialogue_graph: Any
+    topic_id: str
+    index: int
+    old: Optional[dict]
+    new: Optional[dict]
+    
+    @property
+    def label(self) -> str:
+        if self.old is None:
+            return f"new response in {self.topic_id}"
+        if self.new is None:
+            return f"removed response in {self.topic_id}"
+        return f"response edit in {self.topic_id}"
+    
+    def do(self) -> None:
+        self._swap(self.old, self.new)
+    
+    def undo(self) -> None:
+        self._swap(self.new, self.old)
+    
+    def size(self) -> int:
+        return STEP_OVERHEAD + estimate_size(self.old) + estimate_size(self.new)
+    
+    def _swap(self, current: Optional[dict], replacement: Optional[dict]) -> None:
+        responses = self.dialogue_graph.topics[self.topic_id].responses
+        if current is None:
+            responses.insert(self.index, replacement)
+        elif replacement is None:
+            responses.pop(self.index)
+        else:
+            responses[self.index] = replacement
+        self.dialogue_graph.notify_topic_changed(self.topic_id)
+
+
+@dataclass
+class MoveNodes(Command):
+    """Moves topics or group summary nodes; moves in the same drag gesture make one step"""
+    graph_manager: Any
+    moves: Dict[str, Tuple[Position, Position]]  # Node ID to position before and after
+    gesture: int = 0  # Drags with the same number are merged
+    
+    @property
+    def label(self) -> str:
+        if len(self.moves) == 1:
+            return f"move of {next(iter(self.moves))}"
+        return f"move of {len(self.moves)} nodes"
+    
+    def do(self) -> None:
+        for node_id, (_, new) in self.moves.items():
+            self._place(node_id, new)
+    
+    def undo(self) -> None:
+        for node_id, (old, _) in self.moves.items():
+            self._place(node_id, old)
+    
+    def size(self) -> int:
+        return STEP_OVERHEAD + 100 * len(self.moves)
+    
+    def merge(self, other: Command) -> bool:
+        if not isinstance(other, MoveNodes) or other.gesture != self.gesture or other.graph_manager is not self.graph_manager:
+            return False
+        for node_id, (old, new) in other.moves.items():
+            # Keep where the node was before the gesture started
+            self.moves[node_id] = (self.moves.get(node_id, (old, new))[0], new)
+        return True
+    
+    def _place(self, node_id: str, position: Position) -> None:
+        group = self.graph_manager.groups.get_group(node_id)
+        if group is not None:
+            group.position = position
+        else:
+            self.graph_manager.set_node_position(node_id, *position)
+
+
+@dataclass
+class RenameTopic(Command):
+    """Renames a topic together with the responses leading to it; undo restores only the targets it rewrote"""
+    dialogue_graph: Any
+    old_id: str
+    new_id: str
+    rewritten: List[str] = field(default_factory=list)  # Topics whose responses were rewritten
+    paths: List[Tuple[str, str]] = field(default_factory=list)  # (topic ID after the rename, path) of each rewritten target
+    
+    @property
+    def label(self) -> str:
+        return f"rename of {self.old_id} to {self.new_id}"
+    
+    @property
+    def renames(self) -> Dict[str, str]:
+        return {self.old_id: self.new_id}
+    
+    def do(self) -> None:
+        paths: List[Tuple[str, str]] = []
+        self.rewritten = self.dialogue_graph.rename_topic(self.old_id, self.new_id, paths)
+        self.paths = paths
+    
+    def undo(self) -> None:
+        # Renaming back would also take over responses that already pointed at
+        # new_id (e.g. dangling ones), so only the rewritten targets are restored
+        graph = self.dialogue_graph
+        topics = graph.topics
+        if self.new_id not in topics or self.old_id in topics:
+            raise ValueError(f"Cannot rename {self.new_id} back to {self.old_id}")
+        back = {self.new_id: self.old_id}
+        for topic_id, path in self.paths:
+            try:
+                current = get_path(topics[topic_id], path)
+            except (KeyError, IndexError, TypeError, ValueError):
+                current = None
+            if current != self.new_id:
+                raise ValueError(f"{topic_id} {path} changed since the rename")
+        graph.move_topics(back)
+        for topic_id, path in self.paths:
+            set_path(topics[back.get(topic_id, topic_id)], path, self.old_id)
+        changed = {self.old_id, self.new_id} | {back.get(topic_id, topic_id) for topic_id, _ in self.paths}
+        for topic_id in changed:
+            graph.notify_topic_changed(topic_id)
+
+
+@dataclass
+class ReplaceEdit(Command):
+    """Applies a find-and-replace transaction, which already keeps each string before and after"""
+    transaction: ReplaceTransaction
+    
+    @property
+    def label(self) -> str:
+        return f"replacement of {len(self.transaction.changes)} strings"
+    
+    @property
+    def renames(self) -> Dict[str, str]:
+        return self.transaction.renames
+    
+    def do(self) -> None:
+        self.transaction.apply()
+    
+    def undo(self) -> None:
+        self.transaction.revert()
+    
+    def size(self) -> int:
+        changes = self.transaction.changes
+        return STEP_OVERHEAD + sum(100 + len(change.old) + len(change.new) for change in changes)
+
+
+class UndoHistory:
+    """Undo and redo stacks of commands, dropping the oldest steps past a step count or size"""
+    
+    def __init__(self, max_steps: int = MAX_STEPS, max_bytes: int = MAX_BYTES):
+        self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self._undo: Deque[Tuple[Command, int]] = deque()  # Steps with their sizes, oldest first
+        self._redo: List[Tuple[Command, int]] = []
+        self._bytes = 0  # Size of the undo steps
+    
+    @property
+    def can_undo(self) -> bool:
+        """Whether there is a step to undo"""
+        return bool(self._undo)
+    
+    @property
+    def can_redo(self) -> bool:
+        """Whether there is an undone step to make again"""
+        return bool(self._redo)
+    
+    @property
+    def size(self) -> int:
+        """Approximate bytes held by the undo steps"""
+        return self._bytes
+    
+    def __len__(self) -> int:
+        return len(self._undo)
+    
+    def next_undo(self) -> Optional[Command]:
+        """Get the step undo() would revert"""
+        return self._undo[-1][0] if self._undo else None
+    
+    def execute(self, command: Command) -> Command:
+        """Make an edit and record it (nothing is recorded if it raises)"""
+        command.do()
+        return self.record(command)
+    
+    def record(self, command: Command) -> Command:
+        """Record an edit that was already made, merging it into the last step when it continues it"""
+        self._redo.clear()
+        if self._undo and self._undo[-1][0].merge(command):
+            last, old_size = self._undo.pop()
+            command = last
+        else:
+            old_size = 0
+        size = command.size()
+        self._undo.append((command, size))
+        self._bytes += size - old_size
+        self._evict()
+        return command
+    
+    def undo(self) -> Optional[Command]:
+        """Revert the last step; a step that cannot be reverted (ValueError) clears the history"""
+        if not self._undo:
+            return None
+        command, size = self._undo.pop()
+        self._bytes -= size
+        try:
+            command.undo()
+        except ValueError:
+            self.clear()
+            raise
+        self._redo.append((command, size))
+        return command
+    
+    def redo(self) -> Optional[Command]:
+        """Make the last undone step again"""
+        if not self._redo:
+            return None
+        command, size = self._redo.pop()
+        try:
+            command.do()
+        except ValueError:
+            self._redo.clear()
+            raise
+        self._undo.append((command, size))
+        self._bytes += size
+        self._evict()
+        return command
+    
+    def clear(self) -> None:
+        """Forget every step (e.g. when another file is imported)"""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+    
+    def _evict(self) -> None:
+        """Drop the oldest steps past the limits, always keeping the newest"""
+        while len(self._undo) > 1 and (len(self._undo) > self.max_steps or self._bytes > self.max_bytes):
+            _, size = self._undo.popleft()
+            self._bytes -= size
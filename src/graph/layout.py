@@ -3,11 +3,14 @@
 from typing import Dict, Tuple, List
 import math
 
+from ..utils.perf import perf
+
 
 class LayoutManager:
     """Manages node layout algorithms"""
     
     @staticmethod
+    @perf.timed("layout.force_directed", fields=("iterations",))
     def force_directed_layout(
         graph_manager, 
         width: int = 1000, 
@@ -94,6 +97,7 @@ class LayoutManager:
                     graph_manager.set_node_position(topic_id, new_x, new_y)
     
     @staticmethod
+    @perf.timed("layout.grid")
     def grid_layout(graph_manager, width: int = 1000, height: int = 800) -> None:
         """Apply grid layout"""
         topic_ids = list(graph_manager.dialogue_graph.topics.keys())
@@ -105,6 +109,10 @@ class LayoutManager:
         
         cell_width = (width - 200) / max(1, cols)
         cell_height = (height - 200) / max(1, rows)
+        # Cells are never smaller than the largest measured node, so nodes cannot overlap
+        sizes = [graph_manager.get_node_size(topic_id) for topic_id in topic_ids]
+        cell_width = max(cell_width, max(size[0] for size in sizes) + 20)
+        cell_height = max(cell_height, max(size[1] for size in sizes) + 20)
         
         for i, topic_id in enumerate(topic_ids):
             row = i // cols
@@ -114,6 +122,7 @@ class LayoutManager:
             graph_manager.set_node_position(topic_id, x, y)
     
     @staticmethod
+    @perf.timed("layout.untangle", fields=("iterations",))
     def untangle_layout(
         graph_manager,
         width: int = 1000,
@@ -203,7 +212,77 @@ class LayoutManager:
                     new_x = max(50, min(width - 50, pos[0] + fx * damping))
                     new_y = max(50, min(height - 50, pos[1] + fy * damping))
                     graph_manager.set_node_position(topic_id, new_x, new_y)
-
-
-
-
+    
+    @staticmethod
+    @perf.timed("layout.group", fields=("iterations",))
+    def group_layout(
+        graph_manager,
+        topic_ids: List[str],
+        center: Tuple[float, float],
+        iterations: int = 50
+    ) -> None:
+        """Lay out a subset of topics around a center point, leaving all others untouched"""
+        if not topic_ids:
+            return
+        
+        members = set(topic_ids)
+        # Area grows with the member count, not the whole graph
+        size = max(400.0, math.sqrt(len(topic_ids)) * 250)
+        left = center[0] - size / 2
+        top = center[1] - size / 2
+        
+        # Start from a grid inside the box; positions are kept locally until the end
+        cols = math.ceil(math.sqrt(len(topic_ids)))
+        cell = size / max(1, cols)
+        positions: Dict[str, Tuple[float, float]] = {}
+        for i, topic_id in enumerate(topic_ids):
+            positions[topic_id] = (left + (i % cols + 0.5) * cell, top + (i // cols + 0.5) * cell)
+        
+        edges = [
+            (topic_id, conn_id)
+            for topic_id in topic_ids
+            for conn_id in graph_manager.dialogue_graph.get_connections(topic_id)
+            if conn_id in members and conn_id != topic_id
+        ]
+        
+        k = math.sqrt(size * size / len(topic_ids))
+        for iteration in range(iterations):
+            forces = {topic_id: [0.0, 0.0] for topic_id in topic_ids}
+            cooling = 1.0 - (iteration / iterations) * 0.5
+            
+            # Repulsion between members only
+            for i, topic_id1 in enumerate(topic_ids):
+                x1, y1 = positions[topic_id1]
+                for topic_id2 in topic_ids[i+1:]:
+                    x2, y2 = positions[topic_id2]
+                    dx = x1 - x2
+                    dy = y1 - y2
+                    dist = math.sqrt(dx*dx + dy*dy) + 0.1
+                    force = k * k / dist
+                    forces[topic_id1][0] += force * dx / dist
+                    forces[topic_id1][1] += force * dy / dist
+                    forces[topic_id2][0] -= force * dx / dist
+                    forces[topic_id2][1] -= force * dy / dist
+            
+            # Attraction along edges inside the subset
+            for topic_id, conn_id in edges:
+                x1, y1 = positions[topic_id]
+                x2, y2 = positions[conn_id]
+                dx = x2 - x1
+                dy = y2 - y1
+                dist = math.sqrt(dx*dx + dy*dy) + 0.1
+                force = dist * dist / k
+                forces[topic_id][0] += force * dx / dist * 0.5
+                forces[topic_id][1] += force * dy / dist * 0.5
+            
+            damping = 0.1 * cooling
+            for topic_id in topic_ids:
+                x, y = positions[topic_id]
+                fx, fy = forces[topic_id]
+                positions[topic_id] = (
+                    max(left, min(left + size, x + fx * damping)),
+                    max(top, min(top + size, y + fy * damping))
+                )
+        
+        for topic_id, (x, y) in positions.items():
+            graph_manager.set_node_position(topic_id, x, y)
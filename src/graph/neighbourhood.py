@@ -0,0 +1,131 @@
+"""Bounded N-hop neighbourhood of a topic with a view-local layout"""
+
+import math
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class NeighbourhoodView:
+    """The topics within a few hops of a focus topic, laid out radially around it"""
+    
+    # Cost depends only on the neighbourhood: the BFS stops at max_nodes and the
+    # layout and drawing only ever touch the nodes it found
+    
+    DEFAULT_HOPS = 2
+    MAX_NODES = 300  # Hard cap so hubs cannot blow up the view
+    RING_SPACING = 260  # World units between hop rings
+    NODE_SPACING = 230  # Minimum arc length per node on a ring
+    
+    def __init__(self, dialogue_graph, hops: int = DEFAULT_HOPS, max_nodes: int = MAX_NODES):
+        self.dialogue_graph = dialogue_graph
+        self.hops = hops
+        self.max_nodes = max_nodes
+        self.center: Optional[str] = None
+        self.distances: Dict[str, int] = {}
+        self.parents: Dict[str, Optional[str]] = {}
+        # View-local positions; the graph's own node positions are left alone
+        self.positions: Dict[str, Tuple[float, float]] = {}
+        self.truncated = False
+    
+    @staticmethod
+    def bfs(dialogue_graph, center: str, hops: int, max_nodes: int) -> Tuple[Dict[str, int], Dict[str, Optional[str]], bool]:
+        """Breadth-first search over forward and reverse edges up to a hop and node limit"""
+        distances = {center: 0}
+        parents: Dict[str, Optional[str]] = {center: None}
+        queue = deque([center])
+        truncated = False
+        while queue:
+            topic_id = queue.popleft()
+            distance = distances[topic_id]
+            if distance >= hops:
+                continue
+            # Sorted for a stable layout between runs
+            neighbours = dialogue_graph.get_successors(topic_id) | dialogue_graph.get_predecessors(topic_id)
+            for neighbour in sorted(neighbours):
+                if neighbour in distances or neighbour not in dialogue_graph.topics:
+                    continue
+                if len(distances) >= max_nodes:
+                    truncated = True
+                    queue.clear()
+                    break
+                distances[neighbour] = distance + 1
+                parents[neighbour] = topic_id
+                queue.append(neighbour)
+        return distances, parents, truncated
+    
+    def focus(self, center: str) -> None:
+        """Move the view to a new focus topic, keeping nodes that stay visible in place"""
+        distances, parents, self.truncated = self.bfs(self.dialogue_graph, center, self.hops, self.max_nodes)
+        radial = self.radial_layout(distances, parents, center)
+        
+        positions: Dict[str, Tuple[float, float]] = {}
+        old_center_pos = self.positions.get(center)
+        if old_center_pos is not None:
+            # Stepping to a visible neighbour: shift the old layout so the new focus
+            # sits at the origin, and only place nodes that just came into view
+            ox, oy = old_center_pos
+            for topic_id, (x, y) in self.positions.items():
+                if topic_id in distances:
+                    positions[topic_id] = (x - ox, y - oy)
+        for topic_id, pos in radial.items():
+            positions.setdefault(topic_id, pos)
+        
+        self.center = center
+        self.distances = distances
+        self.parents = parents
+        self.positions = positions
+    
+    def refresh(self) -> None:
+        """Recompute the neighbourhood of the current focus after edits or a hop change"""
+        if self.center is not None and self.center in self.dialogue_graph.topics:
+            self.focus(self.center)
+    
+    def radial_layout(
+        self,
+        distances: Dict[str, int],
+        parents: Dict[str, Optional[str]],
+        center: str
+    ) -> Dict[str, Tuple[float, float]]:
+        """Place hop rings around the center, giving each subtree a wedge sized by its leaves"""
+        children: Dict[str, List[str]] = {}
+        order = sorted(distances, key=lambda topic_id: distances[topic_id])
+        for topic_id in order:
+            parent = parents.get(topic_id)
+            if parent is not None:
+                children.setdefault(parent, []).append(topic_id)
+        
+        leaves: Dict[str, int] = {}
+        for topic_id in reversed(order):
+            leaves[topic_id] = sum(leaves[child] for child in children.get(topic_id, ())) or 1
+        
+        # Rings grow when crowded so neighbours do not overlap
+        ring_counts: Dict[int, int] = {}
+        for distance in distances.values():
+            ring_counts[distance] = ring_counts.get(distance, 0) + 1
+        radii = {0: 0.0}
+        for distance in range(1, max(ring_counts) + 1):
+            needed = ring_counts.get(distance, 0) * self.NODE_SPACING / (2 * math.pi)
+            radii[distance] = max(radii[distance - 1] + self.RING_SPACING, needed)
+        
+        positions = {center: (0.0, 0.0)}
+        wedges = {center: (0.0, 2 * math.pi)}
+        for topic_id in order:
+            start, span = wedges[topic_id]
+            offset = start
+            for child in children.get(topic_id, ()):
+                child_span = span * leaves[child] / leaves[topic_id]
+                wedges[child] = (offset, child_span)
+                angle = offset + child_span / 2
+                radius = radii[distances[child]]
+                positions[child] = (radius * math.cos(angle), radius * math.sin(angle))
+                offset += child_span
+        return positions
+    
+    def edges(self) -> List[Tuple[str, str, int]]:
+        """Get the edges of the induced subgraph as (from, to, count)"""
+        edges = []
+        for topic_id in self.distances:
+            for target, count in self.dialogue_graph.get_connection_counts(topic_id).items():
+                if target in self.distances:
+                    edges.append((topic_id, target, count))
+        return edges
@@ -0,0 +1,195 @@
+"""Find-and-replace across topics: text, topic IDs with their references, var names and effect IDs"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from ..models.dialogue import SPECIAL_TOPICS
+from .search import (
+    FIELD_EFFECT, FIELD_ID, FIELD_LINE, FIELD_RESPONSE, FIELD_TRUEFALSE, FIELD_VAR,
+    MODE_REGEX, MODE_SUBSTRING, get_path, set_path
+)
+
+
+# What a replacement rewrites
+KIND_TEXT = "text"  # Dynamic lines, response text and truefalsetext
+KIND_TOPIC_ID = "topic_id"  # Topic IDs and every response leading to them
+KIND_VAR = "var"  # Var names in conditions and effects
+KIND_EFFECT = "effect"  # Effect IDs in conditions and effects
+KINDS = (KIND_TEXT, KIND_TOPIC_ID, KIND_VAR, KIND_EFFECT)
+
+KIND_FIELDS = {
+    KIND_TEXT: (FIELD_LINE, FIELD_RESPONSE, FIELD_TRUEFALSE),
+    KIND_TOPIC_ID: (FIELD_ID,),
+    KIND_VAR: (FIELD_VAR,),
+    KIND_EFFECT: (FIELD_EFFECT,),
+}
+
+# Places in a response that name the topic it leads to
+TARGET_PATHS = ("topic", "success/topic", "failure/topic")
+
+
+@dataclass
+class Change:
+    """One string of a topic before and after the replacement"""
+    topic_id: str  # ID before any rename
+    path: str  # Document path within the topic, "id" for a rename
+    old: str
+    new: str
+
+
+@dataclass
+class ReplaceTransaction:
+    """Changes previewed together and applied or reverted as one step"""
+    dialogue_graph: object
+    changes: List[Change] = field(default_factory=list)
+    conflicts: List[str] = field(default_factory=list)  # Why the changes cannot be applied
+    applied: bool = False
+    
+    @property
+    def renames(self) -> Dict[str, str]:
+        """Old to new ID of each renamed topic"""
+        return {change.topic_id: change.new for change in self.changes if change.path == "id"}
+    
+    def topic_ids(self) -> Set[str]:
+        """IDs (before renames) of the topics the changes touch"""
+        return {change.topic_id for change in self.changes}
+    
+    def apply(self) -> None:
+        """Write every change, or none if the graph no longer holds the previewed values"""
+        if self.applied:
+            return
+        if self.conflicts:
+            raise ValueError(self.conflicts[0])
+        renames = self.renames
+        self._check("old", {})
+        for old, new in renames.items():
+            if new in self.dialogue_graph.topics and new not in renames:
+                raise ValueError(f"{new} was added since the preview")
+        self._write("new", {})
+        self._rename(renames)
+        self.applied = True
+        self._notify()
+    
+    def revert(self) -> None:
+        """Restore every changed string and topic ID"""
+        if not self.applied:
+            return
+        renames = self.renames
+        self._check("new", renames)
+        self._write("old", renames)
+        self._rename({new: old for old, new in renames.items()})
+        self.applied = False
+        self._notify()
+    
+    def _check(self, side: str, renames: Dict[str, str]) -> None:
+        """Make sure each changed string still holds its old (or new) value, with topics under the given IDs"""
+        topics = self.dialogue_graph.topics
+        for change in self.changes:
+            topic = topics.get(renames.get(change.topic_id, change.topic_id))
+            if change.path == "id":
+                if topic is None:
+                    raise ValueError(f"{getattr(change, side)} no longer exists")
+                continue
+            try:
+                current = get_path(topic, change.path) if topic is not None else None
+            except (KeyError, IndexError, TypeError, ValueError):
+                current = None
+            if current != getattr(change, side):
+                raise ValueError(f"{change.topic_id} {change.path} changed since the preview")
+    
+    def _write(self, side: str, renames: Dict[str, str]) -> None:
+        """Set each changed string to its old or new value, with topics under the given IDs"""
+        topics = self.dialogue_graph.topics
+        for change in self.changes:
+            if change.path != "id":
+                set_path(topics[renames.get(change.topic_id, change.topic_id)], change.path, getattr(change, side))
+    
+    def _rename(self, renames: Dict[str, str]) -> None:
+        """Move renamed topics to their new IDs, together with the NPC entry points"""
+        self.dialogue_graph.move_topics(renames)
+    
+    def _notify(self) -> None:
+        """Tell the graph's listeners about every topic added, removed or edited"""
+        renames = self.renames
+        changed = set(self.topic_ids()) | set(renames.values())
+        for topic_id in changed:
+            self.dialogue_graph.notify_topic_changed(topic_id)
+
+
+class BulkReplace:
+    """Plans replacements from search index matches, touching only matching topics and their referrers"""
+    
+    def __init__(self, dialogue_graph, search_index):
+        self.dialogue_graph = dialogue_graph
+        self.search_index = search_index
+    
+    def preview(
+        self,
+        kind: str,
+        find: str,
+        replace: str,
+        regex: bool = False,
+        case_sensitive: bool = True
+    ) -> ReplaceTransaction:
+        """Work out every change a replacement would make, without making it (raises re.error for a bad regex)"""
+        if kind not in KIND_FIELDS:
+            raise ValueError(f"Unknown replacement kind: {kind}")
+        transaction = ReplaceTransaction(self.dialogue_graph)
+        if not find:
+            return transaction
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = re.compile(find if regex else re.escape(find), flags)
+        matches = self.search_index.search(
+            find, MODE_REGEX if regex else MODE_SUBSTRING, case_sensitive, KIND_FIELDS[kind], limit=None, full_scan=True
+        )
+        for match in matches:
+            if kind == KIND_TEXT:
+                # Every occurrence in the text; a plain replacement is taken literally
+                new = pattern.sub(replace if regex else lambda m: replace, match.text)
+            else:
+                # Names and IDs are replaced whole
+                whole = pattern.fullmatch(match.text)
+                if whole is None:
+                    continue
+                new = whole.expand(replace) if regex else replace
+            if new != match.text:
+                transaction.changes.append(Change(match.topic_id, match.path, match.text, new))
+        if kind == KIND_TOPIC_ID:
+            self._add_references(transaction)
+        return transaction
+    
+    def _add_references(self, transaction: ReplaceTransaction) -> None:
+        """Add the response targets that follow each rename, and note IDs that would collide"""
+        graph = self.dialogue_graph
+        renames = transaction.renames
+        new_ids: Dict[str, str] = {}
+        for old, new in renames.items():
+            if not new or new in SPECIAL_TOPICS:
+                transaction.conflicts.append(f"{old} cannot be renamed to '{new}'")
+            elif new in new_ids:
+                transaction.conflicts.append(f"{old} and {new_ids[new]} would both be renamed to {new}")
+            elif new in graph.topics and new not in renames:
+                transaction.conflicts.append(f"{old} cannot be renamed to {new}, which already exists")
+            new_ids[new] = old
+        for old, new in renames.items():
+            # Only topics in the reverse index have responses leading here
+            for source_id in sorted(graph.get_predecessors(old)):
+                topic = graph.topics.get(source_id)
+                if topic is None:
+                    continue
+                for index, response in enumerate(topic.responses):
+                    for target_path in TARGET_PATHS:
+                        path = f"responses/{index}/{target_path}"
+                        if _target(response, target_path) == old:
+                            transaction.changes.append(Change(source_id, path, old, new))
+
+
+def _target(response, target_path: str) -> Optional[str]:
+    """Get the topic a response (or one of its trial branches) leads to"""
+    value = response
+    for part in target_path.split("/"):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value if isinstance(value, str) else None
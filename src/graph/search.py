@@ -0,0 +1,545 @@
+"""Full-text search over topic IDs, dynamic lines, responses, condition keys and var and effect names"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from ..models.dialogue import GENDER_LINE_KEYS
+
+
+# What a document of a topic holds
+FIELD_ID = "id"
+FIELD_LINE = "line"
+FIELD_RESPONSE = "response"
+FIELD_TRUEFALSE = "truefalsetext"
+FIELD_CONDITION = "condition"
+FIELD_VAR = "var"  # Var names read by conditions or set by effects
+FIELD_EFFECT = "effect"  # Effect IDs checked by conditions or given by effects
+FIELDS = (FIELD_ID, FIELD_LINE, FIELD_RESPONSE, FIELD_TRUEFALSE, FIELD_CONDITION, FIELD_VAR, FIELD_EFFECT)
+
+# How a query is matched against document text
+MODE_SUBSTRING = "substring"
+MODE_PREFIX = "prefix"  # At the start of a word
+MODE_REGEX = "regex"
+MODES = (MODE_SUBSTRING, MODE_PREFIX, MODE_REGEX)
+
+MAX_RESULTS = 500
+MIN_QUERY_LENGTH = 3  # Shorter queries without a trigram to look up would check every topic
+
+# Keys of a dynamic_line object that hold more lines rather than a condition
+LINE_KEYS = {"yes", "no", "concatenate"}
+
+# Condition and effect keys whose value names a var or an effect, and the
+# keys holding the name when the value is an object
+NAME_KEYS = {
+    "u_has_var": FIELD_VAR, "npc_has_var": FIELD_VAR,
+    "u_compare_var": FIELD_VAR, "npc_compare_var": FIELD_VAR,
+    "u_add_var": FIELD_VAR, "npc_add_var": FIELD_VAR,
+    "u_lose_var": FIELD_VAR, "npc_lose_var": FIELD_VAR,
+    "u_adjust_var": FIELD_VAR, "npc_adjust_var": FIELD_VAR,
+    "u_has_effect": FIELD_EFFECT, "npc_has_effect": FIELD_EFFECT,
+    "u_add_effect": FIELD_EFFECT, "npc_add_effect": FIELD_EFFECT,
+    "u_lose_effect": FIELD_EFFECT, "npc_lose_effect": FIELD_EFFECT,
+}
+NAME_OBJECT_KEYS = {FIELD_VAR: ("var", "name"), FIELD_EFFECT: ("id", "effect_id")}
+
+# Indexed text is lowercased with every run of non-word characters replaced
+# by one separator, which also starts each document so that prefix queries
+# have a trigram to look up
+SEPARATOR = "\x00"
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Regex syntax that may match differently across the newlines joining a topic's documents
+_JOIN_SENSITIVE = re.compile(r"\(\?<?[=!]|\\[AZ]")
+
+# (field, path within the topic's JSON, text)
+Document = Tuple[str, str, str]
+
+# Finds a query in a text, giving the span of the first match
+Matcher = Callable[[str], Optional[Tuple[int, int]]]
+
+
+@dataclass
+class SearchMatch:
+    """One document of a topic that matches a query"""
+    topic_id: str
+    field: str
+    path: str  # e.g. "dynamic_line/yes" or "responses/2/text"
+    text: str
+    start: int  # Span of the first match within text
+    end: int
+
+
+def normalize(text: str) -> str:
+    """Fold text the way the trigram index stores it"""
+    return _SEPARATORS.sub(SEPARATOR, text.lower())
+
+
+def joined_text(documents: List["Document"]) -> str:
+    """Join the texts of a topic's documents, so a query can be tried on all of them at once"""
+    return "\n".join(text for _, _, text in documents)
+
+
+def indexed_text(joined: str) -> str:
+    """Normalize a topic's joined text into the text its trigrams are taken from"""
+    return SEPARATOR + normalize(joined) + SEPARATOR
+
+
+def trigrams(text: str) -> Set[str]:
+    """Get the distinct three-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def topic_documents(topic) -> List[Document]:
+    """Get the searchable text of a topic: its ID, lines, response texts, condition keys and names"""
+    documents = [(FIELD_ID, "id", topic.id)]
+    _line_documents(topic.dynamic_line, "dynamic_line", documents)
+    speaker_effect = topic.speaker_effect
+    entries = speaker_effect if isinstance(speaker_effect, list) else [speaker_effect]
+    for index, entry in enumerate(entries):
+        path = f"speaker_effect/{index}" if isinstance(speaker_effect, list) else "speaker_effect"
+        if isinstance(entry, dict) and "effect" in entry:
+            _condition_documents(entry.get("condition"), f"{path}/condition", documents)
+            _effect_documents(entry["effect"], f"{path}/effect", documents)
+        else:
+            _effect_documents(entry, path, documents)
+    for index, response in enumerate(topic.responses):
+        if not isinstance(response, dict):
+            continue
+        path = f"responses/{index}"
+        text = response.get("text")
+        if isinstance(text, str) and text:
+            documents.append((FIELD_RESPONSE, f"{path}/text", text))
+        truefalse = response.get("truefalsetext")
+        if isinstance(truefalse, dict):
+            for key in ("true", "false"):
+                if isinstance(truefalse.get(key), str):
+                    documents.append((FIELD_TRUEFALSE, f"{path}/truefalsetext/{key}", truefalse[key]))
+            _condition_documents(truefalse.get("condition"), f"{path}/truefalsetext/condition", documents)
+        _condition_documents(response.get("condition"), f"{path}/condition", documents)
+        trial = response.get("trial")
+        if isinstance(trial, dict):
+            _condition_documents(trial.get("condition"), f"{path}/trial/condition", documents)
+        _effect_documents(response.get("effect"), f"{path}/effect", documents)
+        for branch in ("success", "failure"):
+            if isinstance(response.get(branch), dict):
+                _effect_documents(response[branch].get("effect"), f"{path}/{branch}/effect", documents)
+    return documents
+
+
+def _line_documents(line, path: str, documents: List[Document]) -> None:
+    """Add the strings of a dynamic_line, following conditional, gendered, random and concatenated parts"""
+    if isinstance(line, str):
+        if line:
+            documents.append((FIELD_LINE, path, line))
+    elif isinstance(line, list):
+        for index, item in enumerate(line):
+            _line_documents(item, f"{path}/{index}", documents)
+    elif isinstance(line, dict):
+        for key, value in line.items():
+            if key in LINE_KEYS or (key in GENDER_LINE_KEYS and not isinstance(value, bool)):
+                _line_documents(value, f"{path}/{key}", documents)
+            else:
+                _condition_documents({key: value}, path, documents)
+
+
+def _condition_documents(condition, path: str, documents: List[Document]) -> None:
+    """Add the keys of a condition tree (and string conditions) as documents"""
+    if isinstance(condition, str):
+        documents.append((FIELD_CONDITION, path, condition))
+    elif isinstance(condition, list):
+        for index, item in enumerate(condition):
+            _condition_documents(item, f"{path}/{index}", documents)
+    elif isinstance(condition, dict):
+        for key, value in condition.items():
+            documents.append((FIELD_CONDITION, f"{path}/{key}", key))
+            if key in NAME_KEYS:
+                _name_document(key, value, f"{path}/{key}", documents)
+            elif isinstance(value, (dict, list)):
+                _condition_documents(value, f"{path}/{key}", documents)
+
+
+def _effect_documents(effect, path: str, documents: List[Document]) -> None:
+    """Add the var and effect names an effect (an object, or a list of them) refers to"""
+    if isinstance(effect, list):
+        for index, item in enumerate(effect):
+            _effect_documents(item, f"{path}/{index}", documents)
+    elif isinstance(effect, dict):
+        for key, value in effect.items():
+            if key in NAME_KEYS:
+                _name_document(key, value, f"{path}/{key}", documents)
+            elif key == "effect":
+                _effect_documents(value, f"{path}/{key}", documents)
+
+
+def _name_document(key: str, value, path: str, documents: List[Document]) -> None:
+    """Add the var or effect name under a *_var or *_effect key, given directly or in an object"""
+    field = NAME_KEYS[key]
+    if isinstance(value, dict):
+        name_key = next((name_key for name_key in NAME_OBJECT_KEYS[field] if name_key in value), None)
+        if name_key is None:
+            return
+        value, path = value[name_key], f"{path}/{name_key}"
+    if isinstance(value, str) and value:
+        documents.append((field, path, value))
+
+
+def get_path(topic, path: str):
+    """Get the value at a document path of a topic"""
+    first, *rest = path.split("/")
+    value = getattr(topic, first)
+    for part in rest:
+        value = value[int(part)] if isinstance(value, list) else value[part]
+    return value
+
+
+def set_path(topic, path: str, value) -> None:
+    """Replace the value at a document path of a topic (the ID is renamed through the graph instead)"""
+    parent, _, last = path.rpartition("/")
+    if not parent:
+        setattr(topic, last, value)
+        return
+    container = get_path(topic, parent)
+    if isinstance(container, list):
+        container[int(last)] = value
+    else:
+        container[last] = value
+
+
+def regex_literals(pattern: str) -> List[str]:
+    """Get literal runs every match of a regex must contain (none when unsure)"""
+    # Only top-level characters outside groups, classes and optional
+    # quantifiers are collected, and top-level alternation gives up entirely
+    if re.compile(pattern).flags & re.VERBOSE:
+        return []
+    literals: List[str] = []
+    current: List[str] = []
+    
+    def flush():
+        if current:
+            literals.append("".join(current))
+            current.clear()
+    
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if not escaped or escaped.isalnum():
+                # Character class, anchor or back-reference
+                flush()
+                continue
+            char = escaped
+        elif char == "[":
+            flush()
+            i += 1
+            if pattern[i:i + 1] == "^":
+                i += 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            continue
+        elif char == "|" and depth == 0:
+            return []
+        elif char in "()":
+            flush()
+            depth += 1 if char == "(" else -1
+            i += 1
+            continue
+        elif char in "*?{":
+            # The previous character may be absent
+            if current:
+                current.pop()
+            flush()
+            if char == "{":
+                closing = pattern.find("}", i)
+                i = closing + 1 if closing != -1 else len(pattern)
+            else:
+                i += 1
+            continue
+        elif char in ".^$+":
+            flush()
+            i += 1
+            continue
+        else:
+            i += 1
+        if depth == 0:
+            current.append(char)
+        else:
+            flush()
+    flush()
+    return literals
+
+
+class _Tables:
+    """Everything an index build produces, made off to the side so a worker thread can build it"""
+    
+    def __init__(self, topics: list):
+        self.documents: Dict[str, List[Document]] = {}
+        self.texts: Dict[str, str] = {}
+        self.topic_ids: List[str] = []
+        # Ordinals per trigram, turned into a bitset the first time a query needs it
+        self.postings: Dict[str, Union[int, List[int]]] = {}
+        self.failed: List[str] = []  # Topics edited while being read
+        postings = self.postings
+        for topic in topics:
+            try:
+                documents = topic_documents(topic)
+            except RuntimeError:
+                # Changed size during iteration: the edit's notification re-indexes it
+                self.failed.append(topic.id)
+                continue
+            ordinal = len(self.topic_ids)
+            self.topic_ids.append(topic.id)
+            self.documents[topic.id] = documents
+            text = self.texts[topic.id] = joined_text(documents)
+            for trigram in trigrams(indexed_text(text)):
+                ordinals = postings.get(trigram)
+                if ordinals is None:
+                    postings[trigram] = [ordinal]
+                else:
+                    ordinals.append(ordinal)
+
+
+class SearchIndex:
+    """Trigram index over topic text for substring, word-prefix and regex search, kept current as topics change"""
+    
+    # Each topic gets an ordinal, and each trigram maps to an int used as a
+    # bitset of the ordinals of topics whose text contains it. A query ANDs
+    # the bitsets of its trigrams, drops topics whose normalized text lacks
+    # a literal and only checks the topics left, in ordinal (file) order
+    # until enough matches are found.
+    
+    def __init__(self, dialogue_graph):
+        self.dialogue_graph = dialogue_graph
+        # Built by build() or start_build(), then updated by the graph's change listeners
+        self._documents: Optional[Dict[str, List[Document]]] = None
+        self._texts: Dict[str, str] = {}  # Joined document texts of each topic
+        self._ordinals: Dict[str, int] = {}
+        self._topic_ids: List[str] = []
+        self._trigrams: Dict[str, Union[int, List[int]]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._tables: Optional[_Tables] = None  # Result of the worker, until installed
+        self._pending: Set[str] = set()  # Topics changed while the worker runs
+        self.version = 0  # Bumped whenever results may have changed
+        dialogue_graph.add_change_listener(self.on_topic_changed)
+    
+    def close(self) -> None:
+        """Stop following edits to the graph"""
+        self.dialogue_graph.remove_change_listener(self.on_topic_changed)
+    
+    def on_topic_changed(self, topic_id: str) -> None:
+        """Re-index a topic that was added, edited or removed"""
+        self.version += 1
+        if self._documents is None:
+            if self._worker is not None:
+                self._pending.add(topic_id)
+            return
+        self._reindex(topic_id)
+    
+    def _reindex(self, topic_id: str) -> None:
+        """Index a topic as it is now in the graph"""
+        self._remove(topic_id)
+        topic = self.dialogue_graph.topics.get(topic_id)
+        if topic is not None:
+            self._add(topic)
+    
+    @property
+    def built(self) -> bool:
+        """Check if the index can be searched without waiting (installing a finished background build)"""
+        if self._documents is None and self._worker is not None and not self._worker.is_alive():
+            self._install()
+        return self._documents is not None
+    
+    @property
+    def building(self) -> bool:
+        """Check if a background build is running"""
+        return self._documents is None and self._worker is not None and self._worker.is_alive()
+    
+    def start_build(self) -> None:
+        """Index every topic on a worker thread, so the first search does not wait (e.g. right after import)"""
+        if self._documents is not None or self._worker is not None:
+            return
+        # Topics added or removed from now on are noted by on_topic_changed
+        topics = list(self.dialogue_graph.topics.values())
+        
+        def work():
+            self._tables = _Tables(topics)
+        self._worker = threading.Thread(target=work, name="search-index", daemon=True)
+        self._worker.start()
+    
+    def build(self) -> None:
+        """Index every topic, if not done yet (waiting for a background build instead if one is running)"""
+        if self._documents is not None:
+            return
+        if self._worker is not None:
+            self._worker.join()
+            self._install()
+            return
+        self._set_tables(_Tables(list(self.dialogue_graph.topics.values())))
+    
+    def _install(self) -> None:
+        """Take over a finished background build and index the topics changed while it ran"""
+        tables, self._tables = self._tables, None
+        self._worker = None
+        if tables is None:
+            # The worker failed; index on this thread instead
+            self._pending.clear()
+            self.build()
+            return
+        self._set_tables(tables)
+        changed = self._pending | set(tables.failed)
+        self._pending = set()
+        for topic_id in changed:
+            self._reindex(topic_id)
+    
+    def _set_tables(self, tables: _Tables) -> None:
+        """Use the result of a build as the index"""
+        self._documents = tables.documents
+        self._texts = tables.texts
+        self._topic_ids = tables.topic_ids
+        self._ordinals = {topic_id: ordinal for ordinal, topic_id in enumerate(tables.topic_ids)}
+        self._trigrams = tables.postings
+    
+    def _bits(self, trigram: str) -> int:
+        """Get the bitset of topics whose text contains a trigram"""
+        bits = self._trigrams.get(trigram, 0)
+        if type(bits) is list:
+            # Built lazily: only the trigrams queries use are ever needed as ints
+            bitmap = bytearray((len(self._topic_ids) + 7) // 8)
+            for ordinal in bits:
+                bitmap[ordinal >> 3] |= 1 << (ordinal & 7)
+            bits = self._trigrams[trigram] = int.from_bytes(bitmap, "little")
+        return bits
+    
+    def _ordinal(self, topic_id: str) -> int:
+        """Get a topic's ordinal, giving new topics the next one"""
+        ordinal = self._ordinals.get(topic_id)
+        if ordinal is None:
+            ordinal = self._ordinals[topic_id] = len(self._topic_ids)
+            self._topic_ids.append(topic_id)
+        return ordinal
+    
+    def _add(self, topic) -> None:
+        """Index one topic"""
+        documents = self._documents[topic.id] = topic_documents(topic)
+        text = self._texts[topic.id] = joined_text(documents)
+        bit = 1 << self._ordinal(topic.id)
+        index = self._trigrams
+        for trigram in trigrams(indexed_text(text)):
+            index[trigram] = self._bits(trigram) | bit
+    
+    def _remove(self, topic_id: str) -> None:
+        """Drop one topic from the index (its ordinal is kept should it come back)"""
+        if self._documents.pop(topic_id, None) is None:
+            return
+        text = self._texts.pop(topic_id)
+        mask = ~(1 << self._ordinals[topic_id])
+        index = self._trigrams
+        for trigram in trigrams(indexed_text(text)):
+            remaining = self._bits(trigram) & mask
+            if remaining:
+                index[trigram] = remaining
+            else:
+                del index[trigram]
+    
+    def documents(self, topic_id: str) -> List[Document]:
+        """Get the indexed documents of a topic"""
+        self.build()
+        return self._documents.get(topic_id, [])
+    
+    def search(
+        self,
+        query: str,
+        mode: str = MODE_SUBSTRING,
+        case_sensitive: bool = False,
+        fields: Optional[Iterable[str]] = None,
+        limit: Optional[int] = MAX_RESULTS,
+        full_scan: bool = False
+    ) -> List[SearchMatch]:
+        """Find documents matching a query, in file order (raises re.error for a bad regex)"""
+        if not query:
+            return []
+        matcher, topic_matcher, literals = self._matcher(query, mode, case_sensitive)
+        # A short query without a trigram to look up would check every topic;
+        # only bulk replacements (full_scan) are worth that
+        if len(query) < MIN_QUERY_LENGTH and not full_scan and all(len(literal) < 3 for literal in literals):
+            return []
+        self.build()
+        wanted = set(fields) if fields is not None else None
+        texts = self._texts
+        matches: List[SearchMatch] = []
+        for topic_id in self._candidates(literals):
+            # Trigrams can all occur without the query matching; one test on
+            # the whole topic rules most such topics out before each document
+            if topic_matcher is not None and topic_matcher(texts[topic_id]) is None:
+                continue
+            for field, path, text in self._documents[topic_id]:
+                if wanted is not None and field not in wanted:
+                    continue
+                span = matcher(text)
+                if span is not None:
+                    matches.append(SearchMatch(topic_id, field, path, text, span[0], span[1]))
+                    if limit is not None and len(matches) >= limit:
+                        return matches
+        return matches
+    
+    def _matcher(self, query: str, mode: str, case_sensitive: bool) -> Tuple[Matcher, Optional[Matcher], List[str]]:
+        """Get functions finding the query in a document and in a topic's joined text, and literals every match contains"""
+        if mode == MODE_SUBSTRING:
+            needle = query if case_sensitive else query.lower()
+            
+            def find(text: str) -> Optional[Tuple[int, int]]:
+                start = (text if case_sensitive else text.lower()).find(needle)
+                return (start, start + len(needle)) if start != -1 else None
+            return find, find, [normalize(query)]
+        
+        flags = 0 if case_sensitive else re.IGNORECASE
+        if mode == MODE_PREFIX:
+            word_start = not _SEPARATORS.match(query[0])
+            pattern = re.compile(("(?<![^\\W_])" if word_start else "") + re.escape(query), flags)
+            literals = [(SEPARATOR if word_start else "") + normalize(query)]
+            joined_pattern = pattern
+        elif mode == MODE_REGEX:
+            pattern = re.compile(query, flags)
+            literals = [normalize(literal) for literal in regex_literals(query)]
+            # The newlines between documents act as line ends for ^ and $, and
+            # as non-word characters for \b; lookarounds and \A or \Z could
+            # still tell them apart from the ends of a document
+            joined_pattern = None if _JOIN_SENSITIVE.search(query) else re.compile(query, flags | re.MULTILINE)
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        def search(text: str) -> Optional[Tuple[int, int]]:
+            match = pattern.search(text)
+            return match.span() if match else None
+        
+        def search_joined(text: str) -> Optional[Tuple[int, int]]:
+            match = joined_pattern.search(text)
+            return match.span() if match else None
+        return search, (search_joined if joined_pattern is not None else None), literals
+    
+    def _candidates(self, literals: List[str]) -> Iterator[str]:
+        """Yield IDs of topics whose text may contain every literal, in ordinal order"""
+        mask = None
+        for literal in literals:
+            for trigram in trigrams(literal):
+                bits = self._bits(trigram)
+                mask = bits if mask is None else mask & bits
+                if not mask:
+                    return
+        if mask is None:
+            # Too short for a trigram: every topic is checked
+            yield from self._topic_ids
+            return
+        # Set bits read from the binary string, lowest ordinal first
+        bits = bin(mask)[:1:-1]
+        ordinal = bits.find("1")
+        while ordinal != -1:
+            yield self._topic_ids[ordinal]
+            ordinal = bits.find("1", ordinal + 1)
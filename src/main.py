@@ -1,21 +1,60 @@
 """Main entry point for the dialogue editor"""
 
+import argparse
 import sys
 import traceback
 
+from .utils.perf import perf
+from .utils.profiling import ACTIONS, profiler
 
-def main():
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Cataclysm: Bright Nights dialogue editor")
+    parser.add_argument(
+        "--perf-log",
+        metavar="FILE",
+        help="append timing events (redraws, layouts, parsing) to FILE as JSON lines"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="write cProfile output for selected actions to DIR, with a hot spot summary"
+    )
+    parser.add_argument(
+        "--profile-actions",
+        default=",".join(ACTIONS),
+        help="comma-separated actions to profile: %(default)s, or session for the whole run"
+    )
+    args = parser.parse_args(argv)
+    args.profile_actions = [action.strip() for action in args.profile_actions.split(",") if action.strip()]
+    unknown = set(args.profile_actions) - set(ACTIONS) - {"session"}
+    if unknown:
+        parser.error(f"unknown profile action(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
     """Run the dialogue editor"""
+    args = parse_args(argv)
     try:
+        if args.perf_log:
+            perf.open_log(args.perf_log)
+        if args.profile:
+            profiler.configure(args.profile, args.profile_actions)
+        
         from .ui.main_window import MainWindow
         app = MainWindow()
-        app.mainloop()
+        with profiler.profile("session"):
+            app.mainloop()
     except Exception as e:
         print(f"Error starting application: {e}", file=sys.stderr)
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        profiler.write_timings()
+        perf.close_log()
 
 
 if __name__ == "__main__":
     main()
-
@@ -1,8 +1,9 @@
 """Data models for dialogue topics and graph structure"""
 
-from .dialogue import DialogueTopic, DialogueGraph
+from .dialogue import DialogueTopic, DialogueGraph, SPECIAL_TOPICS
+from .snapshot import GraphSnapshot, PersistentMap
 
-__all__ = ['DialogueTopic', 'DialogueGraph']
+__all__ = ['DialogueTopic', 'DialogueGraph', 'SPECIAL_TOPICS', 'GraphSnapshot', 'PersistentMap']
 
 
 
@@ -1,9 +1,16 @@
 """Dialogue data models"""
 
-from typing import List, Dict, Optional, Any, Union
+from typing import Callable, List, Dict, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field
 
 
+# Built-in topics that end or leave the conversation rather than being defined in files
+SPECIAL_TOPICS = {"TALK_NONE", "TALK_DONE", "TALK_TRAIN"}
+
+# Keys of a dynamic_line object that hold lines for one gender instead of a condition
+GENDER_LINE_KEYS = ("u_male", "u_female", "npc_male", "npc_female")
+
+
 @dataclass
 class DialogueTopic:
     """Represents a single talk_topic"""
@@ -85,24 +92,113 @@ class DialogueGraph:
     
     def __init__(self):
         self.topics: Dict[str, DialogueTopic] = {}
+        # Topics NPC definitions in the loaded file start conversations with
+        self.entry_points: List[str] = []
+        # Forward and reverse adjacency, built on first use. Code that edits a
+        # topic in place must call notify_topic_changed.
+        self._successors: Optional[Dict[str, Set[str]]] = None
+        self._predecessors: Optional[Dict[str, Set[str]]] = None
+        self.change_listeners: List[Callable[[str], None]] = []
+        # Frozen copies of the topics, kept from the first snapshot on
+        self._snapshots = None
+    
+    def add_change_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the topic ID whenever a topic is added, edited or removed"""
+        if listener not in self.change_listeners:
+            self.change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[str], None]) -> None:
+        """Unregister a change callback"""
+        if listener in self.change_listeners:
+            self.change_listeners.remove(listener)
     
     def add_topic(self, topic: DialogueTopic) -> None:
         """Add a topic to the graph"""
         self.topics[topic.id] = topic
+        self.notify_topic_changed(topic.id)
     
     def remove_topic(self, topic_id: str) -> bool:
         """Remove a topic from the graph"""
         if topic_id in self.topics:
+            # Only topics in the reverse index can have responses leading here
+            referrers = set(self.get_predecessors(topic_id))
             del self.topics[topic_id]
+            self.notify_topic_changed(topic_id)
             # Remove references from other topics
-            for topic in self.topics.values():
+            for source_id in referrers:
+                topic = self.topics.get(source_id)
+                if topic is None:
+                    continue
                 topic.responses = [
                     resp for resp in topic.responses 
                     if resp.get("topic") != topic_id
                 ]
+                self.notify_topic_changed(source_id)
             return True
         return False
     
+    def rename_topic(self, old_id: str, new_id: str, paths: Optional[List[Tuple[str, str]]] = None) -> List[str]:
+        """Give a topic a new ID and point every response leading to it there; returns the rewritten topics, and adds each rewritten (topic, path) to paths"""
+        if old_id not in self.topics:
+            raise ValueError(f"Topic {old_id} does not exist")
+        if not new_id or new_id in SPECIAL_TOPICS:
+            raise ValueError(f"'{new_id}' cannot be used as a topic ID")
+        if new_id in self.topics:
+            raise ValueError(f"Topic ID '{new_id}' already exists")
+        # Only topics in the reverse index have responses leading here
+        referrers = sorted(self.get_predecessors(old_id))
+        topic = self.topics.pop(old_id)
+        topic.id = new_id
+        self.topics[new_id] = topic
+        self.entry_points = [new_id if entry == old_id else entry for entry in self.entry_points]
+        
+        rewritten = []
+        for source_id in referrers:
+            source_id = new_id if source_id == old_id else source_id
+            source = self.topics.get(source_id)
+            if source is None:
+                continue
+            for index, response in enumerate(source.responses):
+                if response.get("topic") == old_id:
+                    response["topic"] = new_id
+                    if paths is not None:
+                        paths.append((source_id, f"responses/{index}/topic"))
+                for key in ("success", "failure"):
+                    branch = response.get(key)
+                    if isinstance(branch, dict) and branch.get("topic") == old_id:
+                        branch["topic"] = new_id
+                        if paths is not None:
+                            paths.append((source_id, f"responses/{index}/{key}/topic"))
+            rewritten.append(source_id)
+        
+        self.notify_topic_changed(old_id)
+        self.notify_topic_changed(new_id)
+        for source_id in rewritten:
+            if source_id != new_id:
+                self.notify_topic_changed(source_id)
+        return rewritten
+    
+    def move_topics(self, renames: Dict[str, str]) -> None:
+        """Move topics to new IDs, together with the NPC entry points (IDs may be swapped); responses are left alone"""
+        # Take every topic out first so IDs can be swapped between topics
+        moved = {new: self.topics.pop(old) for old, new in renames.items()}
+        for new, topic in moved.items():
+            topic.id = new
+            self.topics[new] = topic
+        if renames:
+            self.entry_points = [renames.get(topic_id, topic_id) for topic_id in self.entry_points]
+            if self._snapshots is not None:
+                self._snapshots.reordered = True
+    
+    def snapshot(self):
+        """Get an immutable GraphSnapshot of the graph as it is now, for worker threads and later comparison"""
+        # The first snapshot copies every topic; later ones copy only the topics
+        # notified as changed since, sharing the rest. Call from the editing thread.
+        if self._snapshots is None:
+            from .snapshot import SnapshotCache
+            self._snapshots = SnapshotCache(self)
+        return self._snapshots.snapshot()
+    
     def get_topic(self, topic_id: str) -> Optional[DialogueTopic]:
         """Get a topic by ID"""
         return self.topics.get(topic_id)
@@ -135,28 +231,73 @@ class DialogueGraph:
         
         return connections
     
+    def get_connection_counts(self, topic_id: str) -> Dict[str, int]:
+        """Get how many responses of this topic lead to each target topic"""
+        topic = self.get_topic(topic_id)
+        if not topic:
+            return {}
+        
+        counts: Dict[str, int] = {}
+        for response in topic.responses:
+            target = response.get("topic")
+            if target:
+                counts[target] = counts.get(target, 0) + 1
+            
+            if "trial" in response:
+                for branch in (response.get("success", {}), response.get("failure", {})):
+                    branch_topic = branch.get("topic") if isinstance(branch, dict) else None
+                    if branch_topic:
+                        counts[branch_topic] = counts.get(branch_topic, 0) + 1
+        
+        return counts
+    
     def get_incoming_connections(self, topic_id: str) -> List[str]:
         """Get all topic IDs that connect to this topic"""
-        incoming = []
-        for topic_id_other, topic in self.topics.items():
-            for response in topic.responses:
-                # Check direct topic
-                if response.get("topic") == topic_id:
-                    incoming.append(topic_id_other)
-                    break
-                
-                # Check trial success/failure
-                if "trial" in response:
-                    success = response.get("success", {})
-                    failure = response.get("failure", {})
-                    
-                    success_topic = success.get("topic") if isinstance(success, dict) else None
-                    failure_topic = failure.get("topic") if isinstance(failure, dict) else None
-                    
-                    if success_topic == topic_id or failure_topic == topic_id:
-                        incoming.append(topic_id_other)
-                        break
-        return incoming
+        # Reverse index lookup instead of scanning every topic's responses
+        return sorted(self.get_predecessors(topic_id))
+    
+    def get_successors(self, topic_id: str) -> Set[str]:
+        """Get IDs this topic's responses lead to (from the index; do not modify)"""
+        self._ensure_index()
+        return self._successors.get(topic_id, set())
+    
+    def get_predecessors(self, topic_id: str) -> Set[str]:
+        """Get IDs of topics with a response leading here (from the index; do not modify)"""
+        self._ensure_index()
+        return self._predecessors.get(topic_id, set())
+    
+    def notify_topic_changed(self, topic_id: str) -> None:
+        """Update the adjacency index and tell listeners after a topic was added, edited or removed"""
+        if self._successors is not None:
+            self._update_index(topic_id)
+        if self._snapshots is not None:
+            self._snapshots.stale.add(topic_id)
+        for listener in self.change_listeners:
+            listener(topic_id)
+    
+    def _update_index(self, topic_id: str) -> None:
+        """Replace one topic's outgoing edges in the adjacency index"""
+        for target in self._successors.pop(topic_id, ()):
+            sources = self._predecessors.get(target)
+            if sources is not None:
+                sources.discard(topic_id)
+        if topic_id in self.topics:
+            targets = set(self.get_connections(topic_id))
+            self._successors[topic_id] = targets
+            for target in targets:
+                self._predecessors.setdefault(target, set()).add(topic_id)
+    
+    def _ensure_index(self) -> None:
+        """Build the adjacency index if it is missing"""
+        if self._successors is not None:
+            return
+        self._successors = {}
+        self._predecessors = {}
+        for topic_id in self.topics:
+            targets = set(self.get_connections(topic_id))
+            self._successors[topic_id] = targets
+            for target in targets:
+                self._predecessors.setdefault(target, set()).add(topic_id)
     
     def to_json(self) -> List[Dict[str, Any]]:
         """Export to JSON array"""
@@ -165,13 +306,20 @@ class DialogueGraph:
     def validate_references(self) -> List[str]:
         """Check that all topic references exist"""
         errors = []
-        special_topics = {"TALK_NONE", "TALK_DONE", "TALK_TRAIN"}
+        for topic_id in self.topics:
+            errors.extend(self.validate_topic_references(topic_id))
+        return errors
+    
+    def validate_topic_references(self, topic_id: str) -> List[str]:
+        """Check that the topics one topic's responses lead to exist"""
+        errors = []
         
-        for topic in self.topics.values():
+        topic = self.topics.get(topic_id)
+        if topic is not None:
             for response in topic.responses:
                 # Check direct topic reference
                 target = response.get("topic")
-                if target and target not in special_topics and target not in self.topics:
+                if target and target not in SPECIAL_TOPICS and target not in self.topics:
                     errors.append(
                         f"Topic {topic.id} references non-existent topic: {target}"
                     )
@@ -184,12 +332,12 @@ class DialogueGraph:
                     success_topic = success.get("topic") if isinstance(success, dict) else None
                     failure_topic = failure.get("topic") if isinstance(failure, dict) else None
                     
-                    if success_topic and success_topic not in special_topics and success_topic not in self.topics:
+                    if success_topic and success_topic not in SPECIAL_TOPICS and success_topic not in self.topics:
                         errors.append(
                             f"Topic {topic.id} trial success references non-existent topic: {success_topic}"
                         )
                     
-                    if failure_topic and failure_topic not in special_topics and failure_topic not in self.topics:
+                    if failure_topic and failure_topic not in SPECIAL_TOPICS and failure_topic not in self.topics:
                         errors.append(
                             f"Topic {topic.id} trial failure references non-existent topic: {failure_topic}"
                         )
@@ -0,0 +1,325 @@
+"""Immutable snapshots of a dialogue graph that share unchanged topics with earlier snapshots"""
+
+import gc
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Tuple
+
+from .dialogue import DialogueGraph, DialogueTopic
+
+
+BITS = 5  # Hash bits consumed per trie level
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class FrozenDict(dict):
+    """JSON object that cannot be changed (still a dict, so json.dumps writes it unchanged)"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict cannot be changed")
+    
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Deep-copy JSON data into FrozenDicts and tuples"""
+    kind = type(value)
+    if kind is dict or kind is FrozenDict:
+        return FrozenDict({key: freeze(item) if type(item) in _CONTAINERS else item for key, item in value.items()})
+    if kind is list or kind is tuple:
+        return tuple([freeze(item) if type(item) in _CONTAINERS else item for item in value])
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Deep-copy frozen JSON data back into dicts and lists"""
+    kind = type(value)
+    if kind is FrozenDict or kind is dict:
+        return {key: thaw(item) if type(item) in _CONTAINERS else item for key, item in value.items()}
+    if kind is tuple or kind is list:
+        return [thaw(item) if type(item) in _CONTAINERS else item for item in value]
+    return value
+
+
+_CONTAINERS = {dict, FrozenDict, list, tuple}  # Scalars are shared, not copied
+
+
+class _Bucket:
+    """Trie leaf holding the entries whose keys share one hash"""
+    __slots__ = ("hash", "items")
+    
+    def __init__(self, key_hash: int, items: Tuple[Tuple[Any, Any], ...]):
+        self.hash = key_hash
+        self.items = items
+
+
+class PersistentMap(Mapping):
+    """Immutable hash trie; set() and delete() return a new map sharing every node off the changed path"""
+    __slots__ = ("_root", "_size")
+    
+    def __init__(self, items: Optional[Mapping] = None):
+        self._root = None  # None, a _Bucket, or a tuple of WIDTH children
+        self._size = 0
+        if items:
+            root, size = None, 0
+            for key, value in items.items():
+                root, added = _assoc(root, 0, hash(key), key, value)
+                size += added
+            self._root, self._size = root, size
+    
+    @classmethod
+    def _make(cls, root, size: int) -> "PersistentMap":
+        result = cls.__new__(cls)
+        result._root = root
+        result._size = size
+        return result
+    
+    def set(self, key, value) -> "PersistentMap":
+        """Get a map with the key set to the value"""
+        root, added = _assoc(self._root, 0, hash(key), key, value)
+        return self._make(root, self._size + added)
+    
+    def delete(self, key) -> "PersistentMap":
+        """Get a map without the key (the same map if it is missing)"""
+        root, removed = _dissoc(self._root, 0, hash(key), key)
+        return self._make(root, self._size - 1) if removed else self
+    
+    def get(self, key, default=None):
+        key_hash = hash(key)
+        node = self._root
+        shift = 0
+        while type(node) is tuple:
+            node = node[(key_hash >> shift) & MASK]
+            shift += BITS
+        if node is not None and node.hash == key_hash:
+            for item_key, value in node.items:
+                if item_key is key or item_key == key:
+                    return value
+        return default
+    
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def changed_keys(self, other: "PersistentMap") -> Iterator:
+        """Yield keys added, removed or given another value object in other, skipping every shared node"""
+        stack = [(self._root, other._root)]
+        while stack:
+            mine, theirs = stack.pop()
+            if mine is theirs:
+                continue
+            if type(mine) is tuple and type(theirs) is tuple:
+                stack.extend(pair for pair in zip(mine, theirs) if pair[0] is not pair[1])
+                continue
+            # Leaves, or a leaf facing a branch: compare the entries below
+            old, new = dict(_entries(mine)), dict(_entries(theirs))
+            for key, value in old.items():
+                if new.get(key, _MISSING) is not value:
+                    yield key
+            for key in new:
+                if key not in old:
+                    yield key
+    
+    def __iter__(self) -> Iterator:
+        return (key for key, _ in _entries(self._root))
+
+
+_MISSING = object()
+
+
+def _entries(node) -> Iterator[Tuple[Any, Any]]:
+    """Yield the (key, value) pairs stored under a trie node"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if type(node) is tuple:
+            stack.extend(child for child in node if child is not None)
+        elif node is not None:
+            yield from node.items
+
+
+def _assoc(node, shift: int, key_hash: int, key, value) -> Tuple[Any, bool]:
+    """Copy the path to the key with its new value; also tells whether the key is new"""
+    if node is None:
+        return _Bucket(key_hash, ((key, value),)), True
+    if type(node) is tuple:
+        index = (key_hash >> shift) & MASK
+        child, added = _assoc(node[index], shift + BITS, key_hash, key, value)
+        return node[:index] + (child,) + node[index + 1:], added
+    if node.hash == key_hash:
+        items = node.items
+        for position, (item_key, _) in enumerate(items):
+            if item_key is key or item_key == key:
+                return _Bucket(key_hash, items[:position] + ((key, value),) + items[position + 1:]), False
+        return _Bucket(key_hash, items + ((key, value),)), True
+    # Another hash in the way: push it one level down and insert beside it
+    branch = [None] * WIDTH
+    branch[(node.hash >> shift) & MASK] = node
+    return _assoc(tuple(branch), shift, key_hash, key, value)
+
+
+def _dissoc(node, shift: int, key_hash: int, key) -> Tuple[Any, bool]:
+    """Copy the path to the key without it; also tells whether the key was there"""
+    if node is None:
+        return None, False
+    if type(node) is tuple:
+        index = (key_hash >> shift) & MASK
+        child, removed = _dissoc(node[index], shift + BITS, key_hash, key)
+        if not removed:
+            return node, False
+        node = node[:index] + (child,) + node[index + 1:]
+        live = [child for child in node if child is not None]
+        if not live:
+            return None, True
+        if len(live) == 1 and type(live[0]) is not tuple:
+            # A lone bucket can sit higher up; lookups stop at the first leaf
+            return live[0], True
+        return node, True
+    if node.hash != key_hash:
+        return node, False
+    items = tuple(item for item in node.items if not (item[0] is key or item[0] == key))
+    if len(items) == len(node.items):
+        return node, False
+    return (_Bucket(key_hash, items) if items else None), True
+
+
+@dataclass(frozen=True)
+class FrozenTopic:
+    """Read-only copy of a talk_topic"""
+    id: str
+    type: str
+    dynamic_line: Any
+    speaker_effect: Any
+    responses: Tuple[FrozenDict, ...]
+    
+    # Export and checks are the same as for editable topics
+    to_json = DialogueTopic.to_json
+    validate = DialogueTopic.validate
+    
+    @classmethod
+    def from_topic(cls, topic: DialogueTopic) -> "FrozenTopic":
+        """Freeze a copy of an editable topic"""
+        return cls(
+            id=topic.id,
+            type=topic.type,
+            dynamic_line=freeze(topic.dynamic_line),
+            speaker_effect=freeze(topic.speaker_effect),
+            responses=freeze(topic.responses)
+        )
+    
+    def thaw(self) -> DialogueTopic:
+        """Get an editable copy"""
+        return DialogueTopic(
+            id=self.id,
+            type=self.type,
+            dynamic_line=thaw(self.dynamic_line),
+            speaker_effect=thaw(self.speaker_effect),
+            responses=thaw(self.responses)
+        )
+
+
+class SnapshotTopics(Mapping):
+    """Topics of a snapshot by ID, in file order"""
+    __slots__ = ("_topics", "_order")
+    
+    def __init__(self, topics: PersistentMap, order: Tuple[str, ...]):
+        self._topics = topics
+        self._order = order
+    
+    def __getitem__(self, topic_id: str) -> FrozenTopic:
+        return self._topics[topic_id]
+    
+    def get(self, topic_id: str, default=None):
+        return self._topics.get(topic_id, default)
+    
+    def __contains__(self, topic_id) -> bool:
+        return topic_id in self._topics
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+    
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class GraphSnapshot:
+    """A dialogue graph frozen at one moment; safe to read from worker threads while the graph is edited"""
+    
+    def __init__(self, topics: PersistentMap, order: Tuple[str, ...], entry_points: Tuple[str, ...]):
+        self.topics = SnapshotTopics(topics, order)
+        self.order = order  # Topic IDs in file order
+        self.entry_points = entry_points
+        self._map = topics
+    
+    # Read-only queries are the same as for the editable graph
+    get_connections = DialogueGraph.get_connections
+    get_connection_counts = DialogueGraph.get_connection_counts
+    to_json = DialogueGraph.to_json
+    validate_references = DialogueGraph.validate_references
+    validate_topic_references = DialogueGraph.validate_topic_references
+    
+    def get_topic(self, topic_id: str) -> Optional[FrozenTopic]:
+        """Get a topic by ID"""
+        return self._map.get(topic_id)
+    
+    def to_graph(self) -> DialogueGraph:
+        """Get an editable copy (e.g. to restore a checkpoint)"""
+        graph = DialogueGraph()
+        for topic in self.topics.values():
+            graph.topics[topic.id] = topic.thaw()
+        graph.entry_points = list(self.entry_points)
+        return graph
+
+
+class SnapshotCache:
+    """Keeps a graph's latest snapshot and refreshes only the topics changed since it was taken"""
+    
+    def __init__(self, graph: DialogueGraph):
+        self.graph = graph
+        self.stale: set = set()  # Topics added, edited or removed since the last snapshot
+        self.reordered = False  # Topics were added, removed or moved in the graph's order
+        # Copying every topic makes millions of containers, none in cycles; collecting
+        # while they pile up would rescan the whole heap again and again
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            topics = PersistentMap({topic_id: FrozenTopic.from_topic(topic) for topic_id, topic in graph.topics.items()})
+        finally:
+            if collecting:
+                gc.enable()
+        self.last = GraphSnapshot(topics, tuple(graph.topics), tuple(graph.entry_points))
+    
+    def snapshot(self) -> GraphSnapshot:
+        """Get a snapshot of the graph as it is now (the previous one if nothing changed)"""
+        graph = self.graph
+        last = self.last
+        entry_points = tuple(graph.entry_points)
+        if not self.stale and not self.reordered and entry_points == last.entry_points:
+            return last
+        topics = last._map
+        reordered = self.reordered
+        for topic_id in self.stale:
+            topic = graph.topics.get(topic_id)
+            if topic is not None:
+                reordered = reordered or topic_id not in topics
+                topics = topics.set(topic_id, FrozenTopic.from_topic(topic))
+            elif topic_id in topics:
+                reordered = True
+                topics = topics.delete(topic_id)
+        order = tuple(graph.topics) if reordered else last.order
+        self.stale = set()
+        self.reordered = False
+        self.last = GraphSnapshot(topics, order, entry_points)
+        return self.last
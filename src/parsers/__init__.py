@@ -1,9 +1,9 @@
 """Parsers for dialogue file import/export"""
 
 from .json_parser import JSONParser
-from .validator import Validator
+from .validator import Validator, IncrementalValidator, Rule, register_rule
 
-__all__ = ['JSONParser', 'Validator']
+__all__ = ['JSONParser', 'Validator', 'IncrementalValidator', 'Rule', 'register_rule']
 
 
 
@@ -5,12 +5,14 @@ from typing import List, Dict, Any
 from pathlib import Path
 
 from ..models.dialogue import DialogueGraph, DialogueTopic
+from ..utils.perf import perf
 
 
 class JSONParser:
     """Handles JSON import/export"""
     
     @staticmethod
+    @perf.timed("parser.parse_file")
     def parse_file(file_path: str) -> DialogueGraph:
         """Load JSON file into DialogueGraph"""
         path = Path(file_path)
@@ -21,6 +23,11 @@ class JSONParser:
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
+        return JSONParser.parse_data(data)
+    
+    @staticmethod
+    def parse_data(data: Any) -> DialogueGraph:
+        """Build a DialogueGraph from already decoded JSON data"""
         if not isinstance(data, list):
             raise ValueError("Dialogue file must be a JSON array")
         
@@ -36,19 +43,26 @@ class JSONParser:
                 if item_type != "talk_topic":
                     topic.type = item_type
                 graph.add_topic(topic)
+            elif isinstance(item.get("chat"), str):
+                # NPC definitions name the topic their conversations start with
+                graph.entry_points.append(item["chat"])
         
         return graph
     
     @staticmethod
+    @perf.timed("parser.export_file")
     def export_file(graph: DialogueGraph, file_path: str) -> None:
         """Save DialogueGraph to JSON file"""
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        json_data = graph.to_json()
-        
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+            f.write(JSONParser.dumps(graph))
+    
+    @staticmethod
+    def dumps(graph: DialogueGraph) -> str:
+        """Get the exported JSON text of a graph"""
+        return json.dumps(graph.to_json(), indent=2, ensure_ascii=False)
     
     @staticmethod
     def validate_structure(data: Any) -> List[str]:
@@ -0,0 +1,66 @@
+"""Validation of large graphs sharded across a process pool"""
+
+import math
+import multiprocessing
+import os
+from typing import Iterable, List, Optional, Tuple
+
+from ..models.dialogue import DialogueGraph
+from .validator import RULES, Rule, Validator
+
+
+SHARDS_PER_WORKER = 4  # Smaller shards even out topics with many responses
+MIN_TOPICS = 20000  # Below this forking the pool costs more than it saves
+
+# Set in the parent just before the pool forks, so every worker inherits the
+# graph read-only. Serializing topics for spawned workers costs several times
+# more than validating them, so without fork validation stays sequential.
+_shared: Optional[Tuple[DialogueGraph, List[str], List[Rule]]] = None
+
+
+def can_fork() -> bool:
+    """Check if worker processes can inherit the graph from this one"""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _validate_shard(start: int, stop: int) -> List[List[str]]:
+    """Run every rule over a slice of the topics, returning diagnostics per rule"""
+    graph, topic_ids, rules = _shared
+    shard = topic_ids[start:stop]
+    return [[error for topic_id in shard for error in rule.check(graph, topic_id)] for rule in rules]
+
+
+def validate_parallel(
+    graph: DialogueGraph,
+    workers: Optional[int] = None,
+    rules: Optional[Iterable[Rule]] = None,
+    min_topics: int = MIN_TOPICS
+) -> List[str]:
+    """Validate a graph in worker processes; the result equals Validator.validate_graph"""
+    # Forks the current process, so call it from headless tools rather than the Tk editor
+    global _shared
+    rules = list(RULES if rules is None else rules)
+    workers = workers or os.cpu_count() or 1
+    topic_ids = list(graph.topics)
+    if workers <= 1 or len(topic_ids) < min_topics or not can_fork():
+        return Validator.validate_graph(graph, rules)
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    shard_size = math.ceil(len(topic_ids) / (workers * SHARDS_PER_WORKER))
+    starts = list(range(0, len(topic_ids), shard_size))
+    stops = [min(start + shard_size, len(topic_ids)) for start in starts]
+    _shared = (graph, topic_ids, rules)
+    try:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # map() keeps shard order, so merging rule by rule reproduces the sequential order
+            results = list(pool.map(_validate_shard, starts, stops))
+    finally:
+        _shared = None
+    
+    errors = []
+    for rule_index in range(len(rules)):
+        for shard_errors in results:
+            errors.extend(shard_errors[rule_index])
+    return errors
@@ -1,27 +1,99 @@
 """Validation logic for dialogue files"""
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
+from weakref import WeakKeyDictionary
+
 from ..models.dialogue import DialogueGraph
 
 
+class Rule:
+    """A validation check that runs on one topic at a time"""
+    
+    name = "rule"
+    
+    def check(self, graph: DialogueGraph, topic_id: str) -> List[str]:
+        """Get the diagnostics for one topic"""
+        raise NotImplementedError
+    
+    def dependents(self, graph: DialogueGraph, topic_id: str) -> Set[str]:
+        """Get the topics whose diagnostics may change when this topic is added, edited or removed"""
+        return {topic_id}
+
+
+class DuplicateIdRule(Rule):
+    """Topics must have unique IDs"""
+    
+    name = "duplicate-id"
+    
+    def __init__(self):
+        # Per graph: id -> keys of the checked topics whose id was changed in place to it
+        self._misnamed: "WeakKeyDictionary[DialogueGraph, Dict[str, Set[str]]]" = WeakKeyDictionary()
+    
+    def check(self, graph: DialogueGraph, topic_id: str) -> List[str]:
+        # Topics are keyed by ID, so a duplicate can only be a topic whose id
+        # was changed in place to one that is already taken
+        topic = graph.topics[topic_id]
+        if topic.id != topic_id:
+            self._misnamed.setdefault(graph, {}).setdefault(topic.id, set()).add(topic_id)
+            if topic.id in graph.topics:
+                return [f"Duplicate topic ID: {topic.id}"]
+        return []
+    
+    def dependents(self, graph: DialogueGraph, topic_id: str) -> Set[str]:
+        # Adding, removing or renaming the topic under an ID makes the topics
+        # whose id was changed to it duplicates, or no longer duplicates
+        misnamed = self._misnamed.get(graph, {})
+        keys = misnamed.get(topic_id)
+        if not keys:
+            return {topic_id}
+        # Drop topics that were removed or renamed again since they were checked
+        keys -= {key for key in keys if getattr(graph.topics.get(key), "id", None) != topic_id}
+        if not keys:
+            del misnamed[topic_id]
+        return {topic_id} | keys
+
+
+class ReferenceRule(Rule):
+    """Responses must lead to existing or special topics"""
+    
+    name = "references"
+    
+    def check(self, graph: DialogueGraph, topic_id: str) -> List[str]:
+        return graph.validate_topic_references(topic_id)
+    
+    def dependents(self, graph: DialogueGraph, topic_id: str) -> Set[str]:
+        # Adding or removing a topic fixes or breaks the references to it
+        return {topic_id} | graph.get_predecessors(topic_id)
+
+
+class TopicRule(Rule):
+    """Checks a topic makes about itself"""
+    
+    name = "topic"
+    
+    def check(self, graph: DialogueGraph, topic_id: str) -> List[str]:
+        return graph.topics[topic_id].validate()
+
+
+# Rules in the order their diagnostics are reported
+RULES: List[Rule] = [DuplicateIdRule(), ReferenceRule(), TopicRule()]
+
+
+def register_rule(rule: Rule) -> None:
+    """Add a rule to the default rule set"""
+    RULES.append(rule)
+
+
 class Validator:
     """Validation logic for dialogue graphs"""
     
     @staticmethod
-    def validate_graph(graph: DialogueGraph) -> List[str]:
+    def validate_graph(graph: DialogueGraph, rules: Optional[Iterable[Rule]] = None) -> List[str]:
         """Run all validation checks on graph"""
         errors = []
-        
-        # Validate IDs
-        errors.extend(graph.validate_ids())
-        
-        # Validate references
-        errors.extend(graph.validate_references())
-        
-        # Validate individual topics
-        for topic in graph.topics.values():
-            errors.extend(topic.validate())
-        
+        for rule in (RULES if rules is None else rules):
+            for topic_id in graph.topics:
+                errors.extend(rule.check(graph, topic_id))
         return errors
     
     @staticmethod
@@ -35,5 +107,93 @@ class Validator:
         return graph.validate_ids()
 
 
-
-
+class IncrementalValidator:
+    """Keeps diagnostics per topic and re-checks only the topics an edit can affect"""
+    
+    def __init__(self, graph: DialogueGraph, rules: Optional[Iterable[Rule]] = None):
+        self.graph = graph
+        self.rules = list(RULES if rules is None else rules)
+        # Per rule: topic ID -> diagnostics, holding only topics that have any
+        self.diagnostics: List[Dict[str, List[str]]] = [{} for _ in self.rules]
+        # Per rule: its diagnostics in report order, or None after they changed
+        self._rule_errors: List[Optional[List[str]]] = [None for _ in self.rules]
+        # Topic order in the graph, so results match a full validate_graph run
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._dirty: Optional[Set[str]] = None  # None until the first full run
+        graph.add_change_listener(self.on_topic_changed)
+    
+    def close(self) -> None:
+        """Stop following edits to the graph"""
+        self.graph.remove_change_listener(self.on_topic_changed)
+    
+    def on_topic_changed(self, topic_id: str) -> None:
+        """Mark the topics affected by an edit for re-checking"""
+        if topic_id not in self.graph.topics:
+            # A topic added again later goes to the end, as it does in graph.topics
+            self._order.pop(topic_id, None)
+        if self._dirty is None:
+            return
+        for rule in self.rules:
+            self._dirty |= rule.dependents(self.graph, topic_id)
+    
+    def invalidate(self) -> None:
+        """Force a full run on the next validate"""
+        self._dirty = None
+    
+    def validate(self) -> List[str]:
+        """Get all diagnostics, re-checking only topics changed since the last call"""
+        if self._dirty is None:
+            self.diagnostics = [{} for _ in self.rules]
+            self._rule_errors = [None for _ in self.rules]
+            self._order = {}
+            self._next_order = 0
+            for topic_id in self.graph.topics:
+                self._check_topic(topic_id)
+        else:
+            for topic_id in self._dirty:
+                self._check_topic(topic_id)
+        self._dirty = set()
+        return self.errors()
+    
+    def _check_topic(self, topic_id: str) -> None:
+        """Run every rule on one topic, dropping its diagnostics if it was removed"""
+        if topic_id not in self.graph.topics:
+            self._order.pop(topic_id, None)
+            for index, found in enumerate(self.diagnostics):
+                if found.pop(topic_id, None) is not None:
+                    self._rule_errors[index] = None
+            return
+        if topic_id not in self._order:
+            self._order[topic_id] = self._next_order
+            self._next_order += 1
+        for index, (rule, found) in enumerate(zip(self.rules, self.diagnostics)):
+            messages = rule.check(self.graph, topic_id)
+            if messages == found.get(topic_id, []):
+                continue
+            if messages:
+                found[topic_id] = messages
+            else:
+                del found[topic_id]
+            self._rule_errors[index] = None
+    
+    def errors(self) -> List[str]:
+        """Get the cached diagnostics in the order of a full validation run"""
+        errors = []
+        for index, found in enumerate(self.diagnostics):
+            # Only rules whose diagnostics changed since the last call are re-sorted
+            rule_errors = self._rule_errors[index]
+            if rule_errors is None:
+                rule_errors = []
+                for topic_id in sorted(found, key=self._order.__getitem__):
+                    rule_errors.extend(found[topic_id])
+                self._rule_errors[index] = rule_errors
+            errors.extend(rule_errors)
+        return errors
+    
+    def topic_errors(self, topic_id: str) -> List[str]:
+        """Get the cached diagnostics of one topic"""
+        errors = []
+        for found in self.diagnostics:
+            errors.extend(found.get(topic_id, ()))
+        return errors
@@ -0,0 +1,11 @@
+"""Renderer-independent scene description and image writers"""
+
+from .scene import Scene, SceneNode, SceneEdge, SceneLabel, build_scene
+from .svg_writer import SVGWriter
+from .png_writer import PNGWriter
+
+__all__ = ['Scene', 'SceneNode', 'SceneEdge', 'SceneLabel', 'build_scene', 'SVGWriter', 'PNGWriter']
+
+
+
+
@@ -0,0 +1,118 @@
+"""Pure-Python PNG output for scene descriptions"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Tuple
+
+from .scene import Scene
+
+
+def _parse_color(color: str) -> Tuple[int, int, int]:
+    """Convert '#rrggbb' into an RGB tuple"""
+    color = color.lstrip('#')
+    return (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+
+
+class PNGWriter:
+    """Rasterizes a Scene's boxes and lines into a PNG without needing Tk"""
+    
+    # Text needs a font rasterizer, so labels are left out of PNG output;
+    # use SVG (or the canvas PostScript export) when labels matter.
+    
+    BACKGROUND = '#f5f5f5'
+    NODE_FILL = '#E8E8E8'
+    NODE_OUTLINE = '#888888'
+    SELECTED_FILL = '#4A90E2'
+    SELECTED_OUTLINE = '#2E5C8A'
+    EDGE_COLOR = '#333333'
+    BUNDLE_COLOR = '#999999'
+    MAX_SIZE = 4096  # Largest image side in pixels (the RGB buffer is up to 48 MB)
+    
+    @classmethod
+    def write(cls, scene: Scene, file_path: str, scale: float = 1.0) -> None:
+        """Rasterize the scene and write it as a PNG file"""
+        min_x, min_y, max_x, max_y = scene.bounds()
+        # Shrink huge graphs so the image stays within MAX_SIZE on each side
+        scale = min(scale, cls.MAX_SIZE / max(1.0, max_x - min_x), cls.MAX_SIZE / max(1.0, max_y - min_y))
+        width = max(1, int((max_x - min_x) * scale))
+        height = max(1, int((max_y - min_y) * scale))
+        
+        pixels = bytearray(_parse_color(cls.BACKGROUND) * (width * height))
+        
+        def to_pixel(x: float, y: float) -> Tuple[int, int]:
+            return (int((x - min_x) * scale), int((y - min_y) * scale))
+        
+        for edge in scene.edges:
+            color = _parse_color(cls.BUNDLE_COLOR if edge.smooth else cls.EDGE_COLOR)
+            points = [to_pixel(x, y) for x, y in edge.points]
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                cls._draw_line(pixels, width, height, x1, y1, x2, y2, color)
+        
+        for node in scene.nodes:
+            x1, y1 = to_pixel(node.x - node.width / 2, node.y - node.height / 2)
+            x2, y2 = to_pixel(node.x + node.width / 2, node.y + node.height / 2)
+            fill = _parse_color(cls.SELECTED_FILL if node.selected else cls.NODE_FILL)
+            outline = _parse_color(cls.SELECTED_OUTLINE if node.selected else cls.NODE_OUTLINE)
+            cls._fill_rect(pixels, width, height, x1, y1, x2, y2, fill)
+            for ax, ay, bx, by in ((x1, y1, x2, y1), (x1, y2, x2, y2), (x1, y1, x1, y2), (x2, y1, x2, y2)):
+                cls._draw_line(pixels, width, height, ax, ay, bx, by, outline)
+        
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(cls.encode(pixels, width, height))
+    
+    @staticmethod
+    def encode(pixels: bytearray, width: int, height: int) -> bytes:
+        """Encode raw RGB rows as a PNG byte string"""
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+        
+        row_size = width * 3
+        # Filter type 0 (none) prefixed to every scanline
+        raw = b"".join(b"\x00" + bytes(pixels[row * row_size:(row + 1) * row_size]) for row in range(height))
+        header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 6))
+            + chunk(b"IEND", b"")
+        )
+    
+    @staticmethod
+    def _fill_rect(pixels: bytearray, width: int, height: int, x1: int, y1: int, x2: int, y2: int, color: Tuple[int, int, int]) -> None:
+        """Fill an axis-aligned rectangle, clipped to the image"""
+        x1, x2 = max(0, min(x1, x2)), min(width - 1, max(x1, x2))
+        y1, y2 = max(0, min(y1, y2)), min(height - 1, max(y1, y2))
+        if x1 > x2 or y1 > y2:
+            return
+        span = bytes(color) * (x2 - x1 + 1)
+        for y in range(y1, y2 + 1):
+            start = (y * width + x1) * 3
+            pixels[start:start + len(span)] = span
+    
+    @staticmethod
+    def _draw_line(pixels: bytearray, width: int, height: int, x1: int, y1: int, x2: int, y2: int, color: Tuple[int, int, int]) -> None:
+        """Draw a one-pixel line with Bresenham's algorithm, clipped to the image"""
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        r, g, b = color
+        while True:
+            if 0 <= x1 < width and 0 <= y1 < height:
+                i = (y1 * width + x1) * 3
+                pixels[i] = r
+                pixels[i + 1] = g
+                pixels[i + 2] = b
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
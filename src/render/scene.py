@@ -0,0 +1,151 @@
+"""Scene description of a dialogue graph, independent of any renderer"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from ..graph.edge_bundling import EdgeBundler
+from ..utils.helpers import get_preview_text
+from ..utils.text_metrics import TextMetrics
+
+
+Point = Tuple[float, float]
+
+
+@dataclass
+class SceneNode:
+    """A topic drawn as a box, in world coordinates (center and size)"""
+    id: str
+    x: float
+    y: float
+    width: float
+    height: float
+    selected: bool = False
+
+
+@dataclass
+class SceneEdge:
+    """A connection drawn as a polyline ending in an arrow"""
+    source: str
+    target: str
+    points: List[Point]
+    count: int = 1
+    smooth: bool = False
+    arrow: bool = True
+
+
+@dataclass
+class SceneLabel:
+    """A piece of text anchored at its center"""
+    x: float
+    y: float
+    text: str
+    size: int = 8
+    color: str = "#333333"
+    bold: bool = False
+
+
+@dataclass
+class Scene:
+    """Everything needed to draw a graph view"""
+    nodes: List[SceneNode] = field(default_factory=list)
+    edges: List[SceneEdge] = field(default_factory=list)
+    labels: List[SceneLabel] = field(default_factory=list)
+    
+    def bounds(self, padding: float = 50) -> Tuple[float, float, float, float]:
+        """Get (min_x, min_y, max_x, max_y) covering all nodes"""
+        if not self.nodes:
+            return (0.0, 0.0, 2 * padding, 2 * padding)
+        return (
+            min(node.x - node.width / 2 for node in self.nodes) - padding,
+            min(node.y - node.height / 2 for node in self.nodes) - padding,
+            max(node.x + node.width / 2 for node in self.nodes) + padding,
+            max(node.y + node.height / 2 for node in self.nodes) + padding
+        )
+
+
+def _clip_to_box(center: Point, toward: Point, width: float, height: float) -> Point:
+    """Move a point from a node's center toward another point, onto the node's edge"""
+    dx = toward[0] - center[0]
+    dy = toward[1] - center[1]
+    dist = math.sqrt(dx*dx + dy*dy)
+    if dist < 1:
+        return center
+    # Same approximation as the canvas: scale half extents along the direction
+    return (center[0] + (dx / dist) * width / 2, center[1] + (dy / dist) * height / 2)
+
+
+def build_scene(
+    graph_manager,
+    labels: bool = True,
+    bundle_edges: bool = False,
+    label_padding: float = 10
+) -> Scene:
+    """Describe the current graph layout as nodes, edges and labels"""
+    graph = graph_manager.dialogue_graph
+    positions = graph_manager.node_positions
+    sizes = {topic_id: graph_manager.get_node_size(topic_id) for topic_id in positions}
+    scene = Scene()
+    
+    for topic_id, topic in graph.topics.items():
+        pos = positions.get(topic_id)
+        if pos is None:
+            continue
+        x, y = pos
+        node_width, node_height = sizes[topic_id]
+        scene.nodes.append(SceneNode(
+            id=topic_id,
+            x=x,
+            y=y,
+            width=node_width,
+            height=node_height,
+            selected=graph_manager.is_selected(topic_id)
+        ))
+        if not labels:
+            continue
+        text_width = node_width - 2 * label_padding
+        title = TextMetrics.truncate(("Arial", 9, "bold"), topic.id, text_width)
+        scene.labels.append(SceneLabel(x, y - 20, title, size=9, bold=True))
+        preview = get_preview_text(topic.dynamic_line)
+        if preview:
+            preview = TextMetrics.truncate(("Arial", 8), preview, text_width)
+            scene.labels.append(SceneLabel(x, y + 5, preview, color="#666666"))
+        if topic.responses:
+            scene.labels.append(SceneLabel(
+                x + node_width / 2 - 10, y - node_height / 2 + 10,
+                str(len(topic.responses)), color="#888888"
+            ))
+    
+    edges = [
+        edge for edge in EdgeBundler.collect_edges(graph)
+        if edge[0] in positions and edge[1] in positions
+    ]
+    if bundle_edges:
+        bundling = EdgeBundler.bundle(positions, edges)
+        for bundle in bundling.bundles:
+            scene.edges.append(SceneEdge(
+                source=bundle.target,
+                target=bundle.target,
+                points=EdgeBundler.fan_points(bundle, positions),
+                count=bundle.total,
+                smooth=True,
+                arrow=False
+            ))
+            end = _clip_to_box(positions[bundle.target], bundle.control, *sizes[bundle.target])
+            scene.edges.append(SceneEdge(bundle.target, bundle.target, [bundle.control, end], bundle.total))
+            if labels:
+                scene.labels.append(SceneLabel(bundle.control[0], bundle.control[1], f"×{bundle.total}", color="#555555"))
+        edges = bundling.plain_edges
+    
+    for from_id, to_id, count in edges:
+        start = _clip_to_box(positions[from_id], positions[to_id], *sizes[from_id])
+        end = _clip_to_box(positions[to_id], positions[from_id], *sizes[to_id])
+        if start == end:
+            continue
+        scene.edges.append(SceneEdge(from_id, to_id, [start, end], count))
+        if labels and count > 1:
+            scene.labels.append(SceneLabel(
+                (start[0] + end[0]) / 2, (start[1] + end[1]) / 2, f"×{count}", color="#555555"
+            ))
+    
+    return scene
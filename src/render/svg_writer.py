@@ -0,0 +1,91 @@
+"""SVG output for scene descriptions"""
+
+from pathlib import Path
+from typing import List, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from .scene import Scene
+
+
+class SVGWriter:
+    """Streams a Scene to an SVG file without needing Tk"""
+    
+    BACKGROUND = '#f5f5f5'
+    NODE_FILL = '#E8E8E8'
+    NODE_OUTLINE = '#888888'
+    SELECTED_FILL = '#4A90E2'
+    SELECTED_OUTLINE = '#2E5C8A'
+    EDGE_COLOR = '#333333'
+    BUNDLE_COLOR = '#999999'
+    
+    @classmethod
+    def write(cls, scene: Scene, file_path: str) -> None:
+        """Write the scene to an SVG file"""
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            cls.write_stream(scene, f)
+    
+    @classmethod
+    def write_stream(cls, scene: Scene, out: TextIO) -> None:
+        """Write the scene as SVG to an open text stream, one element per line"""
+        min_x, min_y, max_x, max_y = scene.bounds()
+        width = max_x - min_x
+        height = max_y - min_y
+        
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+            f'viewBox="{min_x:.1f} {min_y:.1f} {width:.1f} {height:.1f}">\n'
+        )
+        out.write(
+            '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+            f'markerHeight="8" orient="auto"><path d="M0,0 L10,5 L0,10 z" fill="{cls.EDGE_COLOR}"/></marker></defs>\n'
+        )
+        out.write(f'<rect x="{min_x:.1f}" y="{min_y:.1f}" width="{width:.1f}" height="{height:.1f}" fill="{cls.BACKGROUND}"/>\n')
+        
+        # Edges first so nodes are drawn on top
+        out.write(f'<g fill="none" stroke="{cls.EDGE_COLOR}" stroke-width="2">\n')
+        for edge in scene.edges:
+            if edge.smooth:
+                out.write(f'<path d="{cls._smooth_path(edge.points)}" stroke="{cls.BUNDLE_COLOR}" stroke-width="1"/>\n')
+            else:
+                points = " ".join(f"{x:.1f},{y:.1f}" for x, y in edge.points)
+                marker = ' marker-end="url(#arrow)"' if edge.arrow else ''
+                out.write(f'<polyline points="{points}"{marker}/>\n')
+        out.write('</g>\n')
+        
+        out.write('<g stroke-width="1">\n')
+        for node in scene.nodes:
+            fill = cls.SELECTED_FILL if node.selected else cls.NODE_FILL
+            outline = cls.SELECTED_OUTLINE if node.selected else cls.NODE_OUTLINE
+            out.write(
+                f'<rect x="{node.x - node.width / 2:.1f}" y="{node.y - node.height / 2:.1f}" '
+                f'width="{node.width:.1f}" height="{node.height:.1f}" fill="{fill}" stroke="{outline}">'
+                f'<title>{escape(node.id)}</title></rect>\n'
+            )
+        out.write('</g>\n')
+        
+        out.write('<g font-family="Arial, sans-serif" text-anchor="middle" dominant-baseline="central">\n')
+        for label in scene.labels:
+            weight = ' font-weight="bold"' if label.bold else ''
+            out.write(
+                f'<text x="{label.x:.1f}" y="{label.y:.1f}" font-size="{label.size + 3}" '
+                f'fill={quoteattr(label.color)}{weight}>{escape(label.text)}</text>\n'
+            )
+        out.write('</g>\n')
+        out.write('</svg>\n')
+    
+    @staticmethod
+    def _smooth_path(points: List[Tuple[float, float]]) -> str:
+        """Quadratic B-spline through midpoints, matching Tk's smooth lines"""
+        if len(points) < 3:
+            return "M" + " L".join(f"{x:.1f},{y:.1f}" for x, y in points)
+        commands = [f"M{points[0][0]:.1f},{points[0][1]:.1f}"]
+        for i in range(1, len(points) - 1):
+            cx, cy = points[i]
+            nx, ny = points[i + 1]
+            end_x = nx if i == len(points) - 2 else (cx + nx) / 2
+            end_y = ny if i == len(points) - 2 else (cy + ny) / 2
+            commands.append(f"Q{cx:.1f},{cy:.1f} {end_x:.1f},{end_y:.1f}")
+        return " ".join(commands)
@@ -0,0 +1,9 @@
+"""Dialogue play-through against a mock game state"""
+
+from .conditions import ConditionCompiler
+from .effects import EffectCompiler
+from .engine import DialogueSimulator, Step
+from .explorer import CoverageReport, StateExplorer
+from .state import GameState, var_key
+
+__all__ = ['ConditionCompiler', 'EffectCompiler', 'DialogueSimulator', 'Step', 'StateExplorer', 'CoverageReport', 'GameState', 'var_key']
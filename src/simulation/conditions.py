@@ -0,0 +1,189 @@
+"""Compile dialogue conditions into closures over a GameState"""
+
+import json
+from typing import Any, Callable, Dict, Set
+
+from .state import GameState, var_key
+
+
+Condition = Callable[[GameState], bool]
+
+# Keys that qualify a condition next to it rather than being conditions themselves
+SIBLING_KEYS = {"type", "context", "value", "yes", "no", "duration", "adjustment"}
+
+
+def _always(state: GameState) -> bool:
+    """Condition of responses and lines without one"""
+    return True
+
+
+def _never(state: GameState) -> bool:
+    """Condition that never holds"""
+    return False
+
+
+def _unknown(state: GameState) -> bool:
+    """Stand-in for conditions the simulator does not model"""
+    return state.unknown_conditions
+
+
+def _flag(check: Condition, expected: Any) -> Condition:
+    """Compare a yes/no check with the value a condition expects"""
+    if expected is False:
+        return lambda state: not check(state)
+    return check
+
+
+# Yes/no conditions, usable as plain strings or as {"name": true}
+FLAG_CONDITIONS: Dict[str, Condition] = {
+    "u_male": lambda state: state.u_male,
+    "u_female": lambda state: not state.u_male,
+    "npc_male": lambda state: state.npc_male,
+    "npc_female": lambda state: not state.npc_male,
+    "is_day": lambda state: state.is_day,
+    "is_outside": lambda state: state.is_outside,
+    "has_assigned_mission": lambda state: len(state.npc_assigned_missions) == 1,
+    "has_many_assigned_missions": lambda state: len(state.npc_assigned_missions) > 1,
+    "has_no_assigned_mission": lambda state: not state.npc_assigned_missions,
+    "has_available_mission": lambda state: len(state.npc_available_missions) == 1,
+    "has_many_available_missions": lambda state: len(state.npc_available_missions) > 1,
+    "has_no_available_mission": lambda state: not state.npc_available_missions,
+}
+
+
+def var_reference(condition: Dict[str, Any], key: str):
+    """Get the (var_key, value) a *_has_var or *_add_var entry refers to; value is None if unset"""
+    # Either the game's form with type/context/value as siblings of the name,
+    # or the form with them nested in a dict under the key
+    spec = condition[key]
+    if isinstance(spec, dict):
+        name = spec.get("var", spec.get("name", ""))
+    else:
+        name, spec = spec, condition
+    value = spec.get("value")
+    return var_key(name, spec.get("type"), spec.get("context")), (None if value is None else str(value))
+
+
+class ConditionCompiler:
+    """Turns condition JSON into closures, compiling each distinct condition once"""
+    
+    def __init__(self):
+        # Canonical JSON text -> closure, so identical conditions share one closure
+        self._cache: Dict[str, Condition] = {}
+        # Condition names that were compiled to state.unknown_conditions
+        self.unsupported: Set[str] = set()
+    
+    def compile(self, condition: Any) -> Condition:
+        """Get the closure for a condition; None means always true"""
+        if condition is None:
+            return _always
+        try:
+            key = json.dumps(condition, sort_keys=True)
+        except (TypeError, ValueError):
+            return self._compile(condition)
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = self._cache[key] = self._compile(condition)
+        return compiled
+    
+    def clear(self) -> None:
+        """Drop all compiled conditions"""
+        self._cache.clear()
+        self.unsupported.clear()
+    
+    def _compile(self, condition: Any) -> Condition:
+        """Compile one condition without consulting the cache"""
+        if isinstance(condition, bool):
+            return _always if condition else _never
+        if isinstance(condition, str):
+            check = FLAG_CONDITIONS.get(condition)
+            if check is None:
+                self.unsupported.add(condition)
+                return _unknown
+            return check
+        if isinstance(condition, list):
+            return self._all([self._compile(item) for item in condition])
+        if not isinstance(condition, dict):
+            return _unknown
+        
+        # Every condition key in one object must hold
+        checks = [self._compile_key(condition, key) for key in condition if key not in SIBLING_KEYS]
+        if not checks:
+            return _always
+        return self._all(checks)
+    
+    def _compile_key(self, condition: Dict[str, Any], key: str) -> Condition:
+        """Compile the condition named by one key of a condition object"""
+        value = condition[key]
+        if key == "and":
+            return self._all([self._compile(item) for item in (value if isinstance(value, list) else [value])])
+        if key == "or":
+            return self._any([self._compile(item) for item in (value if isinstance(value, list) else [value])])
+        if key == "not":
+            check = self._compile(value)
+            return lambda state: not check(state)
+        if key in FLAG_CONDITIONS:
+            return _flag(FLAG_CONDITIONS[key], value)
+        if key in ("u_has_var", "npc_has_var"):
+            name, expected = var_reference(condition, key)
+            if key == "u_has_var":
+                if expected is None:
+                    return lambda state: name in state.u_vars
+                return lambda state: state.u_vars.get(name) == expected
+            if expected is None:
+                return lambda state: name in state.npc_vars
+            return lambda state: state.npc_vars.get(name) == expected
+        if key == "u_has_effect":
+            return lambda state: value in state.u_effects
+        if key == "npc_has_effect":
+            return lambda state: value in state.npc_effects
+        if key == "u_has_mission":
+            return lambda state: value in state.u_missions
+        if key == "days_since_cataclysm":
+            try:
+                days = int(value)
+            except (TypeError, ValueError):
+                days = 0
+            return lambda state: state.days_since_cataclysm >= days
+        if key == "is_season":
+            season = str(value).lower()
+            return lambda state: state.season == season
+        self.unsupported.add(key)
+        return _unknown
+    
+    @staticmethod
+    def _all(checks) -> Condition:
+        """Combine checks so all must hold, short-circuiting"""
+        if len(checks) == 1:
+            return checks[0]
+        if len(checks) == 2:
+            first, second = checks
+            return lambda state: first(state) and second(state)
+        checks = tuple(checks)
+        
+        def check_all(state: GameState) -> bool:
+            for check in checks:
+                if not check(state):
+                    return False
+            return True
+        return check_all
+    
+    @staticmethod
+    def _any(checks) -> Condition:
+        """Combine checks so one must hold, short-circuiting"""
+        if not checks:
+            return _never
+        if len(checks) == 1:
+            return checks[0]
+        if len(checks) == 2:
+            first, second = checks
+            return lambda state: first(state) or second(state)
+        checks = tuple(checks)
+        
+        def check_any(state: GameState) -> bool:
+            for check in checks:
+                if check(state):
+                    return True
+            return False
+        return check_any
+
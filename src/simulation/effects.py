@@ -0,0 +1,198 @@
+"""Compile response effects and speaker effects into closures that change a GameState"""
+
+from typing import Any, Callable, Dict, List, Set
+
+from .conditions import SIBLING_KEYS, ConditionCompiler, var_reference
+from .state import GameState, var_key
+
+
+# Returns True when the effect ends the conversation
+Effect = Callable[[GameState], bool]
+
+# Effects that end the conversation once the response is chosen
+ENDING_EFFECTS = {"end_conversation", "hostile", "flee", "leave", "insult_combat", "stop_talking"}
+
+
+def _no_effect(state: GameState) -> bool:
+    """Effect of responses and topics without one"""
+    return False
+
+
+def _end(state: GameState) -> bool:
+    """Effect that only ends the conversation"""
+    return True
+
+
+def _assign_mission(state: GameState) -> bool:
+    """Give the player the first mission the NPC has available"""
+    if state.npc_available_missions:
+        mission = state.npc_available_missions.pop(0)
+        state.npc_assigned_missions.append(mission)
+        state.u_missions.add(mission)
+    return False
+
+
+def _close_mission(state: GameState) -> bool:
+    """Finish the mission the NPC handed out first, whatever the outcome"""
+    if state.npc_assigned_missions:
+        state.u_missions.discard(state.npc_assigned_missions.pop(0))
+    return False
+
+
+STRING_EFFECTS: Dict[str, Effect] = {
+    "assign_mission": _assign_mission,
+    "mission_success": _close_mission,
+    "mission_failure": _close_mission,
+    "clear_mission": _close_mission,
+}
+
+
+def _effect_id(effect: Dict[str, Any], key: str):
+    """Get the effect ID and duration of an *_add_effect entry"""
+    spec = effect[key]
+    if isinstance(spec, dict):
+        return spec.get("id", spec.get("effect_id", "")), spec.get("duration", effect.get("duration"))
+    return spec, effect.get("duration")
+
+
+class EffectCompiler:
+    """Turns effect and speaker_effect JSON into closures over a GameState"""
+    
+    def __init__(self, conditions: ConditionCompiler):
+        self.conditions = conditions
+        # Effect names the simulator ignores
+        self.unsupported: Set[str] = set()
+    
+    def compile(self, effect: Any) -> Effect:
+        """Get the closure for a response effect (a name, an object or a list of them)"""
+        if not effect:
+            return _no_effect
+        if isinstance(effect, str):
+            if effect in ENDING_EFFECTS:
+                return _end
+            compiled = STRING_EFFECTS.get(effect)
+            if compiled is None:
+                self.unsupported.add(effect)
+                return _no_effect
+            return compiled
+        if isinstance(effect, list):
+            return self._sequence([self.compile(item) for item in effect])
+        if not isinstance(effect, dict):
+            return _no_effect
+        return self._sequence([self._compile_key(effect, key) for key in effect if key not in SIBLING_KEYS])
+    
+    def compile_speaker_effect(self, speaker_effect: Any, topic_id: str) -> Effect:
+        """Get the closure for a topic's speaker_effect, applied each time the topic is shown"""
+        if not speaker_effect:
+            return _no_effect
+        entries = speaker_effect if isinstance(speaker_effect, list) else [speaker_effect]
+        compiled = []
+        for entry in entries:
+            if not isinstance(entry, dict) or "effect" not in entry:
+                # A bare effect without the condition/sentinel wrapper
+                compiled.append(self.compile(entry))
+                continue
+            condition = self.conditions.compile(entry.get("condition"))
+            effect = self.compile(entry["effect"])
+            sentinel = entry.get("sentinel")
+            compiled.append(self._guarded(condition, effect, var_key(f"{topic_id}_{sentinel}", "sentinel") if sentinel else None))
+        return self._sequence(compiled)
+    
+    @staticmethod
+    def _guarded(condition, effect: Effect, sentinel) -> Effect:
+        """Apply an effect only when its condition holds, and only once per sentinel"""
+        if sentinel is None:
+            return lambda state: effect(state) if condition(state) else False
+        
+        def apply(state: GameState) -> bool:
+            if sentinel in state.npc_vars or not condition(state):
+                return False
+            state.npc_vars[sentinel] = "yes"
+            return effect(state)
+        return apply
+    
+    def _compile_key(self, effect: Dict[str, Any], key: str) -> Effect:
+        """Compile the effect named by one key of an effect object"""
+        value = effect[key]
+        if key in ("u_add_var", "npc_add_var"):
+            name, new_value = var_reference(effect, key)
+            new_value = "" if new_value is None else new_value
+            attr = key.split("_", 1)[0] + "_vars"
+            
+            def add_var(state: GameState) -> bool:
+                getattr(state, attr)[name] = new_value
+                return False
+            return add_var
+        if key in ("u_lose_var", "npc_lose_var"):
+            name, _ = var_reference(effect, key)
+            attr = key.split("_", 1)[0] + "_vars"
+            
+            def lose_var(state: GameState) -> bool:
+                getattr(state, attr).pop(name, None)
+                return False
+            return lose_var
+        if key in ("u_adjust_var", "npc_adjust_var"):
+            name, _ = var_reference(effect, key)
+            attr = key.split("_", 1)[0] + "_vars"
+            try:
+                adjustment = int(effect.get("adjustment", 1))
+            except (TypeError, ValueError):
+                adjustment = 1
+            
+            def adjust_var(state: GameState) -> bool:
+                variables = getattr(state, attr)
+                try:
+                    current = int(variables.get(name, 0))
+                except ValueError:
+                    current = 0
+                variables[name] = str(current + adjustment)
+                return False
+            return adjust_var
+        if key in ("u_add_effect", "npc_add_effect"):
+            effect_id, duration = _effect_id(effect, key)
+            attr = key.split("_", 1)[0] + "_effects"
+            
+            def add_effect(state: GameState) -> bool:
+                getattr(state, attr)[effect_id] = duration
+                return False
+            return add_effect
+        if key in ("u_lose_effect", "npc_lose_effect"):
+            attr = key.split("_", 1)[0] + "_effects"
+            
+            def lose_effect(state: GameState) -> bool:
+                getattr(state, attr).pop(value, None)
+                return False
+            return lose_effect
+        if key == "add_mission":
+            def add_mission(state: GameState) -> bool:
+                state.npc_available_missions.append(value)
+                return False
+            return add_mission
+        if key == "assign_mission":
+            def assign_mission(state: GameState) -> bool:
+                state.npc_assigned_missions.append(value)
+                state.u_missions.add(value)
+                return False
+            return assign_mission
+        if key == "effect":
+            return self.compile(value)
+        self.unsupported.add(key)
+        return _no_effect
+    
+    @staticmethod
+    def _sequence(effects: List[Effect]) -> Effect:
+        """Apply effects in order, ending the conversation if any of them does"""
+        effects = [effect for effect in effects if effect is not _no_effect]
+        if not effects:
+            return _no_effect
+        if len(effects) == 1:
+            return effects[0]
+        effects = tuple(effects)
+        
+        def apply_all(state: GameState) -> bool:
+            ended = False
+            for effect in effects:
+                if effect(state):
+                    ended = True
+            return ended
+        return apply_all
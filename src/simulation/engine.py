@@ -0,0 +1,240 @@
+"""Play through conversations the way the game runs them"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.dialogue import GENDER_LINE_KEYS, DialogueGraph, SPECIAL_TOPICS
+from .conditions import Condition, ConditionCompiler
+from .effects import Effect, EffectCompiler
+from .state import GameState
+
+
+# Picks a line from a dynamic_line given the state and a random source
+LinePicker = Callable[[GameState, random.Random], str]
+
+# Trial types that never fail
+AUTOMATIC_TRIALS = {"", "NONE"}
+
+
+@dataclass
+class Outcome:
+    """Where one branch of a response leads and what it does on the way"""
+    topic: Optional[str]
+    effect: Effect
+
+
+@dataclass
+class CompiledResponse:
+    """A response with its condition, trial and branches compiled"""
+    index: int  # Position in the topic's responses list
+    text: str
+    response: Dict[str, Any]
+    condition: Condition
+    trial_type: str
+    trial_condition: Optional[Condition]
+    success: Outcome
+    failure: Optional[Outcome]
+
+
+@dataclass
+class CompiledTopic:
+    """A topic ready to be shown: line picker, speaker effect and responses"""
+    topic_id: str
+    line: LinePicker
+    speaker_effect: Effect
+    responses: List[CompiledResponse]
+
+
+@dataclass
+class Step:
+    """What the player sees after entering a topic or ending the conversation"""
+    topic_id: Optional[str]
+    line: str = ""
+    responses: List[CompiledResponse] = field(default_factory=list)
+    ended: bool = False
+    message: str = ""  # Trial outcome or why the conversation ended
+
+
+class DialogueSimulator:
+    """Walks a dialogue graph against a mock game state, compiling each topic once"""
+    
+    def __init__(self, dialogue_graph: DialogueGraph, state: Optional[GameState] = None, seed: Optional[int] = None):
+        self.dialogue_graph = dialogue_graph
+        self.initial_state = state if state is not None else GameState()
+        self.state = self.initial_state.copy()
+        self.rng = random.Random(seed)
+        self.conditions = ConditionCompiler()
+        self.effects = EffectCompiler(self.conditions)
+        # Compiled on first visit and dropped when the topic is edited
+        self._compiled: Dict[str, CompiledTopic] = {}
+        # Topics entered so far; TALK_NONE returns to the one before the current
+        self.stack: List[str] = []
+        self.current: Optional[Step] = None
+        self.steps = 0
+        dialogue_graph.add_change_listener(self.on_topic_changed)
+    
+    def close(self) -> None:
+        """Stop following edits to the graph"""
+        self.dialogue_graph.remove_change_listener(self.on_topic_changed)
+    
+    def on_topic_changed(self, topic_id: str) -> None:
+        """Recompile an edited topic on its next visit"""
+        self._compiled.pop(topic_id, None)
+    
+    def compiled_topic(self, topic_id: str) -> CompiledTopic:
+        """Get a topic's compiled form, compiling it on first use"""
+        compiled = self._compiled.get(topic_id)
+        if compiled is None:
+            topic = self.dialogue_graph.topics[topic_id]
+            compiled = self._compiled[topic_id] = CompiledTopic(
+                topic_id,
+                self.compile_line(topic.dynamic_line),
+                self.effects.compile_speaker_effect(topic.speaker_effect, topic_id),
+                [self._compile_response(index, response) for index, response in enumerate(topic.responses)]
+            )
+        return compiled
+    
+    def _compile_response(self, index: int, response: Dict[str, Any]) -> CompiledResponse:
+        """Compile one response of a topic"""
+        trial = response.get("trial")
+        if isinstance(trial, dict) and trial.get("type", "NONE") not in AUTOMATIC_TRIALS:
+            trial_type = trial["type"]
+            trial_condition = self.conditions.compile(trial.get("condition")) if trial_type == "CONDITION" else None
+            success = self._outcome(response.get("success"))
+            failure = self._outcome(response.get("failure"))
+        else:
+            trial_type, trial_condition, failure = "NONE", None, None
+            if isinstance(trial, dict):
+                success = self._outcome(response.get("success"))
+            else:
+                success = Outcome(response.get("topic"), self.effects.compile(response.get("effect")))
+        return CompiledResponse(
+            index,
+            str(response.get("text", "")),
+            response,
+            self.conditions.compile(response.get("condition")),
+            trial_type,
+            trial_condition,
+            success,
+            failure
+        )
+    
+    def _outcome(self, branch: Any) -> Outcome:
+        """Compile the success or failure branch of a trial"""
+        if not isinstance(branch, dict):
+            return Outcome(None, self.effects.compile(None))
+        return Outcome(branch.get("topic"), self.effects.compile(branch.get("effect")))
+    
+    def compile_line(self, line: Any) -> LinePicker:
+        """Compile a dynamic_line (text, random list, conditional or gendered object)"""
+        if line is None:
+            return lambda state, rng: ""
+        if isinstance(line, str):
+            return lambda state, rng: line
+        if isinstance(line, list):
+            choices = [self.compile_line(item) for item in line]
+            if not choices:
+                return lambda state, rng: ""
+            return lambda state, rng: rng.choice(choices)(state, rng)
+        if not isinstance(line, dict):
+            text = str(line)
+            return lambda state, rng: text
+        if "concatenate" in line:
+            parts = [self.compile_line(item) for item in line["concatenate"]]
+            return lambda state, rng: "".join(part(state, rng) for part in parts)
+        if "yes" not in line and "no" not in line:
+            gendered = [key for key in GENDER_LINE_KEYS if key in line and not isinstance(line[key], bool)]
+            if gendered:
+                # {"npc_male": "...", "npc_female": "..."} picks by gender
+                branches = [(self.conditions.compile(key), self.compile_line(line[key])) for key in gendered]
+                
+                def pick_gendered(state: GameState, rng: random.Random) -> str:
+                    for condition, pick in branches:
+                        if condition(state):
+                            return pick(state, rng)
+                    return ""
+                return pick_gendered
+        condition = self.conditions.compile(line)
+        yes = self.compile_line(line.get("yes"))
+        no = self.compile_line(line.get("no"))
+        return lambda state, rng: yes(state, rng) if condition(state) else no(state, rng)
+    
+    def start(self, topic_id: str, state: Optional[GameState] = None) -> Step:
+        """Begin a conversation at a topic with a fresh copy of the initial state"""
+        if state is not None:
+            self.initial_state = state
+        self.state = self.initial_state.copy()
+        self.stack = []
+        return self._enter(topic_id)
+    
+    def choose(self, index: int) -> Step:
+        """Pick one of the current step's available responses by position"""
+        if self.current is None or self.current.ended:
+            raise ValueError("The conversation has ended")
+        response = self.current.responses[index]
+        self.steps += 1
+        message = ""
+        outcome = response.success
+        if response.failure is not None:
+            if response.trial_condition is not None:
+                succeeded = response.trial_condition(self.state)
+            else:
+                succeeded = self.rng.random() < self.state.trial_chance(response.trial_type)
+            if not succeeded:
+                outcome = response.failure
+            message = f"{response.trial_type} trial {'succeeded' if succeeded else 'failed'}"
+        
+        if outcome.effect(self.state):
+            return self._end("An effect ended the conversation", message)
+        target = outcome.topic
+        if target == "TALK_NONE":
+            # Return to the topic before the current one
+            if len(self.stack) < 2:
+                return self._end("No earlier topic to return to", message)
+            self.stack.pop()
+            return self._enter(self.stack.pop(), message)
+        if not target or target in SPECIAL_TOPICS:
+            return self._end(f"Conversation ended ({target or 'no topic'})", message)
+        if target not in self.dialogue_graph.topics:
+            return self._end(f"Topic {target} does not exist", message)
+        return self._enter(target, message)
+    
+    def _enter(self, topic_id: str, message: str = "") -> Step:
+        """Show a topic: pick its line, apply its speaker effect and list the responses that are available"""
+        if topic_id not in self.dialogue_graph.topics:
+            return self._end(f"Topic {topic_id} does not exist", message)
+        compiled = self.compiled_topic(topic_id)
+        state = self.state
+        self.stack.append(topic_id)
+        line = compiled.line(state, self.rng)
+        if compiled.speaker_effect(state):
+            return self._end("The speaker effect ended the conversation", message, topic_id, line)
+        responses = [response for response in compiled.responses if response.condition(state)]
+        self.current = Step(topic_id, line, responses, message=message)
+        return self.current
+    
+    def _end(self, reason: str, message: str = "", topic_id: Optional[str] = None, line: str = "") -> Step:
+        """Finish the conversation"""
+        self.current = Step(topic_id, line, ended=True, message=f"{message}; {reason}" if message else reason)
+        return self.current
+    
+    def run(
+        self,
+        topic_id: str,
+        max_steps: int = 100,
+        chooser: Optional[Callable[[Step, random.Random], int]] = None
+    ) -> List[Step]:
+        """Play one conversation to its end or max_steps, picking responses at random unless a chooser is given"""
+        steps = [self.start(topic_id)]
+        for _ in range(max_steps):
+            step = steps[-1]
+            if step.ended or not step.responses:
+                break
+            index = chooser(step, self.rng) if chooser else self.rng.randrange(len(step.responses))
+            steps.append(self.choose(index))
+        return steps
+    
+    def unsupported(self) -> Tuple[List[str], List[str]]:
+        """Get the condition and effect names seen so far that the simulator does not model"""
+        return sorted(self.conditions.unsupported), sorted(self.effects.unsupported)
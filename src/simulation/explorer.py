@@ -0,0 +1,612 @@
+"""Breadth-first exploration of (topic, state) pairs to find responses and lines no play-through can reach"""
+
+import itertools
+import math
+import multiprocessing
+import os
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.dialogue import GENDER_LINE_KEYS, DialogueGraph, SPECIAL_TOPICS
+from .conditions import FLAG_CONDITIONS, SIBLING_KEYS, var_reference
+from .effects import _no_effect
+from .engine import DialogueSimulator
+from .state import GameState, var_key
+
+
+MAX_STATES = 200000  # (topic, state) pairs expanded before the search stops
+MAX_INITIAL_STATES = 256  # Starting states before they are sampled instead of enumerated
+STACK_DEPTH = 4  # Topics remembered for TALK_NONE
+SHARDS_PER_WORKER = 4
+
+SEASONS = ("spring", "summer", "autumn", "winter")
+MISSION_COUNT_CONDITIONS = {
+    "has_assigned_mission": "assigned",
+    "has_many_assigned_missions": "assigned",
+    "has_no_assigned_mission": "assigned",
+    "has_available_mission": "available",
+    "has_many_available_missions": "available",
+    "has_no_available_mission": "available",
+}
+MISSION_EFFECTS = {"assign_mission", "mission_success", "mission_failure", "clear_mission", "add_mission"}
+
+# Set in the parent just before the pool forks (see parsers/parallel.py)
+_shared: Optional[Tuple['StateExplorer', List[GameState]]] = None
+
+
+class Atoms:
+    """The variables, effects, missions and world facts conditions read or effects write"""
+    
+    def __init__(self):
+        # Talker ("u" or "npc") -> var key -> values compared against (None for a presence check)
+        self.checked_vars: Dict[str, Dict[str, Set[Optional[str]]]] = {"u": {}, "npc": {}}
+        self.written_vars: Dict[str, Set[str]] = {"u": set(), "npc": set()}
+        self.checked_effects: Dict[str, Set[str]] = {"u": set(), "npc": set()}
+        self.written_effects: Dict[str, Set[str]] = {"u": set(), "npc": set()}
+        self.sentinels: Set[str] = set()
+        self.missions: Set[str] = set()
+        self.mission_counts: Set[str] = set()
+        self.missions_written = False
+        self.genders: Set[str] = set()
+        self.days: Set[int] = set()
+        self.seasons: Set[str] = set()
+        self.flags: Set[str] = set()
+    
+    def add_condition(self, condition: Any) -> None:
+        """Record what a condition reads"""
+        if isinstance(condition, str):
+            self._add_flag(condition)
+        elif isinstance(condition, list):
+            for item in condition:
+                self.add_condition(item)
+        elif isinstance(condition, dict):
+            for key, value in condition.items():
+                if key in SIBLING_KEYS:
+                    continue
+                if key in ("and", "or"):
+                    self.add_condition(value if isinstance(value, list) else [value])
+                elif key == "not":
+                    self.add_condition(value)
+                elif key in ("u_has_var", "npc_has_var"):
+                    name, expected = var_reference(condition, key)
+                    self.checked_vars[key.split("_", 1)[0]].setdefault(name, set()).add(expected)
+                elif key in ("u_has_effect", "npc_has_effect"):
+                    self.checked_effects[key.split("_", 1)[0]].add(value)
+                elif key == "u_has_mission":
+                    self.missions.add(value)
+                elif key == "days_since_cataclysm":
+                    try:
+                        self.days.add(int(value))
+                    except (TypeError, ValueError):
+                        self.days.add(0)
+                elif key == "is_season":
+                    self.seasons.add(str(value).lower())
+                else:
+                    self._add_flag(key)
+    
+    def _add_flag(self, name: str) -> None:
+        """Record a yes/no condition"""
+        if name in MISSION_COUNT_CONDITIONS:
+            self.mission_counts.add(MISSION_COUNT_CONDITIONS[name])
+        elif name in ("u_male", "u_female"):
+            self.genders.add("u")
+        elif name in ("npc_male", "npc_female"):
+            self.genders.add("npc")
+        elif name in FLAG_CONDITIONS:
+            self.flags.add(name)
+    
+    def add_effect(self, effect: Any) -> None:
+        """Record what an effect writes"""
+        if isinstance(effect, str):
+            if effect in MISSION_EFFECTS:
+                self.missions_written = True
+        elif isinstance(effect, list):
+            for item in effect:
+                self.add_effect(item)
+        elif isinstance(effect, dict):
+            for key, value in effect.items():
+                if key in ("u_add_var", "npc_add_var", "u_lose_var", "npc_lose_var", "u_adjust_var", "npc_adjust_var"):
+                    self.written_vars[key.split("_", 1)[0]].add(var_reference(effect, key)[0])
+                elif key in ("u_add_effect", "npc_add_effect"):
+                    self.written_effects[key.split("_", 1)[0]].add(value.get("id", value.get("effect_id", "")) if isinstance(value, dict) else value)
+                elif key in ("u_lose_effect", "npc_lose_effect"):
+                    self.written_effects[key.split("_", 1)[0]].add(value)
+                elif key in MISSION_EFFECTS:
+                    self.missions_written = True
+                elif key == "effect":
+                    self.add_effect(value)
+    
+    def add_line(self, line: Any) -> None:
+        """Record what a dynamic_line's conditions read"""
+        if isinstance(line, list):
+            for item in line:
+                self.add_line(item)
+        elif isinstance(line, dict):
+            if "concatenate" in line:
+                self.add_line(line["concatenate"])
+                return
+            if "yes" not in line and "no" not in line:
+                gendered = [key for key in GENDER_LINE_KEYS if key in line and not isinstance(line[key], bool)]
+                if gendered:
+                    for key in gendered:
+                        self._add_flag(key)
+                        self.add_line(line[key])
+                    return
+            self.add_condition(line)
+            self.add_line(line.get("yes"))
+            self.add_line(line.get("no"))
+    
+    def add_topic(self, topic) -> None:
+        """Record everything one topic reads and writes"""
+        self.add_line(topic.dynamic_line)
+        speaker_effect = topic.speaker_effect
+        for entry in (speaker_effect if isinstance(speaker_effect, list) else [speaker_effect] if speaker_effect else []):
+            if isinstance(entry, dict) and "effect" in entry:
+                self.add_condition(entry.get("condition"))
+                self.add_effect(entry["effect"])
+                if entry.get("sentinel"):
+                    self.sentinels.add(var_key(f"{topic.id}_{entry['sentinel']}", "sentinel"))
+            else:
+                self.add_effect(entry)
+        for response in topic.responses:
+            self.add_condition(response.get("condition"))
+            self.add_effect(response.get("effect"))
+            trial = response.get("trial")
+            if isinstance(trial, dict):
+                self.add_condition(trial.get("condition"))
+            for branch in (response.get("success"), response.get("failure")):
+                if isinstance(branch, dict):
+                    self.add_effect(branch.get("effect"))
+
+
+@dataclass
+class Dimension:
+    """One part of the starting state that no effect in the file changes, with the values to try"""
+    name: str
+    values: List[Any]
+    apply: Callable[[GameState, Any], None]
+
+
+def line_branches(line: Any, prefix: str = "") -> List[str]:
+    """List the branch paths of a dynamic_line, e.g. "yes", "no", "1" or "concatenate/0/npc_male" """
+    paths = []
+    if isinstance(line, list):
+        for index, item in enumerate(line):
+            path = f"{prefix}{index}"
+            paths.append(path)
+            paths.extend(line_branches(item, path + "/"))
+    elif isinstance(line, dict):
+        if "concatenate" in line:
+            for index, item in enumerate(line["concatenate"]):
+                paths.extend(line_branches(item, f"{prefix}concatenate/{index}/"))
+            return paths
+        if "yes" not in line and "no" not in line:
+            gendered = [key for key in GENDER_LINE_KEYS if key in line and not isinstance(line[key], bool)]
+            if gendered:
+                for key in gendered:
+                    paths.append(prefix + key)
+                    paths.extend(line_branches(line[key], f"{prefix}{key}/"))
+                return paths
+        for key in ("yes", "no"):
+            if key in line:
+                paths.append(prefix + key)
+                paths.extend(line_branches(line[key], f"{prefix}{key}/"))
+    return paths
+
+
+@dataclass
+class CoverageReport:
+    """Topics, responses, trial outcomes and dynamic line branches no explored state reaches"""
+    topics: int
+    reached_topics: int
+    unreachable_topics: List[str] = field(default_factory=list)
+    # (topic ID, response index, response text) for responses of reached topics
+    unreachable_responses: List[Tuple[str, int, str]] = field(default_factory=list)
+    # (topic ID, response index, "success" or "failure") for available responses
+    unreachable_outcomes: List[Tuple[str, int, str]] = field(default_factory=list)
+    # (topic ID, branch path) for lines of reached topics
+    unreachable_lines: List[Tuple[str, str]] = field(default_factory=list)
+    initial_states: int = 0
+    states_visited: int = 0
+    sampled: bool = False  # Starting states were sampled rather than enumerated
+    bound_hit: bool = False  # The search stopped at max_states
+    
+    @property
+    def complete(self) -> bool:
+        """Check if every combination was explored, so the results are exact"""
+        return not self.sampled and not self.bound_hit
+    
+    def summary(self) -> str:
+        """Describe the results in one line"""
+        text = (
+            f"{self.reached_topics}/{self.topics} topics reached, "
+            f"{len(self.unreachable_responses)} unreachable responses, "
+            f"{len(self.unreachable_outcomes)} unreachable trial outcomes, "
+            f"{len(self.unreachable_lines)} unreachable line branches "
+            f"({self.states_visited} states from {self.initial_states} starting states)"
+        )
+        if not self.complete:
+            text += " - incomplete: " + ("starting states sampled" if self.sampled else "state bound reached")
+        return text
+    
+    def messages(self) -> List[str]:
+        """One line per unreachable item"""
+        messages = [f"Topic {topic_id} is never reached" for topic_id in self.unreachable_topics]
+        messages.extend(
+            f"Topic {topic_id} response {index} ({text!r}) is never available"
+            for topic_id, index, text in self.unreachable_responses
+        )
+        messages.extend(
+            f"Topic {topic_id} response {index} trial never ends in {outcome}"
+            for topic_id, index, outcome in self.unreachable_outcomes
+        )
+        messages.extend(
+            f"Topic {topic_id} dynamic line branch {path} is never shown"
+            for topic_id, path in self.unreachable_lines
+        )
+        return messages
+
+
+class StateExplorer:
+    """Explores every (topic, state) pair reachable from the entry points under any starting state"""
+    
+    # A state holds only what conditions read: the starting values of facts
+    # no effect in the file changes are enumerated as separate starting
+    # states, and variables or effects that are written but never read are
+    # dropped after each effect. Since those starting values never change,
+    # searches from different starting states never meet, which is what lets
+    # them run in separate processes.
+    
+    def __init__(
+        self,
+        dialogue_graph: DialogueGraph,
+        entry_points: Optional[Iterable[str]] = None,
+        max_states: int = MAX_STATES,
+        max_initial_states: int = MAX_INITIAL_STATES,
+        stack_depth: int = STACK_DEPTH,
+        seed: int = 0
+    ):
+        self.dialogue_graph = dialogue_graph
+        self.max_states = max_states
+        self.max_initial_states = max_initial_states
+        self.stack_depth = max(1, stack_depth)
+        self.seed = seed
+        self.simulator = DialogueSimulator(dialogue_graph)
+        self.simulator.close()  # Compiled once for this exploration; edits are not followed
+        
+        topics = dialogue_graph.topics
+        if entry_points is None:
+            entry_points = [topic_id for topic_id in dialogue_graph.entry_points if topic_id in topics]
+        self.entry_points = [topic_id for topic_id in dict.fromkeys(entry_points) if topic_id in topics]
+        if not self.entry_points:
+            # Without NPC definitions, conversations start where nothing leads
+            self.entry_points = [topic_id for topic_id in topics if not dialogue_graph.get_predecessors(topic_id)]
+        if not self.entry_points and topics:
+            self.entry_points = [next(iter(topics))]
+        
+        self.atoms = Atoms()
+        self._line_branches: Dict[str, List[str]] = {}
+        self._line_pickers: Dict[str, Callable[[GameState], List[str]]] = {}
+        for topic_id, topic in topics.items():
+            self.atoms.add_topic(topic)
+            self.simulator.compiled_topic(topic_id)
+            self._line_branches[topic_id] = line_branches(topic.dynamic_line)
+            self._line_pickers[topic_id] = self.compile_line_branches(topic.dynamic_line)
+        
+        atoms = self.atoms
+        self._u_var_keys = set(atoms.checked_vars["u"])
+        self._npc_var_keys = set(atoms.checked_vars["npc"]) | atoms.sentinels
+        self._u_effect_ids = atoms.checked_effects["u"]
+        self._npc_effect_ids = atoms.checked_effects["npc"]
+        self.dimensions = self.build_dimensions()
+    
+    def compile_line_branches(self, line: Any, prefix: str = "") -> Callable[[GameState], List[str]]:
+        """Compile a dynamic_line into a closure listing the branches a state shows"""
+        conditions = self.simulator.conditions
+        if isinstance(line, list):
+            # The game picks one item at random, so every item can be shown
+            items = [(f"{prefix}{index}", self.compile_line_branches(item, f"{prefix}{index}/")) for index, item in enumerate(line)]
+            return lambda state: [path for own, nested in items for path in [own] + nested(state)]
+        if not isinstance(line, dict):
+            return lambda state: []
+        if "concatenate" in line:
+            parts = [self.compile_line_branches(item, f"{prefix}concatenate/{index}/") for index, item in enumerate(line["concatenate"])]
+            return lambda state: [path for part in parts for path in part(state)]
+        if "yes" not in line and "no" not in line:
+            gendered = [key for key in GENDER_LINE_KEYS if key in line and not isinstance(line[key], bool)]
+            if gendered:
+                branches = [
+                    (conditions.compile(key), prefix + key, self.compile_line_branches(line[key], f"{prefix}{key}/"))
+                    for key in gendered
+                ]
+                
+                def pick_gendered(state: GameState) -> List[str]:
+                    for condition, path, nested in branches:
+                        if condition(state):
+                            return [path] + nested(state)
+                    return []
+                return pick_gendered
+        condition = conditions.compile(line)
+        yes = (prefix + "yes", self.compile_line_branches(line["yes"], prefix + "yes/")) if "yes" in line else None
+        no = (prefix + "no", self.compile_line_branches(line["no"], prefix + "no/")) if "no" in line else None
+        
+        def pick(state: GameState) -> List[str]:
+            branch = yes if condition(state) else no
+            if branch is None:
+                return []
+            return [branch[0]] + branch[1](state)
+        return pick
+    
+    def build_dimensions(self) -> List[Dimension]:
+        """List the parts of the starting state to enumerate, from what conditions read but no effect writes"""
+        atoms = self.atoms
+        dimensions = []
+        if "u" in atoms.genders:
+            dimensions.append(Dimension("u_male", [True, False], lambda state, value: setattr(state, "u_male", value)))
+        if "npc" in atoms.genders:
+            dimensions.append(Dimension("npc_male", [True, False], lambda state, value: setattr(state, "npc_male", value)))
+        for talker in ("u", "npc"):
+            for name, values in sorted(atoms.checked_vars[talker].items()):
+                if name in atoms.written_vars[talker]:
+                    continue
+                concrete = sorted(value for value in values if value is not None)
+                dimensions.append(Dimension(
+                    f"{talker} var {name}", [None] + (concrete or ["yes"]), self._var_setter(talker, name)
+                ))
+            for effect_id in sorted(atoms.checked_effects[talker] - atoms.written_effects[talker]):
+                dimensions.append(Dimension(f"{talker} effect {effect_id}", [False, True], self._effect_setter(talker, effect_id)))
+        if not atoms.missions_written:
+            for mission in sorted(atoms.missions):
+                dimensions.append(Dimension(f"mission {mission}", [False, True], self._mission_setter(mission)))
+            for kind in sorted(atoms.mission_counts):
+                dimensions.append(Dimension(f"{kind} missions", [0, 1, 2], self._mission_count_setter(kind)))
+        if atoms.days:
+            dimensions.append(Dimension(
+                "days_since_cataclysm", sorted({0} | atoms.days), lambda state, value: setattr(state, "days_since_cataclysm", value)
+            ))
+        if atoms.seasons:
+            others = [season for season in SEASONS if season not in atoms.seasons]
+            dimensions.append(Dimension(
+                "season", sorted(atoms.seasons) + others[:1], lambda state, value: setattr(state, "season", value)
+            ))
+        for flag in sorted(atoms.flags):
+            dimensions.append(Dimension(flag, [True, False], lambda state, value, flag=flag: setattr(state, flag, value)))
+        if self.simulator.conditions.unsupported:
+            dimensions.append(Dimension(
+                "unmodelled conditions", [False, True], lambda state, value: setattr(state, "unknown_conditions", value)
+            ))
+        return dimensions
+    
+    @staticmethod
+    def _var_setter(talker: str, name: str):
+        """Setter for the starting value of a talker variable"""
+        def apply(state: GameState, value) -> None:
+            if value is not None:
+                getattr(state, f"{talker}_vars")[name] = value
+        return apply
+    
+    @staticmethod
+    def _effect_setter(talker: str, effect_id: str):
+        """Setter for whether a talker starts with an effect"""
+        def apply(state: GameState, value) -> None:
+            if value:
+                getattr(state, f"{talker}_effects")[effect_id] = None
+        return apply
+    
+    @staticmethod
+    def _mission_setter(mission: str):
+        """Setter for whether the player starts with a mission"""
+        def apply(state: GameState, value) -> None:
+            if value:
+                state.u_missions.add(mission)
+        return apply
+    
+    @staticmethod
+    def _mission_count_setter(kind: str):
+        """Setter for how many missions the NPC has assigned or available"""
+        def apply(state: GameState, value) -> None:
+            missions = [f"MISSION_{kind.upper()}_{index}" for index in range(value)]
+            setattr(state, f"npc_{kind}_missions", missions)
+        return apply
+    
+    def initial_states(self) -> Tuple[List[GameState], bool]:
+        """Build the starting states and tell whether they had to be sampled"""
+        domains = [dimension.values for dimension in self.dimensions]
+        total = 1
+        for values in domains:
+            total *= len(values)
+        if total <= self.max_initial_states:
+            assignments = itertools.product(*domains)
+            sampled = False
+        else:
+            # Always include the all-defaults state, then distinct random ones
+            rng = random.Random(self.seed)
+            chosen = {tuple(values[0] for values in domains)}
+            while len(chosen) < self.max_initial_states:
+                chosen.add(tuple(rng.choice(values) for values in domains))
+            assignments = sorted(chosen, key=repr)
+            sampled = True
+        
+        states = []
+        for assignment in assignments:
+            state = GameState()
+            for dimension, value in zip(self.dimensions, assignment):
+                dimension.apply(state, value)
+            states.append(state)
+        return states, sampled
+    
+    def project(self, state: GameState) -> None:
+        """Drop variables and effects that no condition reads, so they do not split states"""
+        for variables, keep in ((state.u_vars, self._u_var_keys), (state.npc_vars, self._npc_var_keys)):
+            for name in [name for name in variables if name not in keep]:
+                del variables[name]
+        for effects, keep in ((state.u_effects, self._u_effect_ids), (state.npc_effects, self._npc_effect_ids)):
+            for effect_id in [effect_id for effect_id in effects if effect_id not in keep]:
+                del effects[effect_id]
+    
+    def explore_states(self, states: List[GameState], max_states: int):
+        """Search from some starting states, returning what was reached as plain sets"""
+        simulator = self.simulator
+        topics = self.dialogue_graph.topics
+        reached_topics: Set[str] = set()
+        reached_responses: Set[Tuple[str, int]] = set()
+        reached_outcomes: Set[Tuple[str, int, str]] = set()
+        reached_lines: Set[Tuple[str, str]] = set()
+        visited: Set[Tuple] = set()
+        queue = deque()
+        expanded = 0
+        bound_hit = False
+        
+        def push(stack: Tuple[str, ...], truncated: bool, state: GameState, state_key: Tuple) -> None:
+            key = (stack, truncated, state_key)
+            if key not in visited:
+                visited.add(key)
+                queue.append((stack, truncated, state, state_key))
+        
+        def restart(state: GameState, state_key: Tuple) -> None:
+            # A later conversation can start at any entry point, with what this one changed
+            for entry in self.entry_points:
+                push((entry,), False, state, state_key)
+        
+        for state in states:
+            restart(state, state.key())
+        
+        while queue:
+            if expanded >= max_states:
+                bound_hit = True
+                break
+            expanded += 1
+            stack, truncated, state, state_key = queue.popleft()
+            topic_id = stack[-1]
+            compiled = simulator.compiled_topic(topic_id)
+            reached_topics.add(topic_id)
+            for path in self._line_pickers[topic_id](state):
+                reached_lines.add((topic_id, path))
+            
+            if compiled.speaker_effect is not _no_effect:
+                state = state.copy()
+                ended = compiled.speaker_effect(state)
+                self.project(state)
+                state_key = state.key()
+                if ended:
+                    restart(state, state_key)
+                    continue
+            
+            for response in compiled.responses:
+                if not response.condition(state):
+                    continue
+                reached_responses.add((topic_id, response.index))
+                if response.failure is None:
+                    outcomes = [("success", response.success)]
+                elif response.trial_condition is not None:
+                    outcomes = [("success", response.success) if response.trial_condition(state) else ("failure", response.failure)]
+                else:
+                    outcomes = [("success", response.success), ("failure", response.failure)]
+                
+                for name, outcome in outcomes:
+                    reached_outcomes.add((topic_id, response.index, name))
+                    next_state, next_key = state, state_key
+                    ended = False
+                    if outcome.effect is not _no_effect:
+                        next_state = state.copy()
+                        ended = outcome.effect(next_state)
+                        self.project(next_state)
+                        next_key = next_state.key()
+                    target = outcome.topic
+                    if ended or not target or (target in SPECIAL_TOPICS and target != "TALK_NONE") or (target != "TALK_NONE" and target not in topics):
+                        restart(next_state, next_key)
+                    elif target == "TALK_NONE":
+                        if len(stack) > 1:
+                            push(stack[:-1], truncated, next_state, next_key)
+                        elif truncated:
+                            # The topic to return to was forgotten; it was one of those leading here
+                            for source in self.dialogue_graph.get_predecessors(topic_id):
+                                if source in topics:
+                                    push((source,), True, next_state, next_key)
+                        else:
+                            restart(next_state, next_key)
+                    else:
+                        next_stack = stack + (target,)
+                        if len(next_stack) > self.stack_depth:
+                            push(next_stack[1:], True, next_state, next_key)
+                        else:
+                            push(next_stack, truncated, next_state, next_key)
+        
+        return reached_topics, reached_responses, reached_outcomes, reached_lines, expanded, bound_hit
+    
+    def report(self, results, initial_states: int, sampled: bool) -> CoverageReport:
+        """Combine search results into a coverage report"""
+        reached_topics, reached_responses, reached_outcomes, reached_lines = set(), set(), set(), set()
+        states_visited = 0
+        bound_hit = False
+        for topics, responses, outcomes, lines, visited, hit in results:
+            reached_topics |= topics
+            reached_responses |= responses
+            reached_outcomes |= outcomes
+            reached_lines |= lines
+            states_visited += visited
+            bound_hit = bound_hit or hit
+        
+        report = CoverageReport(
+            topics=len(self.dialogue_graph.topics),
+            reached_topics=len(reached_topics),
+            initial_states=initial_states,
+            states_visited=states_visited,
+            sampled=sampled,
+            bound_hit=bound_hit
+        )
+        for topic_id in self.dialogue_graph.topics:
+            if topic_id not in reached_topics:
+                report.unreachable_topics.append(topic_id)
+                continue
+            for path in self._line_branches[topic_id]:
+                if (topic_id, path) not in reached_lines:
+                    report.unreachable_lines.append((topic_id, path))
+            for response in self.simulator.compiled_topic(topic_id).responses:
+                if (topic_id, response.index) not in reached_responses:
+                    report.unreachable_responses.append((topic_id, response.index, response.text))
+                    continue
+                if response.failure is None:
+                    continue
+                for outcome in ("success", "failure"):
+                    if (topic_id, response.index, outcome) not in reached_outcomes:
+                        report.unreachable_outcomes.append((topic_id, response.index, outcome))
+        return report
+    
+    def explore(self, workers: Optional[int] = 1) -> CoverageReport:
+        """Explore from every starting state, in worker processes when there are several"""
+        global _shared
+        states, sampled = self.initial_states()
+        workers = workers or os.cpu_count() or 1
+        from ..parsers.parallel import can_fork
+        if workers <= 1 or len(states) < 2 or not can_fork():
+            results = [self.explore_states(states, self.max_states)]
+            return self.report(results, len(states), sampled)
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        shard_size = math.ceil(len(states) / (workers * SHARDS_PER_WORKER))
+        starts = list(range(0, len(states), shard_size))
+        stops = [min(start + shard_size, len(states)) for start in starts]
+        _shared = (self, states)
+        try:
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                results = list(pool.map(_explore_shard, starts, stops))
+        finally:
+            _shared = None
+        return self.report(results, len(states), sampled)
+
+
+def _explore_shard(start: int, stop: int):
+    """Search from a slice of the starting states with its share of the state bound"""
+    explorer, states = _shared
+    budget = math.ceil(explorer.max_states * (stop - start) / len(states))
+    return explorer.explore_states(states[start:stop], budget)
+
+
+def explore(dialogue_graph: DialogueGraph, workers: Optional[int] = 1, **options) -> CoverageReport:
+    """Explore a graph's state space and report what no play-through reaches"""
+    return StateExplorer(dialogue_graph, **options).explore(workers)
@@ -0,0 +1,83 @@
+"""Mock game state that conditions are evaluated against and effects change"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def var_key(name: str, var_type: Optional[str] = None, context: Optional[str] = None) -> str:
+    """Build the key a talker variable is stored under, as the game names it"""
+    parts = ["npctalk_var"]
+    if var_type:
+        parts.append(str(var_type))
+    if context:
+        parts.append(str(context))
+    parts.append(str(name))
+    return "_".join(parts)
+
+
+@dataclass
+class GameState:
+    """The player, the NPC being talked to and the world, reduced to what dialogue conditions read"""
+    u_male: bool = True
+    npc_male: bool = True
+    # Talker variables by var_key, and active effects by ID with their duration
+    u_vars: Dict[str, str] = field(default_factory=dict)
+    npc_vars: Dict[str, str] = field(default_factory=dict)
+    u_effects: Dict[str, object] = field(default_factory=dict)
+    npc_effects: Dict[str, object] = field(default_factory=dict)
+    # Missions the player has, and those the NPC has offered or handed out
+    u_missions: Set[str] = field(default_factory=set)
+    npc_available_missions: List[str] = field(default_factory=list)
+    npc_assigned_missions: List[str] = field(default_factory=list)
+    days_since_cataclysm: int = 0
+    season: str = "spring"
+    is_day: bool = True
+    is_outside: bool = False
+    # Success chance per trial type (PERSUADE, LIE, INTIMIDATE), default_trial_chance otherwise
+    trial_chances: Dict[str, float] = field(default_factory=dict)
+    default_trial_chance: float = 0.5
+    # Result of conditions the simulator does not model
+    unknown_conditions: bool = False
+    
+    def copy(self) -> 'GameState':
+        """Copy the state so a play-through can change it without touching the original"""
+        return GameState(
+            u_male=self.u_male,
+            npc_male=self.npc_male,
+            u_vars=dict(self.u_vars),
+            npc_vars=dict(self.npc_vars),
+            u_effects=dict(self.u_effects),
+            npc_effects=dict(self.npc_effects),
+            u_missions=set(self.u_missions),
+            npc_available_missions=list(self.npc_available_missions),
+            npc_assigned_missions=list(self.npc_assigned_missions),
+            days_since_cataclysm=self.days_since_cataclysm,
+            season=self.season,
+            is_day=self.is_day,
+            is_outside=self.is_outside,
+            trial_chances=dict(self.trial_chances),
+            default_trial_chance=self.default_trial_chance,
+            unknown_conditions=self.unknown_conditions,
+        )
+    
+    def key(self) -> Tuple:
+        """Hashable summary of everything conditions can read"""
+        return (
+            self.u_male,
+            self.npc_male,
+            frozenset(self.u_vars.items()),
+            frozenset(self.npc_vars.items()),
+            frozenset(self.u_effects),
+            frozenset(self.npc_effects),
+            frozenset(self.u_missions),
+            tuple(self.npc_available_missions),
+            tuple(self.npc_assigned_missions),
+            self.days_since_cataclysm,
+            self.season,
+            self.is_day,
+            self.is_outside,
+        )
+    
+    def trial_chance(self, trial_type: str) -> float:
+        """Get the chance a skill trial of this type succeeds"""
+        return self.trial_chances.get(trial_type, self.default_trial_chance)
@@ -1,26 +1,60 @@
 """Node graph canvas for displaying and interacting with dialogue nodes"""
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, simpledialog
 from typing import Optional, Callable, Tuple
 import math
+import threading
+import time
+from collections import deque
 
 from ..models.dialogue import DialogueGraph
 from ..graph.graph_manager import GraphManager
-from ..utils.helpers import calculate_node_size, truncate_text
+from ..graph.analysis import GraphAnalysis
+from ..graph.diff import DIFF_ADDED, DIFF_CHANGED, LiveDiff
+from ..graph.edge_bundling import EdgeBundler
+from ..graph.history import MoveNodes, UndoHistory
+from ..graph.layout import LayoutManager
+from ..graph.neighbourhood import NeighbourhoodView
+from ..utils.helpers import get_preview_text
+from ..utils.perf import perf
+from ..utils.text_metrics import TextMetrics
+
+# Redraw reasons, from cheapest to most expensive
+REDRAW_VIEW = "view"            # View moved - only the grid needs to follow
+REDRAW_SELECTION = "selection"  # Selection changed - restyle affected nodes
+REDRAW_EDGES = "edges"          # Nodes moved - redraw their connections
+REDRAW_FULL = "full"            # Content changed - rebuild everything
 
 
 class GraphCanvas(tk.Canvas):
     """Canvas for displaying node graph"""
     
-    NODE_WIDTH = 200
-    NODE_HEIGHT = 80
     NODE_PADDING = 10
     GRID_SIZE = 20  # Grid spacing in pixels
+    GRID_MAJOR_EVERY = 5  # Major grid line every N minor lines
+    GRID_MIN_SPACING = 8  # Smallest on-screen minor spacing before the grid coarsens
+    GRID_BG_COLOR = '#f5f5f5'
+    GRID_MINOR_COLOR = '#d0d0d0'
+    GRID_MAJOR_COLOR = '#b0b0b0'
+    # Analysis highlights
+    UNREACHABLE_FILL = '#F7F7F7'
+    UNREACHABLE_DASH = (4, 3)
+    DEAD_END_COLOR = '#D35400'
+    CYCLE_COLOR = '#8E44AD'
+    DIFF_ADDED_FILL = '#D5F5E3'
+    DIFF_ADDED_COLOR = '#1E8449'
+    DIFF_CHANGED_FILL = '#FDEBD0'
+    DIFF_CHANGED_COLOR = '#CA6F1E'
+    REDRAW_INTERVAL_MS = 16  # One frame at ~60 fps
+    MIN_ZOOM = 0.25
+    MAX_ZOOM = 3.0
+    ZOOM_STEP = 1.1
     
-    def __init__(self, parent, graph_manager: GraphManager, on_node_select: Optional[Callable] = None, on_mouse_move: Optional[Callable[[float, float], None]] = None):
+    def __init__(self, parent, graph_manager: GraphManager, on_node_select: Optional[Callable] = None, on_mouse_move: Optional[Callable[[float, float], None]] = None, history: Optional[UndoHistory] = None):
         super().__init__(parent, bg='#f5f5f5', highlightthickness=0)
         self.graph_manager = graph_manager
+        self.history = history if history is not None else UndoHistory()  # Drags are recorded here
         self.on_node_select = on_node_select
         self.on_mouse_move_cb = on_mouse_move
         
@@ -31,11 +65,66 @@ class GraphCanvas(tk.Canvas):
         self.is_panning = False
         self.is_dragging = False
         self.drag_node_id = None
+        self.drag_gesture = 0  # Numbers each drag so its moves undo as one step
         self.show_grid = True
         self.snap_to_grid = True
         
+        # Grid background cache (tile per zoom level, one viewport-sized image)
+        self._grid_tiles = {}
+        self._grid_image: Optional[tk.PhotoImage] = None
+        self._grid_image_key = None
+        self._grid_tile_size = 1
+        self._grid_item = None
+        
+        # Redraw scheduler state - requests are coalesced into one frame
+        self._redraw_after_id = None
+        self._dirty_reasons = set()
+        self._dirty_edge_topics = set()
+        self.redraw_requests = 0
+        self.redraws_executed = 0
+        self.show_perf_overlay = False
+        self._request_times = deque(maxlen=1000)
+        # Filled in by each full redraw; "culled" means hidden by groups or the neighbourhood view
+        self.draw_stats = {"nodes_drawn": 0, "nodes_culled": 0, "edges_drawn": 0, "edges_culled": 0}
+        # Callbacks invoked after each flush so overview widgets can follow the view
+        self.view_listeners = []
+        
+        # Drawn items used by partial redraws
+        self._node_rects = {}
+        self._edge_items = {}
+        self._drawn_selection = set()
+        self._applied_zoom_styles = None
+        # Node labels: item -> (full text, style tag, available world width), and the
+        # zoom tier each label was last truncated for
+        self._label_texts = {}
+        self._label_tiers = {}
+        self._edges_drawn = 0
+        
+        # Edge bundling - computed on a worker thread, cached per positions version
+        self.bundle_edges = False
+        self._bundling = None
+        self._bundling_key = None
+        self._bundling_generation = 0
+        self._bundling_thread = None
+        self._bundling_pending = None
+        
+        # Neighbourhood view - when set, only the topics near its focus are drawn
+        self.neighbourhood: Optional[NeighbourhoodView] = None
+        
+        # Reachability analysis - when set, nodes are highlighted by its results
+        self.analysis: Optional[GraphAnalysis] = None
+        self.on_analysis_change: Optional[Callable] = None
+        # (unreachable, dead ends, cycle members) as of the last full redraw
+        self._analysis_marks = None
+        
+        # Differences from a baseline (e.g. the last save) - when set, added and changed topics are coloured
+        self.diff: Optional[LiveDiff] = None
+        # (added, changed) as of the last full redraw
+        self._diff_marks = None
+        
         # Bind events
         self.bind("<Button-1>", self.on_click)
+        self.bind("<Double-Button-1>", self.on_double_click)
         self.bind("<B1-Motion>", self.on_drag)
         self.bind("<ButtonRelease-1>", self.on_release)
         self.bind("<Button-3>", self.on_right_click)
@@ -63,6 +152,8 @@ class GraphCanvas(tk.Canvas):
         self.bind("<KeyPress-KP_Add>", lambda e: self.zoom_in())     # keypad '+'
         self.bind("<KeyPress-minus>", lambda e: self.zoom_out())     # '-' key
         self.bind("<KeyPress-KP_Subtract>", lambda e: self.zoom_out())  # keypad '-'
+        # Performance overlay
+        self.bind("<F3>", lambda e: self.toggle_perf_overlay())
         # Redraw on window resize (but only for this widget)
         self.bind("<Configure>", self._on_configure)
         
@@ -90,10 +181,7 @@ class GraphCanvas(tk.Canvas):
     def on_mouse_move(self, event):
         """Report mouse position in world coordinates via callback"""
         try:
-            canvas_x = self.canvasx(event.x)
-            canvas_y = self.canvasy(event.y)
-            world_x = canvas_x / self.scale if self.scale != 0 else 0
-            world_y = canvas_y / self.scale if self.scale != 0 else 0
+            world_x, world_y = self.screen_to_world(event.x, event.y)
             if self.on_mouse_move_cb:
                 self.on_mouse_move_cb(world_x, world_y)
         except Exception:
@@ -102,7 +190,24 @@ class GraphCanvas(tk.Canvas):
     def _on_configure(self, event):
         """Handle window resize"""
         if event.widget == self:
-            self.after_idle(self.redraw)
+            # Only the grid depends on the widget size
+            self.request_redraw(REDRAW_VIEW)
+    
+    def world_to_canvas(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert world coordinates to canvas coordinates"""
+        return (x * self.scale, y * self.scale)
+    
+    def canvas_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert canvas coordinates to world coordinates"""
+        return (x / self.scale, y / self.scale)
+    
+    def world_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert world coordinates to widget (screen) coordinates"""
+        return (x * self.scale - self.canvasx(0), y * self.scale - self.canvasy(0))
+    
+    def screen_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert widget (screen) coordinates to world coordinates"""
+        return self.canvas_to_world(self.canvasx(x), self.canvasy(y))
     
     def snap_to_grid_coordinate(self, coord: float) -> float:
         """Snap a coordinate to the nearest grid point"""
@@ -121,33 +226,65 @@ class GraphCanvas(tk.Canvas):
         
         # Check if clicking on a node
         node_id = self.get_node_at(x, y)
-        if node_id:
+        if node_id and self.graph_manager.groups.is_group(node_id):
+            # Summary nodes can be dragged but are not topics to edit
+            self.is_dragging = True
+            self.drag_node_id = node_id
+            self.drag_gesture += 1
+        elif node_id and event.state & 0x0001:
+            # Shift-click adds to or removes from the selection (e.g. to group topics)
+            if self.graph_manager.is_selected(node_id):
+                self.graph_manager.deselect_node(node_id)
+            else:
+                self.graph_manager.select_node(node_id)
+            self.request_redraw(REDRAW_SELECTION)
+        elif node_id:
             self.is_dragging = True
             self.drag_node_id = node_id
+            self.drag_gesture += 1
             self.graph_manager.clear_selection()
             self.graph_manager.select_node(node_id)
             if self.on_node_select:
                 self.on_node_select(node_id)
-            self.redraw()
+            self.request_redraw(REDRAW_SELECTION)
         else:
             self.graph_manager.clear_selection()
             if self.on_node_select:
                 self.on_node_select(None)
-            self.redraw()
+            self.request_redraw(REDRAW_SELECTION)
     
     def on_drag(self, event):
         """Handle mouse drag"""
         if self.is_dragging and self.drag_node_id:
-            x = self.canvasx(event.x)
-            y = self.canvasy(event.y)
-            # Convert canvas coordinates to world coordinates
-            world_x = x / self.scale
-            world_y = y / self.scale
+            world_x, world_y = self.screen_to_world(event.x, event.y)
             # Snap to grid (grid size doesn't change, only visual scale)
             world_x = self.snap_to_grid_coordinate(world_x)
             world_y = self.snap_to_grid_coordinate(world_y)
-            self.graph_manager.set_node_position(self.drag_node_id, world_x, world_y)
-            self.redraw()
+            old_pos = self.node_position(self.drag_node_id)
+            group = self.graph_manager.groups.get_group(self.drag_node_id)
+            if self.neighbourhood is not None:
+                # Dragging rearranges the neighbourhood view only
+                self.neighbourhood.positions[self.drag_node_id] = (world_x, world_y)
+            elif group is not None:
+                group.position = (world_x, world_y)
+                self.invalidate_bundles()
+            else:
+                self.graph_manager.set_node_position(self.drag_node_id, world_x, world_y)
+            if self.neighbourhood is None and old_pos and old_pos != (world_x, world_y):
+                # Merged with the earlier moves of this drag
+                self.history.record(MoveNodes(
+                    self.graph_manager, {self.drag_node_id: (old_pos, (world_x, world_y))}, self.drag_gesture
+                ))
+            # Move the node's items in place; only its connections need redrawing
+            if old_pos and self.drag_node_id in self._node_rects:
+                self.move(
+                    self.drag_node_id,
+                    (world_x - old_pos[0]) * self.scale,
+                    (world_y - old_pos[1]) * self.scale
+                )
+                self.request_redraw(REDRAW_EDGES, [self.drag_node_id])
+            else:
+                self.request_redraw(REDRAW_FULL)
         elif self.is_panning:
             dx = event.x - self.pan_start_x
             dy = event.y - self.pan_start_y
@@ -157,32 +294,171 @@ class GraphCanvas(tk.Canvas):
     
     def on_release(self, event):
         """Handle mouse release"""
+        if self.is_dragging and self.bundle_edges:
+            # Dragged edges were drawn unbundled - re-bundle with the final positions
+            self.request_redraw(REDRAW_FULL)
         self.is_dragging = False
         self.drag_node_id = None
     
+    def on_double_click(self, event):
+        """Expand a summary node, or collapse the group of a topic"""
+        node_id = self.get_node_at(self.canvasx(event.x), self.canvasy(event.y))
+        if not node_id:
+            return
+        groups = self.graph_manager.groups
+        if groups.is_group(node_id):
+            self.expand_group(node_id)
+        else:
+            group = groups.group_of(node_id)
+            if group is not None:
+                self.collapse_group(group.id)
+    
     def on_right_click(self, event):
         """Handle right click (context menu)"""
         x = self.canvasx(event.x)
         y = self.canvasy(event.y)
-        # Could add context menu here
-        pass
+        node_id = self.get_node_at(x, y)
+        groups = self.graph_manager.groups
+        
+        menu = tk.Menu(self, tearoff=0)
+        if node_id and groups.is_group(node_id):
+            menu.add_command(label="Expand Group", command=lambda: self.expand_group(node_id))
+            menu.add_command(label="Ungroup", command=lambda: self.remove_group(node_id))
+        elif node_id and groups.group_of(node_id) is not None:
+            group = groups.group_of(node_id)
+            menu.add_command(label=f"Collapse '{group.name}'", command=lambda: self.collapse_group(group.id))
+            menu.add_command(label="Ungroup", command=lambda: self.remove_group(group.id))
+        if len(self.graph_manager.selected_nodes) > 1:
+            menu.add_command(label="Group Selected Topics...", command=self.group_selected)
+        if self.analysis is not None and node_id and not groups.is_group(node_id):
+            if node_id in (self.analysis.custom_entry_points or []):
+                menu.add_command(label="Remove Entry Point", command=lambda: self.toggle_entry_point(node_id))
+            else:
+                menu.add_command(label="Use as Entry Point", command=lambda: self.toggle_entry_point(node_id))
+            if self.analysis.custom_entry_points is not None:
+                menu.add_command(label="Reset Entry Points", command=lambda: self.set_entry_points(None))
+        if menu.index("end") is not None:
+            menu.add_separator()
+        menu.add_command(label="Group by ID Prefix", command=lambda: self.auto_group("prefix"))
+        menu.add_command(label="Group by Cycles", command=lambda: self.auto_group("cycles"))
+        menu.add_command(label="Collapse All Groups", command=lambda: self.set_all_groups_collapsed(True))
+        menu.add_command(label="Expand All Groups", command=lambda: self.set_all_groups_collapsed(False))
+        menu.add_command(label="Remove All Groups", command=self.clear_groups)
+        menu.tk_popup(event.x_root, event.y_root)
+    
+    def toggle_entry_point(self, topic_id: str):
+        """Add or remove a topic from the analysis entry points"""
+        analysis = self.analysis
+        if analysis.custom_entry_points is not None:
+            entries = list(analysis.custom_entry_points)
+        else:
+            # Start from the defaults, unless they are only the graph roots
+            entries = [] if analysis.uses_roots() else analysis.entry_points()
+        if topic_id in entries:
+            entries.remove(topic_id)
+        else:
+            entries.append(topic_id)
+        self.set_entry_points(entries)
+    
+    def set_entry_points(self, entries):
+        """Change the analysis entry points (None for the defaults)"""
+        self.analysis.set_entry_points(entries)
+        self.request_redraw(REDRAW_FULL)
+        if self.on_analysis_change:
+            self.on_analysis_change()
+    
+    def group_selected(self):
+        """Put the selected topics into a new, collapsed group"""
+        name = simpledialog.askstring("New Group", "Enter group name:", parent=self)
+        if name:
+            self.graph_manager.groups.add_group(name, self.graph_manager.selected_nodes)
+            self.on_groups_changed()
+    
+    def auto_group(self, mode: str):
+        """Group topics automatically by ID prefix or by cycles"""
+        groups = self.graph_manager.groups
+        if mode == "prefix":
+            groups.group_by_prefix()
+        else:
+            groups.group_by_cycles()
+        self.on_groups_changed()
+    
+    def collapse_group(self, group_id: str):
+        """Collapse a group into its summary node"""
+        self.graph_manager.groups.collapse(group_id)
+        self.on_groups_changed()
+    
+    def expand_group(self, group_id: str):
+        """Expand a group and lay out just its members around the summary node"""
+        groups = self.graph_manager.groups
+        group = groups.get_group(group_id)
+        if group is None:
+            return
+        groups.expand(group_id)
+        LayoutManager.group_layout(self.graph_manager, sorted(group.members), group.position)
+        self.on_groups_changed()
+    
+    def remove_group(self, group_id: str):
+        """Dissolve a group"""
+        self.graph_manager.groups.remove_group(group_id)
+        self.on_groups_changed()
+    
+    def set_all_groups_collapsed(self, collapsed: bool):
+        """Collapse or expand every group (expanding keeps the members' positions)"""
+        groups = self.graph_manager.groups
+        for group_id in list(groups.groups):
+            if collapsed:
+                groups.collapse(group_id)
+            else:
+                groups.expand(group_id)
+        self.on_groups_changed()
+    
+    def clear_groups(self):
+        """Dissolve all groups"""
+        self.graph_manager.groups.clear()
+        self.on_groups_changed()
+    
+    def on_groups_changed(self):
+        """Redraw after the set of drawn nodes changed"""
+        self.invalidate_bundles()
+        self.request_redraw(REDRAW_FULL)
     
-    def zoom_in(self, factor=1.1):
-        """Zoom in"""
-        self.scale *= factor
-        self.scale = min(3.0, self.scale)
-        self.redraw()
+    def zoom_in(self, factor=ZOOM_STEP):
+        """Zoom in around the center of the view"""
+        self.zoom_at(factor, self.winfo_width() / 2, self.winfo_height() / 2)
     
-    def zoom_out(self, factor=1.1):
-        """Zoom out"""
-        self.scale /= factor
-        self.scale = max(0.25, self.scale)
-        self.redraw()
+    def zoom_out(self, factor=ZOOM_STEP):
+        """Zoom out around the center of the view"""
+        self.zoom_at(1 / factor, self.winfo_width() / 2, self.winfo_height() / 2)
     
     def zoom_reset(self):
         """Reset zoom to 1.0"""
-        self.scale = 1.0
-        self.redraw()
+        self.zoom_at(1.0 / self.scale, self.winfo_width() / 2, self.winfo_height() / 2)
+    
+    def zoom_at(self, factor: float, screen_x: float, screen_y: float):
+        """Zoom by a factor while keeping the world point under (screen_x, screen_y) fixed"""
+        new_scale = max(self.MIN_ZOOM, min(self.MAX_ZOOM, self.scale * factor))
+        if new_scale == self.scale:
+            return
+        
+        world_x, world_y = self.screen_to_world(screen_x, screen_y)
+        factor = new_scale / self.scale
+        self.scale = new_scale
+        
+        # Rescale the existing items about the world origin instead of recreating them.
+        # Canvas coordinates stay world * scale, so hit-testing and drags keep working.
+        # (self.scale shadows the Canvas.scale method, so call it through the class.)
+        tk.Canvas.scale(self, "all", 0, 0, factor, factor)
+        self.apply_zoom_styles()
+        
+        try:
+            x1, y1, x2, y2 = (float(v) for v in self.cget("scrollregion").split())
+            self.configure(scrollregion=(x1 * factor, y1 * factor, x2 * factor, y2 * factor))
+        except ValueError:
+            pass
+        
+        self.scale_to_point(world_x, world_y, screen_x, screen_y)
+        self.request_redraw(REDRAW_VIEW)
     
     def on_zoom(self, event):
         """Handle mouse wheel zoom"""
@@ -190,10 +466,6 @@ class GraphCanvas(tk.Canvas):
         mouse_x = event.x
         mouse_y = event.y
         
-        # Convert to canvas coordinates
-        canvas_x = self.canvasx(mouse_x)
-        canvas_y = self.canvasy(mouse_y)
-        
         # Handle different platforms
         zoom_in = False
         if hasattr(event, 'delta'):
@@ -217,31 +489,87 @@ class GraphCanvas(tk.Canvas):
         else:
             return  # Unknown event
         
-        old_scale = self.scale
-        if zoom_in:
-            self.scale *= 1.1
-            self.scale = min(3.0, self.scale)
-        else:
-            self.scale /= 1.1
-            self.scale = max(0.25, self.scale)
-        
         # Zoom to point (keep mouse position fixed)
-        if old_scale != self.scale:
-            self.scale_to_point(canvas_x, canvas_y, mouse_x, mouse_y)
-            self.redraw()
+        self.zoom_at(self.ZOOM_STEP if zoom_in else 1 / self.ZOOM_STEP, mouse_x, mouse_y)
+    
+    def center_on(self, world_x: float, world_y: float):
+        """Scroll the view so the world point is in the middle of the canvas"""
+        self.scale_to_point(world_x, world_y, self.winfo_width() / 2, self.winfo_height() / 2)
+        self.request_redraw(REDRAW_VIEW)
+    
+    def scale_to_point(self, world_x, world_y, screen_x, screen_y):
+        """Scroll the view so the world point sits under the given screen position"""
+        left = world_x * self.scale - screen_x
+        top = world_y * self.scale - screen_y
+        width = self.winfo_width()
+        height = self.winfo_height()
+        
+        # The view can only be placed inside the scroll region, so grow it to fit
+        try:
+            x1, y1, x2, y2 = (float(v) for v in self.cget("scrollregion").split())
+        except ValueError:
+            x1, y1, x2, y2 = left, top, left + width, top + height
+        x1 = min(x1, left)
+        y1 = min(y1, top)
+        x2 = max(x2, left + width)
+        y2 = max(y2, top + height)
+        self.configure(scrollregion=(x1, y1, x2, y2))
+        
+        if x2 > x1:
+            self.xview_moveto((left - x1) / (x2 - x1))
+        if y2 > y1:
+            self.yview_moveto((top - y1) / (y2 - y1))
+    
+    def zoom_styles(self):
+        """Get fonts and line widths for the current zoom"""
+        return {
+            "node_id_text": ("Arial", max(7, int(9 * self.scale)), "bold"),
+            "node_preview_text": ("Arial", max(6, int(8 * self.scale))),
+            "node_count_text": ("Arial", max(6, int(8 * self.scale))),
+            "connection": max(2, int(2 * self.scale)),
+        }
+    
+    def apply_zoom_styles(self):
+        """Update fonts and line widths of existing items after a zoom"""
+        styles = self.zoom_styles()
+        if styles == self._applied_zoom_styles:
+            return
+        # One itemconfigure per tag touches every matching item without recreating it
+        for tag, value in styles.items():
+            if tag == "connection":
+                self.itemconfigure(tag, width=value)
+            else:
+                self.itemconfigure(tag, font=value)
+        self._applied_zoom_styles = styles
+    
+    def label_tier(self) -> float:
+        """Get the zoom tier labels are truncated for"""
+        # Quantizing the zoom lets every scale within a tier share memoized truncations
+        return max(0.1, round(self.scale, 1))
+    
+    def fit_label(self, text: str, tag: str, world_width: float) -> str:
+        """Truncate label text to the pixel width it gets at the current zoom tier"""
+        return TextMetrics.truncate(self.zoom_styles()[tag], text, world_width * self.label_tier())
     
-    def scale_to_point(self, canvas_x, canvas_y, screen_x, screen_y):
-        """Scale around a specific point to keep it under the cursor"""
-        # After zoom, the same screen position should point to the same canvas position
-        # Calculate how much the canvas moved due to scaling
-        # This is a simplified version - full implementation would require more complex math
-        pass  # For now, just let it zoom from center
+    def refit_visible_labels(self):
+        """Re-truncate on-screen labels drawn for a different zoom tier"""
+        tier = self.label_tier()
+        left, top = self.canvasx(0), self.canvasy(0)
+        # Off-screen labels are refitted lazily when the view reaches them
+        for item in self.find_overlapping(left, top, left + self.winfo_width(), top + self.winfo_height()):
+            label = self._label_texts.get(item)
+            if label is None or self._label_tiers.get(item) == tier:
+                continue
+            text, tag, world_width = label
+            self.itemconfigure(item, text=self.fit_label(text, tag, world_width))
+            self._label_tiers[item] = tier
     
     def on_pan_start(self, event):
         """Start panning"""
         self.is_panning = True
         self.pan_start_x = event.x
         self.pan_start_y = event.y
+        self.scan_mark(event.x, event.y)
     
     def on_pan(self, event):
         """Handle panning"""
@@ -249,6 +577,7 @@ class GraphCanvas(tk.Canvas):
             self.scan_dragto(event.x, event.y, gain=1)
             self.pan_start_x = event.x
             self.pan_start_y = event.y
+            self.request_redraw(REDRAW_VIEW)
     
     def on_pan_end(self, event):
         """End panning"""
@@ -272,22 +601,109 @@ class GraphCanvas(tk.Canvas):
             self.scan_mark(0, 0)
             self.scan_dragto(0, -pan_distance, gain=1)
         
-        # Redraw to update grid position with new view
-        self.redraw()
+        # Slide the grid background along with the new view
+        self.request_redraw(REDRAW_VIEW)
     
     def get_node_at(self, x: float, y: float) -> Optional[str]:
         """Get node ID at given coordinates"""
         # Convert canvas coordinates to world coordinates (inverse of zoom)
-        world_x = x / self.scale
-        world_y = y / self.scale
+        world_x, world_y = self.canvas_to_world(x, y)
         
-        for topic_id, pos in self.graph_manager.node_positions.items():
+        for topic_id, pos in self.visible_positions().items():
             node_x, node_y = pos
+            node_width, node_height = self.node_size(topic_id)
             # Check if click is within node bounds (in world coordinates)
-            if abs(world_x - node_x) < self.NODE_WIDTH / 2 and abs(world_y - node_y) < self.NODE_HEIGHT / 2:
+            if abs(world_x - node_x) < node_width / 2 and abs(world_y - node_y) < node_height / 2:
                 return topic_id
         return None
     
+    def visible_positions(self):
+        """Get positions of the nodes that are drawn, keyed by node ID"""
+        if self.neighbourhood is not None:
+            return self.neighbourhood.positions
+        return self.graph_manager.groups.visible_positions()
+    
+    def node_position(self, node_id: str) -> Optional[Tuple[float, float]]:
+        """Get the world position of a drawn node (topic or group summary)"""
+        if self.neighbourhood is not None:
+            return self.neighbourhood.positions.get(node_id)
+        group = self.graph_manager.groups.get_group(node_id)
+        if group is not None:
+            return group.position
+        return self.graph_manager.get_node_position(node_id)
+    
+    def node_size(self, node_id: str) -> Tuple[float, float]:
+        """Get the world size of a drawn node (topic or group summary)"""
+        if self.graph_manager.groups.is_group(node_id):
+            return (self.graph_manager.NODE_MAX_WIDTH, self.graph_manager.NODE_HEIGHT)
+        return self.graph_manager.get_node_size(node_id)
+    
+    def draw_group_node(self, group):
+        """Draw a collapsed group as one summary node"""
+        x, y = group.position
+        node_width, node_height = self.node_size(group.id)
+        styles = self.zoom_styles()
+        scaled_x = x * self.scale
+        scaled_y = y * self.scale
+        width = node_width * self.scale
+        height = node_height * self.scale
+        text_width = node_width - 2 * self.NODE_PADDING
+        tier = self.label_tier()
+        
+        self._node_rects[group.id] = self.create_rectangle(
+            scaled_x - width / 2, scaled_y - height / 2,
+            scaled_x + width / 2, scaled_y + height / 2,
+            fill='#FFF4D6',
+            outline='#C08A00',
+            width=2,
+            dash=(6, 3),
+            tags=(group.id, "node", "group_node")
+        )
+        item = self.create_text(
+            scaled_x, scaled_y - 20 * self.scale,
+            text=self.fit_label(group.name, "node_id_text", text_width),
+            font=styles["node_id_text"],
+            fill="#333333",
+            tags=(group.id, "node_text", "node_id_text")
+        )
+        self._label_texts[item] = (group.name, "node_id_text", text_width)
+        self._label_tiers[item] = tier
+        self.create_text(
+            scaled_x, scaled_y + 5 * self.scale,
+            text=f"{len(group.members)} topics (double-click to expand)",
+            font=styles["node_preview_text"],
+            fill="#666666",
+            tags=(group.id, "node_text", "node_preview_text")
+        )
+    
+    def node_style(self, topic_id: str, selected: bool) -> dict:
+        """Get the rectangle options of a node from its selection, analysis and diff state"""
+        if selected:
+            style = {"fill": '#4A90E2', "outline": '#2E5C8A', "width": 2, "dash": ()}
+        else:
+            style = {"fill": '#E8E8E8', "outline": '#888888', "width": 1, "dash": ()}
+        if self._analysis_marks is not None:
+            unreachable, dead_ends, cycle_members = self._analysis_marks
+            if topic_id in unreachable:
+                style["dash"] = self.UNREACHABLE_DASH
+                if not selected:
+                    style["fill"] = self.UNREACHABLE_FILL
+            if topic_id in dead_ends:
+                style.update(outline=self.DEAD_END_COLOR, width=2)
+            elif topic_id in cycle_members:
+                style.update(outline=self.CYCLE_COLOR, width=2)
+        if self._diff_marks is not None:
+            added, changed = self._diff_marks
+            if topic_id in added:
+                style.update(outline=self.DIFF_ADDED_COLOR, width=3)
+                if not selected:
+                    style["fill"] = self.DIFF_ADDED_FILL
+            elif topic_id in changed:
+                style.update(outline=self.DIFF_CHANGED_COLOR, width=3)
+                if not selected:
+                    style["fill"] = self.DIFF_CHANGED_FILL
+        return style
+    
     def draw_node(self, topic_id: str, x: float, y: float):
         """Draw a single node"""
         topic = self.graph_manager.dialogue_graph.get_topic(topic_id)
@@ -295,87 +711,72 @@ class GraphCanvas(tk.Canvas):
             return
         
         is_selected = self.graph_manager.is_selected(topic_id)
+        styles = self.zoom_styles()
         
-        # Node colors
-        if is_selected:
-            fill_color = '#4A90E2'
-            outline_color = '#2E5C8A'
-        else:
-            fill_color = '#E8E8E8'
-            outline_color = '#888888'
+        style = self.node_style(topic_id, is_selected)
         
         # Scale positions with zoom (zooming in makes things appear closer)
         scaled_x = x * self.scale
         scaled_y = y * self.scale
         
-        # Draw node rectangle (scale size with zoom)
-        width = self.NODE_WIDTH * self.scale
-        height = self.NODE_HEIGHT * self.scale
+        # Draw node rectangle (measured size, scaled with zoom)
+        node_width, node_height = self.graph_manager.get_node_size(topic_id)
+        width = node_width * self.scale
+        height = node_height * self.scale
+        text_width = node_width - 2 * self.NODE_PADDING
+        tier = self.label_tier()
         
         x1 = scaled_x - width / 2
         y1 = scaled_y - height / 2
         x2 = scaled_x + width / 2
         y2 = scaled_y + height / 2
         
-        self.create_rectangle(
+        self._node_rects[topic_id] = self.create_rectangle(
             x1, y1, x2, y2,
-            fill=fill_color,
-            outline=outline_color,
-            width=2 if is_selected else 1,
-            tags=(topic_id, "node")
+            tags=(topic_id, "node"),
+            **style
         )
         
         # Draw topic ID (scale font with zoom)
-        font_size = max(7, int(9 * self.scale))
-        display_id = truncate_text(topic.id, 25)
-        self.create_text(
+        item = self.create_text(
             scaled_x, scaled_y - 20 * self.scale,
-            text=display_id,
-            font=("Arial", font_size, "bold"),
+            text=self.fit_label(topic.id, "node_id_text", text_width),
+            font=styles["node_id_text"],
             fill="#333333",
-            tags=(topic_id, "node_text")
+            tags=(topic_id, "node_text", "node_id_text")
         )
+        self._label_texts[item] = (topic.id, "node_id_text", text_width)
+        self._label_tiers[item] = tier
         
         # Draw preview of first dynamic line
         if topic.dynamic_line is not None:
-            # Get preview text from dynamic_line
-            if isinstance(topic.dynamic_line, str):
-                first_line = topic.dynamic_line
-            elif isinstance(topic.dynamic_line, dict):
-                # Conditional - show yes branch if available
-                first_line = topic.dynamic_line.get("yes", "") if "yes" in topic.dynamic_line else str(topic.dynamic_line)
-            elif isinstance(topic.dynamic_line, list):
-                # Array for random selection - get first item
-                first_line = str(topic.dynamic_line[0]) if len(topic.dynamic_line) > 0 else ""
-            else:
-                first_line = str(topic.dynamic_line)
+            first_line = get_preview_text(topic.dynamic_line)
             
             if first_line:
-                preview = truncate_text(first_line, 30)
-                preview_font_size = max(6, int(8 * self.scale))
-                self.create_text(
+                item = self.create_text(
                     scaled_x, scaled_y + 5 * self.scale,
-                    text=preview,
-                    font=("Arial", preview_font_size),
+                    text=self.fit_label(first_line, "node_preview_text", text_width),
+                    font=styles["node_preview_text"],
                     fill="#666666",
-                    tags=(topic_id, "node_text")
+                    tags=(topic_id, "node_text", "node_preview_text")
                 )
+                self._label_texts[item] = (first_line, "node_preview_text", text_width)
+                self._label_tiers[item] = tier
         
         # Draw response count
         if topic.responses:
-            count_font_size = max(6, int(8 * self.scale))
             self.create_text(
                 scaled_x + width / 2 - 10 * self.scale, scaled_y - height / 2 + 10 * self.scale,
                 text=f"{len(topic.responses)}",
-                font=("Arial", count_font_size),
+                font=styles["node_count_text"],
                 fill="#888888",
-                tags=(topic_id, "node_text")
+                tags=(topic_id, "node_text", "node_count_text")
             )
     
-    def draw_connection(self, from_id: str, to_id: str):
-        """Draw connection between nodes"""
-        pos1 = self.graph_manager.get_node_position(from_id)
-        pos2 = self.graph_manager.get_node_position(to_id)
+    def draw_connection(self, from_id: str, to_id: str, count: int = 1):
+        """Draw connection between nodes, labelled with the number of parallel responses"""
+        pos1 = self.node_position(from_id)
+        pos2 = self.node_position(to_id)
         
         if not pos1 or not pos2:
             return
@@ -398,146 +799,417 @@ class GraphCanvas(tk.Canvas):
             return
         
         # Start point on edge of source node (scale with zoom)
-        sx = scaled_x1 + (dx / dist) * (self.NODE_WIDTH * self.scale / 2)
-        sy = scaled_y1 + (dy / dist) * (self.NODE_HEIGHT * self.scale / 2)
+        width1, height1 = self.node_size(from_id)
+        sx = scaled_x1 + (dx / dist) * (width1 * self.scale / 2)
+        sy = scaled_y1 + (dy / dist) * (height1 * self.scale / 2)
         
         # End point on edge of target node (scale with zoom)
-        ex = scaled_x2 - (dx / dist) * (self.NODE_WIDTH * self.scale / 2)
-        ey = scaled_y2 - (dy / dist) * (self.NODE_HEIGHT * self.scale / 2)
+        width2, height2 = self.node_size(to_id)
+        ex = scaled_x2 - (dx / dist) * (width2 * self.scale / 2)
+        ey = scaled_y2 - (dy / dist) * (height2 * self.scale / 2)
         
-        self.create_line(
+        item = self.create_line(
             sx, sy, ex, ey,
             fill="#333333",
-            width=max(2, int(2 * self.scale)),
+            width=self.zoom_styles()["connection"],
             arrow=tk.LAST,
             arrowshape=(8, 10, 3),
-            tags="connection"
+            tags=("connection", f"out:{from_id}", f"in:{to_id}")
         )
+        self._edge_items[item] = [(from_id, to_id, count)]
+        self._edges_drawn += 1
+        
+        if count > 1:
+            self.create_text(
+                (sx + ex) / 2, (sy + ey) / 2,
+                text=f"×{count}",
+                font=self.zoom_styles()["node_count_text"],
+                fill="#555555",
+                tags=("connection_label", "node_count_text", f"out:{from_id}", f"in:{to_id}")
+            )
+    
+    def draw_bundle(self, bundle):
+        """Draw a bundle as one smoothed fan polyline plus a trunk into the hub"""
+        positions = self.visible_positions()
+        fan_coords = [
+            value * self.scale
+            for point in EdgeBundler.fan_points(bundle, positions)
+            for value in point
+        ]
+        member_tags = tuple(f"out:{from_id}" for from_id, _ in bundle.sources)
+        tags = ("bundle", f"in:{bundle.target}") + member_tags
+        fan = self.create_line(*fan_coords, smooth=True, fill="#999999", width=1, tags=tags)
+        
+        # Trunk from the control point to the edge of the hub node
+        cx, cy = bundle.control[0] * self.scale, bundle.control[1] * self.scale
+        tx, ty = positions[bundle.target][0] * self.scale, positions[bundle.target][1] * self.scale
+        dx = tx - cx
+        dy = ty - cy
+        dist = math.sqrt(dx*dx + dy*dy)
+        if dist >= 1:
+            hub_width, hub_height = self.node_size(bundle.target)
+            ex = tx - (dx / dist) * (hub_width * self.scale / 2)
+            ey = ty - (dy / dist) * (hub_height * self.scale / 2)
+            trunk = self.create_line(
+                cx, cy, ex, ey,
+                fill="#333333",
+                width=max(2, int(math.log2(bundle.total + 1) * self.scale)),
+                arrow=tk.LAST,
+                arrowshape=(8, 10, 3),
+                tags=tags
+            )
+            self._edge_items[trunk] = []
+        
+        self.create_text(
+            cx, cy,
+            text=f"×{bundle.total}",
+            font=self.zoom_styles()["node_count_text"],
+            fill="#555555",
+            tags=("connection_label", "node_count_text", f"in:{bundle.target}") + member_tags
+        )
+        self._edge_items[fan] = [(from_id, bundle.target, count) for from_id, count in bundle.sources]
+        self._edges_drawn += len(bundle.sources)
+    
+    def draw_connections(self):
+        """Draw all connections, bundling edges into hubs when enabled"""
+        if self.neighbourhood is not None:
+            # Only the induced subgraph - never touches the rest of the graph
+            for from_id, to_id, count in self.neighbourhood.edges():
+                self.draw_connection(from_id, to_id, count)
+            return
+        
+        # Edges into or out of collapsed groups are merged onto the summary nodes
+        edges = self.graph_manager.groups.aggregate_edges(
+            EdgeBundler.collect_edges(self.graph_manager.dialogue_graph)
+        )
+        if self.bundle_edges:
+            bundling = self.get_bundling(edges)
+            if bundling is not None:
+                for bundle in bundling.bundles:
+                    self.draw_bundle(bundle)
+                edges = bundling.plain_edges
+        
+        for from_id, to_id, count in edges:
+            self.draw_connection(from_id, to_id, count)
+    
+    def show_neighbourhood(self, topic_id: str, hops: int = NeighbourhoodView.DEFAULT_HOPS):
+        """Switch to (or move) the neighbourhood view around a topic"""
+        if self.neighbourhood is None or self.neighbourhood.dialogue_graph is not self.graph_manager.dialogue_graph:
+            self.neighbourhood = NeighbourhoodView(self.graph_manager.dialogue_graph, hops)
+        self.neighbourhood.hops = hops
+        self.neighbourhood.focus(topic_id)
+        self.request_redraw(REDRAW_FULL)
+        self.center_on(0, 0)
+    
+    def refresh_neighbourhood(self):
+        """Recompute the neighbourhood after the graph changed"""
+        if self.neighbourhood is not None:
+            self.neighbourhood.refresh()
+            self.request_redraw(REDRAW_FULL)
+    
+    def clear_neighbourhood(self):
+        """Go back to drawing the whole graph"""
+        if self.neighbourhood is None:
+            return
+        center = self.neighbourhood.center
+        self.neighbourhood = None
+        self.request_redraw(REDRAW_FULL)
+        pos = self.graph_manager.get_node_position(center) if center else None
+        if pos:
+            self.center_on(*pos)
+    
+    def export_postscript(self, file_path: str):
+        """Write the whole graph (not just the visible area) as PostScript"""
+        bbox = self.bbox("node", "connection")
+        if not bbox:
+            bbox = (0, 0, self.winfo_width(), self.winfo_height())
+        x1, y1, x2, y2 = bbox
+        self.postscript(file=file_path, colormode="color", x=x1, y=y1, width=x2 - x1, height=y2 - y1)
+    
+    def toggle_edge_bundling(self):
+        """Toggle edge bundling for hub topics"""
+        self.bundle_edges = not self.bundle_edges
+        self.request_redraw(REDRAW_FULL)
+    
+    def invalidate_bundles(self):
+        """Drop cached bundles after the graph's edges changed"""
+        self._bundling_generation += 1
     
+    def get_bundling(self, edges):
+        """Get cached bundles, or start computing them and return None for now"""
+        key = (id(self.graph_manager), self.graph_manager.position_version, self._bundling_generation)
+        if self._bundling_key == key:
+            return self._bundling
+        
+        if self._bundling_thread is None:
+            positions = dict(self.visible_positions())
+            
+            def work():
+                self._bundling_pending = (key, EdgeBundler.bundle(positions, edges))
+            
+            # Tk is not thread-safe: the worker only computes, the main loop polls for the result
+            self._bundling_thread = threading.Thread(target=work, daemon=True)
+            self._bundling_thread.start()
+            self.after(50, self._poll_bundling)
+        return None
+    
+    def _poll_bundling(self):
+        """Pick up a finished bundling result on the Tk thread"""
+        if self._bundling_thread is not None and self._bundling_thread.is_alive():
+            self.after(50, self._poll_bundling)
+            return
+        self._bundling_thread = None
+        if self._bundling_pending is not None:
+            self._bundling_key, self._bundling = self._bundling_pending
+            self._bundling_pending = None
+        if self.bundle_edges:
+            # Redraw with the bundles (or start over if the graph moved meanwhile)
+            self.request_redraw(REDRAW_FULL)
+    
+    def grid_spacing(self) -> float:
+        """Get minor grid spacing in canvas pixels for the current zoom"""
+        spacing = self.GRID_SIZE * self.scale
+        # Coarsen the grid at low zoom so lines never collapse into a solid fill
+        while spacing < self.GRID_MIN_SPACING:
+            spacing *= self.GRID_MAJOR_EVERY
+        return spacing
+    
+    def get_grid_tile(self) -> tk.PhotoImage:
+        """Get the grid tile image for the current zoom, rendering it if needed"""
+        spacing = self.grid_spacing()
+        key = (round(spacing, 2), max(1, int(self.scale)))
+        tile = self._grid_tiles.get(key)
+        if tile is not None:
+            return tile
+        
+        # One tile covers a single major cell: a major line plus the minor lines inside it
+        size = max(1, int(round(spacing * self.GRID_MAJOR_EVERY)))
+        line_width = key[1]
+        tile = tk.PhotoImage(width=size, height=size)
+        tile.put(self.GRID_BG_COLOR, to=(0, 0, size, size))
+        for i in range(1, self.GRID_MAJOR_EVERY):
+            offset = int(round(i * size / self.GRID_MAJOR_EVERY))
+            tile.put(self.GRID_MINOR_COLOR, to=(offset, 0, min(size, offset + line_width), size))
+            tile.put(self.GRID_MINOR_COLOR, to=(0, offset, size, min(size, offset + line_width)))
+        tile.put(self.GRID_MAJOR_COLOR, to=(0, 0, min(size, line_width), size))
+        tile.put(self.GRID_MAJOR_COLOR, to=(0, 0, size, min(size, line_width)))
+        
+        # Keep a handful of zoom levels around so zooming back and forth stays cheap
+        if len(self._grid_tiles) >= 8:
+            self._grid_tiles.pop(next(iter(self._grid_tiles)))
+        self._grid_tiles[key] = tile
+        return tile
+    
+    def get_grid_image(self, width: int, height: int) -> tk.PhotoImage:
+        """Get the background image covering the viewport, tiling it if needed"""
+        tile = self.get_grid_tile()
+        tile_size = tile.width()
+        # One extra tile in each direction lets the image slide while panning
+        image_width = (width // tile_size + 2) * tile_size
+        image_height = (height // tile_size + 2) * tile_size
+        key = (str(tile), image_width, image_height)
+        if self._grid_image is not None and self._grid_image_key == key:
+            return self._grid_image
+        
+        image = tk.PhotoImage(width=image_width, height=image_height)
+        # Tk photo copy replicates the source when the destination region is larger
+        image.tk.call(image, "copy", tile, "-to", 0, 0, image_width, image_height)
+        self._grid_image = image
+        self._grid_image_key = key
+        self._grid_tile_size = tile_size
+        return image
+    
+    def position_grid(self):
+        """Move the grid background so it covers the visible area"""
+        if not self._grid_item:
+            return
+        tile_size = self._grid_tile_size
+        left = self.canvasx(0)
+        top = self.canvasy(0)
+        self.coords(
+            self._grid_item,
+            math.floor(left / tile_size) * tile_size,
+            math.floor(top / tile_size) * tile_size
+        )
+    
+    def update_grid(self):
+        """Refresh the grid image for the current zoom and size, then reposition it"""
+        if not self._grid_item:
+            self.draw_grid()
+            return
+        width = self.winfo_width()
+        height = self.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        image = self.get_grid_image(width, height)
+        if self.itemcget(self._grid_item, "image") != str(image):
+            self.itemconfigure(self._grid_item, image=image)
+        self.position_grid()
+    
+    @perf.timed("canvas.draw_grid")
     def draw_grid(self):
-        """Draw grid lines on the canvas"""
+        """Draw the grid as a single tiled background image"""
+        self._grid_item = None
         if not self.show_grid:
             return
         
         try:
-            # Get visible canvas area (not window coordinates)
             width = self.winfo_width()
             height = self.winfo_height()
             
             # Check for valid dimensions
-            if width <= 0 or height <= 0:
+            if width <= 1 or height <= 1:
                 return
             
-            # Get visible canvas area in canvas coordinates (accounts for scrolling)
-            canvas_x1 = self.canvasx(0)
-            canvas_y1 = self.canvasy(0)
-            canvas_x2 = self.canvasx(width)
-            canvas_y2 = self.canvasy(height)
-            
-            # Validate coordinates
-            if not all(isinstance(v, (int, float)) and not (math.isnan(v) or math.isinf(v)) 
-                      for v in [canvas_x1, canvas_y1, canvas_x2, canvas_y2]):
-                return
-            
-            # Grid size in canvas coordinates (scales with zoom)
-            # Base grid size in world coordinates, then scale to canvas
-            effective_grid_size = self.GRID_SIZE * self.scale
-            effective_grid_size = max(10, min(50, effective_grid_size))
-            
-            # Work in canvas coordinates directly (which already account for scrolling)
-            min_x = min(canvas_x1, canvas_x2)
-            min_y = min(canvas_y1, canvas_y2)
-            max_x = max(canvas_x1, canvas_x2)
-            max_y = max(canvas_y1, canvas_y2)
-            
-            # Expand visible area by one grid size for smoother scrolling
-            min_x -= effective_grid_size
-            min_y -= effective_grid_size
-            max_x += effective_grid_size
-            max_y += effective_grid_size
-            
-            # Limit grid drawing to reasonable bounds to prevent excessive lines
-            grid_width = abs(max_x - min_x)
-            grid_height = abs(max_y - min_y)
-            if grid_width > 5000 or grid_height > 5000:
-                # Skip grid drawing if area is too large (performance)
-                return
-            
-            # Also limit based on number of grid lines that would be drawn
-            estimated_vertical_lines = grid_width / effective_grid_size if effective_grid_size > 0 else 0
-            estimated_horizontal_lines = grid_height / effective_grid_size if effective_grid_size > 0 else 0
-            if estimated_vertical_lines > 150 or estimated_horizontal_lines > 150:
-                return
-            
-            # Snap grid start to grid boundaries (in canvas coordinates)
-            grid_start_x = (int(min_x) // int(effective_grid_size)) * int(effective_grid_size)
-            grid_start_y = (int(min_y) // int(effective_grid_size)) * int(effective_grid_size)
-            
-            # Limit number of lines to prevent performance issues
-            max_lines = 200
-            
-            # Draw vertical grid lines (in canvas coordinates)
-            x = grid_start_x
-            line_count = 0
-            while x <= max_x and line_count < max_lines:
-                self.create_line(
-                    int(x), int(min_y), int(x), int(max_y),
-                    fill='#d0d0d0',
-                    width=max(1, int(self.scale)),
-                    tags="grid"
-                )
-                x += effective_grid_size
-                line_count += 1
-            
-            # Draw horizontal grid lines (in canvas coordinates)
-            y = grid_start_y
-            line_count = 0
-            while y <= max_y and line_count < max_lines:
-                self.create_line(
-                    int(min_x), int(y), int(max_x), int(y),
-                    fill='#d0d0d0',
-                    width=max(1, int(self.scale)),
-                    tags="grid"
-                )
-                y += effective_grid_size
-                line_count += 1
-            
-            # Draw major grid lines every 5 grid units
-            major_grid = effective_grid_size * 5
-            major_start_x = (int(min_x) // int(major_grid)) * int(major_grid)
-            major_start_y = (int(min_y) // int(major_grid)) * int(major_grid)
-            
-            x = major_start_x
-            line_count = 0
-            while x <= max_x and line_count < max_lines // 5:
-                self.create_line(
-                    int(x), int(min_y), int(x), int(max_y),
-                    fill='#b0b0b0',
-                    width=max(1, int(self.scale)),
-                    tags="grid_major"
-                )
-                x += major_grid
-                line_count += 1
-            
-            y = major_start_y
-            line_count = 0
-            while y <= max_y and line_count < max_lines // 5:
-                self.create_line(
-                    int(min_x), int(y), int(max_x), int(y),
-                    fill='#b0b0b0',
-                    width=max(1, int(self.scale)),
-                    tags="grid_major"
-                )
-                y += major_grid
-                line_count += 1
-        except Exception as e:
+            image = self.get_grid_image(width, height)
+            self._grid_item = self.create_image(0, 0, image=image, anchor="nw", tags="grid")
+            self.position_grid()
+            self.tag_lower("grid")
+        except tk.TclError:
             # Silently fail if grid drawing has issues (don't break the app)
-            pass
+            self._grid_item = None
+    
+    def request_redraw(self, reason: str = REDRAW_FULL, topic_ids=None):
+        """Mark part of the canvas dirty and schedule a single coalesced redraw"""
+        self.redraw_requests += 1
+        self._request_times.append(time.perf_counter())
+        self._dirty_reasons.add(reason)
+        if reason == REDRAW_EDGES and topic_ids:
+            self._dirty_edge_topics.update(topic_ids)
+        if self._redraw_after_id is None:
+            self._redraw_after_id = self.after(self.REDRAW_INTERVAL_MS, self._flush_redraw)
+    
+    def _flush_redraw(self):
+        """Perform the minimum work needed for all redraws requested this frame"""
+        self._redraw_after_id = None
+        reasons = self._dirty_reasons
+        edge_topics = self._dirty_edge_topics
+        self._dirty_reasons = set()
+        self._dirty_edge_topics = set()
+        
+        if REDRAW_FULL in reasons:
+            self.redraw()
+        else:
+            self.redraws_executed += 1
+            with perf.span("canvas.partial_redraw", reasons=sorted(reasons)):
+                if REDRAW_EDGES in reasons:
+                    self.redraw_connections(edge_topics)
+                if REDRAW_SELECTION in reasons:
+                    self.update_selection_styles()
+                if REDRAW_VIEW in reasons:
+                    self.update_grid()
+                    self.refit_visible_labels()
+            self.draw_perf_overlay()
+        
+        for listener in self.view_listeners:
+            listener()
+    
+    def redraw_connections(self, topic_ids):
+        """Redraw only the connections touching the given topics"""
+        edges = set()
+        for topic_id in topic_ids:
+            for item in self.find_withtag(f"out:{topic_id}") + self.find_withtag(f"in:{topic_id}"):
+                # Bundles touching a moved node fall apart into plain edges until re-bundled
+                edges.update(self._edge_items.pop(item, []))
+                self.delete(item)
+        
+        for from_id, to_id, count in edges:
+            self.draw_connection(from_id, to_id, count)
+        # Keep connections between the grid and the nodes
+        if self._node_rects:
+            self.tag_lower("connection", "node")
+            self.tag_lower("connection_label", "node")
+    
+    def update_selection_styles(self):
+        """Restyle nodes whose selection state changed since they were drawn"""
+        selected = set(self.graph_manager.selected_nodes)
+        for topic_id in selected ^ self._drawn_selection:
+            rect = self._node_rects.get(topic_id)
+            if rect is None:
+                continue
+            self.itemconfigure(rect, **self.node_style(topic_id, topic_id in selected))
+        self._drawn_selection = selected
+    
+    def toggle_perf_overlay(self):
+        """Toggle the performance overlay"""
+        self.show_perf_overlay = not self.show_perf_overlay
+        if self.show_perf_overlay:
+            # Edge totals are only collected while the overlay is shown
+            self.request_redraw(REDRAW_FULL)
+        self.draw_perf_overlay()
+    
+    def draw_perf_overlay(self):
+        """Show frame timings, item counts and culling stats in the top-left corner"""
+        self.delete("debug")
+        if not self.show_perf_overlay:
+            return
+        
+        now = time.perf_counter()
+        requests_per_second = sum(1 for t in self._request_times if now - t <= 1.0)
+        stats = self.draw_stats
+        lines = []
+        redraw = perf.latest.get("canvas.redraw")
+        partial = perf.latest.get("canvas.partial_redraw")
+        grid = perf.latest.get("canvas.draw_grid")
+        lines.append(
+            f"redraw: {redraw['ms'] if redraw else 0:.1f} ms"
+            f"  partial: {partial['ms'] if partial else 0:.1f} ms"
+            f"  grid: {grid['ms'] if grid else 0:.1f} ms"
+        )
+        lines.append(f"items: {len(self.find_all())}")
+        lines.append(f"nodes: {stats['nodes_drawn']} drawn / {stats['nodes_culled']} culled")
+        lines.append(f"edges: {stats['edges_drawn']} drawn / {stats['edges_culled']} culled")
+        lines.append(
+            f"requests: {requests_per_second}/s"
+            f"  ({self.redraws_executed} executed / {self.redraw_requests} requested)"
+        )
+        layout = perf.last("layout.")
+        if layout:
+            line = f"{layout['name']}: {layout['ms']:.0f} ms"
+            if layout.get("iterations"):
+                line += f" ({layout['ms'] / layout['iterations']:.2f} ms/iteration)"
+            lines.append(line)
+        
+        self.create_text(
+            self.canvasx(8), self.canvasy(8),
+            text="\n".join(lines),
+            anchor="nw",
+            font=("Courier", 9),
+            fill="#aa0000",
+            tags="debug"
+        )
     
     def redraw(self):
         """Redraw the entire canvas"""
+        with perf.span("canvas.redraw") as span:
+            self._redraw_all()
+            span.update(self.draw_stats)
+        self.draw_perf_overlay()
+    
+    def _redraw_all(self):
+        """Delete and recreate every item"""
+        self.redraws_executed += 1
+        
         # Use delete("all") - it's actually quite fast for Tkinter
         self.delete("all")
+        self._node_rects = {}
+        self._edge_items = {}
+        self._label_texts = {}
+        self._label_tiers = {}
+        self._drawn_selection = set(self.graph_manager.selected_nodes)
+        self._applied_zoom_styles = self.zoom_styles()
+        self._analysis_marks = None
+        if self.analysis is not None:
+            with perf.span("analysis.update"):
+                self._analysis_marks = (
+                    set(self.analysis.unreachable()),
+                    self.analysis.dead_ends,
+                    self.analysis.cycle_members(),
+                )
+        self._diff_marks = None
+        if self.diff is not None:
+            result = self.diff.diff()
+            self._diff_marks = (result.ids(DIFF_ADDED), result.ids(DIFF_CHANGED))
         
         # Draw grid first (background) - skip if canvas is too small
         try:
@@ -549,28 +1221,50 @@ class GraphCanvas(tk.Canvas):
             pass
         
         # Draw connections (behind nodes)
-        for topic_id in self.graph_manager.dialogue_graph.topics.keys():
-            connections = self.graph_manager.dialogue_graph.get_connections(topic_id)
-            for conn_id in connections:
-                if conn_id in self.graph_manager.dialogue_graph.topics:
-                    self.draw_connection(topic_id, conn_id)
+        self._edges_drawn = 0
+        self.draw_connections()
+        
+        # Draw nodes (on top) - positions are in world coordinates.
+        # Members of collapsed groups are skipped and drawn as one summary node.
+        groups = self.graph_manager.groups
+        topics_drawn = 0
+        visible = self.visible_positions()
+        for node_id, pos in visible.items():
+            group = groups.get_group(node_id)
+            if group is not None:
+                self.draw_group_node(group)
+            else:
+                self.draw_node(node_id, pos[0], pos[1])
+                topics_drawn += 1
         
-        # Draw nodes (on top) - positions are in world coordinates
-        for topic_id, pos in self.graph_manager.node_positions.items():
-            self.draw_node(topic_id, pos[0], pos[1])
+        graph = self.graph_manager.dialogue_graph
+        edges_total = self._edges_drawn
+        if self.show_perf_overlay:
+            edges_total = sum(len(graph.get_successors(topic_id)) for topic_id in graph.topics)
+        self.draw_stats = {
+            "nodes_drawn": len(visible),
+            "nodes_culled": len(graph.topics) - topics_drawn,
+            "edges_drawn": self._edges_drawn,
+            "edges_culled": max(0, edges_total - self._edges_drawn),
+        }
         
         # Update scroll region based on content
         # Note: We update the scrollregion, but the scroll commands (h_scroll_command/v_scroll_command)
         # no longer trigger redraws, so this won't cause feedback loops
         try:
-            bbox = self.bbox("all")
+            # Exclude the grid, which always extends past the visible area
+            bbox = self.bbox("node", "connection")
             if bbox:
                 # Add padding for scrolling
                 padding = 100
                 min_x, min_y, max_x, max_y = bbox
+                # Keep the current view inside the region so a redraw never moves it
+                view_x1, view_y1 = self.canvasx(0), self.canvasy(0)
+                view_x2 = view_x1 + self.winfo_width()
+                view_y2 = view_y1 + self.winfo_height()
                 self.configure(scrollregion=(
-                    min_x - padding, min_y - padding,
-                    max_x + padding, max_y + padding
+                    min(min_x - padding, view_x1), min(min_y - padding, view_y1),
+                    max(max_x + padding, view_x2), max(max_y + padding, view_y2)
                 ))
             else:
                 # Default scroll region
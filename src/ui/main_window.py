@@ -1,17 +1,23 @@
 """Main application window"""
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
 from ..models.dialogue import DialogueGraph, DialogueTopic
 from ..graph.graph_manager import GraphManager
+from ..graph.analysis import GraphAnalysis
+from ..graph.grouping import GroupedLayoutView
+from ..graph.history import RenameTopic, UndoHistory
 from ..graph.layout import LayoutManager
+from ..graph.search import SearchIndex
 from ..parsers.json_parser import JSONParser
-from ..parsers.validator import Validator
-from .graph_canvas import GraphCanvas
+from ..parsers.validator import IncrementalValidator
+from ..utils.profiling import profiler
+from .graph_canvas import GraphCanvas, REDRAW_SELECTION
+from .minimap import Minimap
 from .property_editor import PropertyEditor
 from .toolbar import Toolbar, create_menu_bar
-from .help_dialog import HelpDialog
 
 
 class MainWindow(tk.Tk):
@@ -26,7 +32,23 @@ class MainWindow(tk.Tk):
         # Initialize data
         self.dialogue_graph = DialogueGraph()
         self.graph_manager = GraphManager(self.dialogue_graph)
+        # Follows edits, so validating again only re-checks what changed
+        self.validator = IncrementalValidator(self.dialogue_graph)
+        self.analysis = None  # Reachability analysis, while its highlights are shown
+        self.diff = None  # Differences from the last save, while they are shown
+        # Built on first search, then kept current as topics change
+        self.search_index = SearchIndex(self.dialogue_graph)
+        self.search_panel = None
+        self.replace_dialog = None
+        # Undo steps for topic edits, renames, replacements and node drags
+        self.history = UndoHistory()
+        # What the last export wrote; exports run on a worker thread from a snapshot
+        self.saved_snapshot = None
+        self.current_file = None  # Last file imported or exported
+        self._export_thread = None
         self.layout_manager = LayoutManager()
+        self._layout_view = None
+        self.neighbourhood_hops = 2
         
         # Navigation history for back button
         self.navigation_history = []
@@ -49,9 +71,24 @@ class MainWindow(tk.Tk):
             on_zoom_out=self.zoom_out,
             on_zoom_reset=self.zoom_reset,
             on_help=self.show_help,
-            on_back=self.navigate_back
+            on_back=self.navigate_back,
+            on_bundle=self.toggle_edge_bundling,
+            on_export_image=self.export_image,
+            on_neighbourhood=self.toggle_neighbourhood,
+            on_neighbourhood_hops=self.set_neighbourhood_hops,
+            on_analyze=self.toggle_analysis,
+            on_simulate=self.show_simulator,
+            on_search=self.show_search,
+            on_undo=self.undo,
+            on_redo=self.redo,
+            on_diff=self.toggle_diff
         )
         toolbar.pack(fill="x", padx=5, pady=5)
+        self.bind("<Control-f>", lambda e: self.show_search())
+        self.bind("<Control-h>", lambda e: self.show_replace())
+        self.bind("<Control-z>", lambda e: self.undo())
+        self.bind("<Control-y>", lambda e: self.redo())
+        self.bind("<Control-Z>", lambda e: self.redo())  # Ctrl+Shift+Z
         
         # Main content area
         main_paned = ttk.PanedWindow(self, orient="horizontal")
@@ -66,8 +103,10 @@ class MainWindow(tk.Tk):
             canvas_frame,
             self.graph_manager,
             on_node_select=self.on_node_select,
-            on_mouse_move=self.on_canvas_mouse_move
+            on_mouse_move=self.on_canvas_mouse_move,
+            history=self.history
         )
+        self.graph_canvas.on_analysis_change = self.show_analysis_status
         self.graph_canvas.grid(row=0, column=0, sticky="nsew")
         self.graph_canvas.focus_set()  # Allow canvas to receive focus for mouse wheel
         
@@ -85,6 +124,11 @@ class MainWindow(tk.Tk):
         canvas_frame.grid_rowconfigure(0, weight=1)
         canvas_frame.grid_columnconfigure(0, weight=1)
         
+        # Minimap overview in the bottom-right corner of the canvas
+        self.minimap = Minimap(canvas_frame, self.graph_canvas, self.graph_manager)
+        self.minimap.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor="se")
+        self.graph_canvas.view_listeners.append(self.minimap.update_viewport)
+        
         # Hide scrollbars: do not grid them
         
         # Property editor
@@ -95,7 +139,9 @@ class MainWindow(tk.Tk):
             editor_frame,
             self.graph_manager,
             on_change=self.on_graph_change,
-            on_node_select=self.on_node_select
+            on_node_select=self.on_node_select,
+            on_rename=self.rename_topic,
+            history=self.history
         )
         self.property_editor.pack(fill="both", expand=True)
         
@@ -137,8 +183,12 @@ class MainWindow(tk.Tk):
         # Update property editor
         self.property_editor.load_topic(topic_id)
         
-        # Redraw canvas to show selection
-        self.graph_canvas.redraw()
+        # Neighbourhood view follows the selection (including back navigation)
+        if topic_id and self.graph_canvas.neighbourhood is not None and topic_id in self.dialogue_graph.topics:
+            self.graph_canvas.show_neighbourhood(topic_id, self.neighbourhood_hops)
+        
+        # Restyle canvas to show selection
+        self.graph_canvas.request_redraw(REDRAW_SELECTION)
         
         if topic_id:
             self.status_var.set(f"Selected: {topic_id}")
@@ -154,8 +204,17 @@ class MainWindow(tk.Tk):
     
     def on_graph_change(self):
         """Handle graph changes"""
-        self.graph_canvas.redraw()
-        self.status_var.set("Graph updated")
+        self.graph_canvas.invalidate_bundles()
+        # Edited text may change node widths
+        self.graph_manager.invalidate_node_size()
+        self.graph_canvas.refresh_neighbourhood()
+        self.graph_canvas.request_redraw()
+        if self.analysis is not None:
+            self.status_var.set(f"Graph updated - {self.analysis.summary()}")
+        elif self.diff is not None:
+            self.show_diff_status()
+        else:
+            self.status_var.set("Graph updated")
     
     def show_import_dialog(self, filename=None):
         """Show import file dialog or use provided filename"""
@@ -187,16 +246,40 @@ class MainWindow(tk.Tk):
     def import_file(self, filename):
         """Import dialogue file"""
         try:
-            self.dialogue_graph = JSONParser.parse_file(filename)
+            with profiler.profile("import"):
+                self.dialogue_graph = JSONParser.parse_file(filename)
+            self.validator.close()
+            self.validator = IncrementalValidator(self.dialogue_graph)
+            if self.analysis is not None:
+                self.analysis.close()
+                self.analysis = GraphAnalysis(self.dialogue_graph)
+                self.graph_canvas.analysis = self.analysis
+            self.search_index.close()
+            self.search_index = SearchIndex(self.dialogue_graph)
+            # Index in the background so the first search does not wait
+            self.search_index.start_build()
+            if self.search_panel is not None:
+                self.search_panel.set_index(self.search_index)
+            if self.replace_dialog is not None and self.replace_dialog.dialog.winfo_exists():
+                # Its preview and undo refer to the old graph
+                self.replace_dialog.dialog.destroy()
+            self.history.clear()
+            self.saved_snapshot = None
+            self.current_file = filename
+            if self.diff is not None:
+                self.toggle_diff()
             self.graph_manager = GraphManager(self.dialogue_graph)
             self.graph_canvas.graph_manager = self.graph_manager
+            if self.graph_canvas.neighbourhood is not None:
+                self.toggle_neighbourhood()
             self.property_editor.graph_manager = self.graph_manager
+            self.minimap.set_graph_manager(self.graph_manager)
             
             # Apply initial layout
             self.apply_auto_layout()
             
             # Refresh canvas
-            self.graph_canvas.redraw()
+            self.graph_canvas.request_redraw()
             
             self.status_var.set(f"Imported: {filename}")
             messagebox.showinfo("Success", f"Imported {len(self.dialogue_graph.topics)} topics")
@@ -208,7 +291,8 @@ class MainWindow(tk.Tk):
         """Export dialogue file"""
         try:
             # Validate before export
-            errors = Validator.validate_graph(self.dialogue_graph)
+            with profiler.profile("validate"):
+                errors = self.validator.validate()
             if errors:
                 msg = "Validation errors found:\n\n" + "\n".join(errors[:10])
                 if len(errors) > 10:
@@ -220,13 +304,69 @@ class MainWindow(tk.Tk):
                 if not response:
                     return
             
-            JSONParser.export_file(self.dialogue_graph, filename)
-            self.status_var.set(f"Exported: {filename}")
-            messagebox.showinfo("Success", f"Exported {len(self.dialogue_graph.topics)} topics")
+            if self._export_thread is not None:
+                messagebox.showinfo("Export", "An export is still being written")
+                return
+            # The worker writes a frozen copy, so editing can go on meanwhile
+            snapshot = self.dialogue_graph.snapshot()
+            result = {}
+            
+            def work():
+                try:
+                    with profiler.profile("export"):
+                        JSONParser.export_file(snapshot, filename)
+                except Exception as e:
+                    result["error"] = e
+            
+            # Not a daemon thread, so closing the window lets the file finish
+            self._export_thread = threading.Thread(target=work)
+            self._export_thread.start()
+            self.status_var.set(f"Exporting: {filename}")
+            self.after(50, lambda: self._poll_export(snapshot, filename, result))
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export file:\n{str(e)}")
             self.status_var.set("Export failed")
     
+    def _poll_export(self, snapshot, filename, result):
+        """Report a finished export on the Tk thread"""
+        if self._export_thread.is_alive():
+            self.after(50, lambda: self._poll_export(snapshot, filename, result))
+            return
+        self._export_thread = None
+        if "error" in result:
+            messagebox.showerror("Export Error", f"Failed to export file:\n{str(result['error'])}")
+            self.status_var.set("Export failed")
+            return
+        self.saved_snapshot = snapshot
+        self.current_file = filename
+        if self.diff is not None:
+            # Compare with what was just saved
+            self.diff.close()
+            self.diff = None
+            self.toggle_diff()
+        self.status_var.set(f"Exported: {filename}")
+        messagebox.showinfo("Success", f"Exported {len(snapshot.topics)} topics")
+    
+    def export_image(self, filename):
+        """Export the graph view as SVG, PNG or PostScript (chosen by extension)"""
+        from ..render import build_scene, SVGWriter, PNGWriter
+        
+        try:
+            extension = filename.lower().rsplit(".", 1)[-1]
+            with profiler.profile("export"):
+                if extension == "ps":
+                    self.graph_canvas.export_postscript(filename)
+                else:
+                    scene = build_scene(self.graph_manager, bundle_edges=self.graph_canvas.bundle_edges)
+                    if extension == "png":
+                        PNGWriter.write(scene, filename)
+                    else:
+                        SVGWriter.write(scene, filename)
+            self.status_var.set(f"Exported image: {filename}")
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export image:\n{str(e)}")
+            self.status_var.set("Image export failed")
+    
     def add_new_topic(self):
         """Add a new topic"""
         topic_id = simpledialog.askstring(
@@ -248,7 +388,7 @@ class MainWindow(tk.Tk):
             
             # Position new node
             self.layout_manager.grid_layout(self.graph_manager, 1000, 800)
-            self.graph_canvas.redraw()
+            self.graph_canvas.request_redraw()
             
             # Select the new node
             self.graph_manager.select_node(topic_id)
@@ -258,7 +398,8 @@ class MainWindow(tk.Tk):
     
     def validate_dialogue(self):
         """Validate dialogue"""
-        errors = Validator.validate_graph(self.dialogue_graph)
+        with profiler.profile("validate"):
+            errors = self.validator.validate()
         
         if not errors:
             messagebox.showinfo("Validation", "No errors found!")
@@ -276,10 +417,27 @@ class MainWindow(tk.Tk):
             messagebox.showinfo("Info", "No topics to layout")
             return
         
-        self.layout_manager.force_directed_layout(self.graph_manager)
-        self.graph_canvas.redraw()
+        with profiler.profile("layout"):
+            self.layout_manager.force_directed_layout(self.layout_target())
+            self.apply_layout_target()
+        self.graph_canvas.request_redraw()
         self.status_var.set("Layout applied")
     
+    def layout_target(self):
+        """Get what layouts should move: the graph, or a view with collapsed groups as single nodes"""
+        if self.graph_manager.groups.has_collapsed():
+            self._layout_view = GroupedLayoutView(self.graph_manager.groups)
+            return self._layout_view
+        self._layout_view = None
+        return self.graph_manager
+    
+    def apply_layout_target(self):
+        """Write positions from a grouped layout view back to the graph"""
+        if self._layout_view is not None:
+            self._layout_view.apply()
+            self._layout_view = None
+            self.graph_canvas.invalidate_bundles()
+    
     def apply_untangle_layout(self):
         """Apply untangle layout to improve graph appearance"""
         if not self.dialogue_graph.topics:
@@ -290,8 +448,10 @@ class MainWindow(tk.Tk):
         canvas_width = max(1000, self.graph_canvas.winfo_width())
         canvas_height = max(800, self.graph_canvas.winfo_height())
         
-        self.layout_manager.untangle_layout(self.graph_manager, canvas_width, canvas_height)
-        self.graph_canvas.redraw()
+        with profiler.profile("layout"):
+            self.layout_manager.untangle_layout(self.layout_target(), canvas_width, canvas_height)
+            self.apply_layout_target()
+        self.graph_canvas.request_redraw()
         self.status_var.set("Graph untangled")
     
     def zoom_in(self):
@@ -309,7 +469,185 @@ class MainWindow(tk.Tk):
         self.graph_canvas.zoom_reset()
         self.status_var.set("Zoom: 100%")
     
+    def toggle_edge_bundling(self):
+        """Toggle bundling of edges into hub topics"""
+        self.graph_canvas.toggle_edge_bundling()
+        state = "on" if self.graph_canvas.bundle_edges else "off"
+        self.status_var.set(f"Edge bundling {state}")
+    
+    def toggle_analysis(self):
+        """Toggle highlighting of unreachable topics, topics without exits and cycles"""
+        if self.analysis is not None:
+            self.analysis.close()
+            self.analysis = None
+            self.graph_canvas.analysis = None
+            self.graph_canvas.request_redraw()
+            self.status_var.set("Analysis off")
+            return
+        
+        self.analysis = GraphAnalysis(self.dialogue_graph)
+        self.graph_canvas.analysis = self.analysis
+        self.graph_canvas.request_redraw()
+        self.show_analysis_status()
+    
+    def show_analysis_status(self):
+        """Show the analysis results in the status bar"""
+        if self.analysis is not None:
+            self.status_var.set(f"Analysis: {self.analysis.summary()}")
+    
+    def toggle_diff(self):
+        """Toggle colouring of topics added or changed since the last save (export, or else import)"""
+        if self.diff is not None:
+            self.diff.close()
+            self.diff = None
+            self.graph_canvas.diff = None
+            self.graph_canvas.request_redraw()
+            self.status_var.set("Diff off")
+            return
+        
+        if self.saved_snapshot is not None:
+            baseline = self.saved_snapshot
+        elif self.current_file is not None:
+            try:
+                baseline = JSONParser.parse_file(self.current_file)
+            except Exception as e:
+                messagebox.showerror("Diff Error", f"Failed to read {self.current_file}:\n{str(e)}")
+                return
+        else:
+            messagebox.showinfo("Info", "Import or export a file to compare with")
+            return
+        from ..graph.diff import LiveDiff
+        self.diff = LiveDiff(baseline, self.dialogue_graph)
+        self.graph_canvas.diff = self.diff
+        self.graph_canvas.request_redraw()
+        self.show_diff_status()
+    
+    def show_diff_status(self):
+        """Show the differences from the last save in the status bar"""
+        if self.diff is not None:
+            self.status_var.set(f"Changes since {self.current_file}: {self.diff.summary()}")
+    
+    def show_simulator(self):
+        """Play through the conversation from the selected topic (or the NPC's first topic)"""
+        topic_id = next(iter(self.graph_manager.selected_nodes), None)
+        if topic_id not in self.dialogue_graph.topics:
+            topic_id = next((entry for entry in self.dialogue_graph.entry_points if entry in self.dialogue_graph.topics), None)
+        if topic_id is None:
+            messagebox.showinfo("Info", "Select a topic to start the conversation from")
+            return
+        from .simulator_window import SimulatorWindow
+        SimulatorWindow(self, self.dialogue_graph, topic_id, on_topic=self.focus_topic)
+    
+    def show_search(self):
+        """Open the search panel, or bring it to the front"""
+        if self.search_panel is not None and self.search_panel.dialog.winfo_exists():
+            self.search_panel.dialog.lift()
+            self.search_panel.query_entry.focus_set()
+            return
+        from .search_panel import SearchPanel
+        self.search_panel = SearchPanel(self, self.search_index, on_topic=self.focus_topic, on_replace=self.show_replace)
+    
+    def show_replace(self, find: str = ""):
+        """Open the find-and-replace dialog"""
+        from ..graph.replace import BulkReplace
+        from .replace_dialog import ReplaceDialog
+        if self.replace_dialog is not None and self.replace_dialog.dialog.winfo_exists():
+            self.replace_dialog.dialog.destroy()
+        self.replace_dialog = ReplaceDialog(
+            self, BulkReplace(self.dialogue_graph, self.search_index), self.history, on_change=self.follow_renames, find=find
+        )
+    
+    def rename_topic(self, old_id: str, new_id: str):
+        """Rename a topic, rewriting the responses that lead to it"""
+        try:
+            command = self.history.execute(RenameTopic(self.dialogue_graph, old_id, new_id))
+        except ValueError as e:
+            messagebox.showerror("Rename Error", str(e))
+            return
+        self.follow_renames({old_id: new_id})
+        self.status_var.set(f"Renamed {old_id} to {new_id} ({len(command.rewritten)} topics lead to it)")
+    
+    def undo(self):
+        """Revert the last edit, rename, replacement or drag"""
+        if not self.history.can_undo:
+            self.status_var.set("Nothing to undo")
+            return
+        try:
+            command = self.history.undo()
+        except ValueError as e:
+            messagebox.showerror("Undo Error", f"The last edit cannot be undone, so the undo history was cleared:\n{e}")
+            return
+        self.follow_renames({new: old for old, new in command.renames.items()})
+        self.status_var.set(f"Undid {command.label}")
+    
+    def redo(self):
+        """Make the last undone edit again"""
+        if not self.history.can_redo:
+            self.status_var.set("Nothing to redo")
+            return
+        try:
+            command = self.history.redo()
+        except ValueError as e:
+            messagebox.showerror("Redo Error", str(e))
+            return
+        self.follow_renames(command.renames)
+        self.status_var.set(f"Redid {command.label}")
+    
+    def follow_renames(self, renames):
+        """Carry positions, selection, history and entry points over to renamed topics and refresh the views"""
+        self.graph_manager.rename_nodes(renames)
+        self.navigation_history = [renames.get(topic_id, topic_id) for topic_id in self.navigation_history]
+        if self.analysis is not None and self.analysis.custom_entry_points is not None:
+            self.analysis.set_entry_points(renames.get(topic_id, topic_id) for topic_id in self.analysis.custom_entry_points)
+        neighbourhood = self.graph_canvas.neighbourhood
+        if neighbourhood is not None and neighbourhood.center in renames:
+            neighbourhood.center = renames[neighbourhood.center]
+        current = self.property_editor.current_topic_id
+        self.property_editor.load_topic(renames.get(current, current))
+        self.on_graph_change()
+    
+    def focus_topic(self, topic_id: str):
+        """Select and center a topic (followed by the simulator and search panel)"""
+        self.on_node_select(topic_id)
+        position = self.graph_canvas.node_position(topic_id)
+        if position is not None:
+            self.graph_canvas.center_on(*position)
+    
+    def toggle_neighbourhood(self):
+        """Toggle between the whole graph and the neighbourhood of the selected topic"""
+        if self.graph_canvas.neighbourhood is not None:
+            self.graph_canvas.clear_neighbourhood()
+            self.minimap.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor="se")
+            self.status_var.set("Showing whole graph")
+            return
+        
+        topic_id = next(iter(self.graph_manager.selected_nodes), None)
+        if topic_id is None or topic_id not in self.dialogue_graph.topics:
+            messagebox.showinfo("Info", "Select a topic to show its neighbourhood")
+            return
+        self.graph_canvas.show_neighbourhood(topic_id, self.neighbourhood_hops)
+        # The minimap shows whole-graph coordinates, which do not apply here
+        self.minimap.place_forget()
+        self.status_var.set(self.neighbourhood_status())
+    
+    def set_neighbourhood_hops(self, hops: int):
+        """Change how many hops the neighbourhood view shows"""
+        self.neighbourhood_hops = hops
+        neighbourhood = self.graph_canvas.neighbourhood
+        if neighbourhood is not None and neighbourhood.center:
+            self.graph_canvas.show_neighbourhood(neighbourhood.center, hops)
+            self.status_var.set(self.neighbourhood_status())
+    
+    def neighbourhood_status(self) -> str:
+        """Describe the current neighbourhood view for the status bar"""
+        neighbourhood = self.graph_canvas.neighbourhood
+        status = f"Neighbourhood of {neighbourhood.center}: {len(neighbourhood.positions)} topics within {neighbourhood.hops} hops"
+        if neighbourhood.truncated:
+            status += f" (limited to {neighbourhood.max_nodes})"
+        return status
+    
     def show_help(self):
         """Show help dialog"""
+        from .help_dialog import HelpDialog
         HelpDialog(self)
 
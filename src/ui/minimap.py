@@ -0,0 +1,192 @@
+"""Minimap overview of the whole dialogue graph"""
+
+import tkinter as tk
+from typing import Dict, Optional, Tuple
+
+from ..graph.graph_manager import GraphManager
+
+
+class Minimap(tk.Canvas):
+    """Overview panel rendering every node as a point in a low-resolution image"""
+    
+    # Node positions are binned into a coarse cell grid drawn into one PhotoImage,
+    # so the cost does not depend on canvas items. Moving a node only repaints
+    # the cells it left and entered.
+    
+    WIDTH = 200
+    HEIGHT = 150
+    CELL_SIZE = 2  # Pixels per cell side
+    MARGIN = 200  # World units of padding around the graph bounds
+    BG_COLOR = '#ffffff'
+    NODE_COLOR = '#4A90E2'
+    DENSE_COLOR = '#2E5C8A'
+    VIEWPORT_COLOR = '#d04040'
+    
+    def __init__(self, parent, graph_canvas, graph_manager: GraphManager):
+        super().__init__(
+            parent,
+            width=self.WIDTH,
+            height=self.HEIGHT,
+            bg=self.BG_COLOR,
+            highlightthickness=1,
+            highlightbackground='#888888',
+            cursor="fleur"
+        )
+        self.graph_canvas = graph_canvas
+        self.graph_manager: Optional[GraphManager] = None
+        
+        self.cols = self.WIDTH // self.CELL_SIZE
+        self.rows = self.HEIGHT // self.CELL_SIZE
+        self.image = tk.PhotoImage(width=self.WIDTH, height=self.HEIGHT)
+        self.create_image(0, 0, image=self.image, anchor="nw")
+        self.viewport_item = self.create_rectangle(0, 0, 0, 0, outline=self.VIEWPORT_COLOR, width=2)
+        
+        # World bounds mapped onto the image and per-cell node counts
+        self.bounds: Tuple[float, float, float, float] = (0.0, 0.0, 1.0, 1.0)
+        self.cell_counts = [0] * (self.cols * self.rows)
+        self.node_cells: Dict[str, int] = {}
+        
+        # Nodes moved since the last repaint
+        self._pending = set()
+        self._flush_after_id = None
+        
+        self.bind("<Button-1>", self.on_drag)
+        self.bind("<B1-Motion>", self.on_drag)
+        
+        self.set_graph_manager(graph_manager)
+    
+    def set_graph_manager(self, graph_manager: GraphManager):
+        """Track a (new) graph manager and rebuild the overview"""
+        if self.graph_manager is not None:
+            self.graph_manager.remove_position_listener(self.on_position_change)
+        self.graph_manager = graph_manager
+        graph_manager.add_position_listener(self.on_position_change)
+        self.rebuild()
+    
+    def on_position_change(self, topic_id: str):
+        """Remember a moved node and repaint on the next idle"""
+        self._pending.add(topic_id)
+        if self._flush_after_id is None:
+            self._flush_after_id = self.after_idle(self.flush)
+    
+    def flush(self):
+        """Repaint the cells touched by nodes moved since the last flush"""
+        self._flush_after_id = None
+        pending = self._pending
+        self._pending = set()
+        
+        # Bulk moves (layouts) are cheaper to redo from scratch
+        if len(pending) > max(64, len(self.node_cells) // 4):
+            self.rebuild()
+            return
+        
+        dirty_cells = set()
+        for topic_id in pending:
+            pos = self.graph_manager.get_node_position(topic_id)
+            if pos is not None and not self._in_bounds(pos):
+                # Graph grew past the mapped area - remap everything
+                self.rebuild()
+                return
+            
+            old_cell = self.node_cells.pop(topic_id, None)
+            if old_cell is not None:
+                self.cell_counts[old_cell] -= 1
+                dirty_cells.add(old_cell)
+            if pos is not None:
+                cell = self._cell_for(pos)
+                self.node_cells[topic_id] = cell
+                self.cell_counts[cell] += 1
+                dirty_cells.add(cell)
+        
+        for cell in dirty_cells:
+            row, col = divmod(cell, self.cols)
+            x = col * self.CELL_SIZE
+            y = row * self.CELL_SIZE
+            self.image.put(self._cell_color(self.cell_counts[cell]), to=(x, y, x + self.CELL_SIZE, y + self.CELL_SIZE))
+        self.update_viewport()
+    
+    def rebuild(self):
+        """Recompute bounds and repaint the whole image in one call"""
+        positions = self.graph_manager.node_positions if self.graph_manager else {}
+        if positions:
+            xs = [pos[0] for pos in positions.values()]
+            ys = [pos[1] for pos in positions.values()]
+            self.bounds = (
+                min(xs) - self.MARGIN, min(ys) - self.MARGIN,
+                max(xs) + self.MARGIN, max(ys) + self.MARGIN
+            )
+        else:
+            self.bounds = (0.0, 0.0, 1.0, 1.0)
+        
+        # Bin every node with the mapping hoisted out of the loop (hot path at 20k nodes)
+        min_x, min_y = self.bounds[0], self.bounds[1]
+        # The bounds include a margin, so no clamping is needed here
+        cell_scale = self._scale() / self.CELL_SIZE
+        cols = self.cols
+        counts = [0] * (self.cols * self.rows)
+        node_cells = {}
+        for topic_id, (x, y) in positions.items():
+            cell = int((y - min_y) * cell_scale) * cols + int((x - min_x) * cell_scale)
+            node_cells[topic_id] = cell
+            counts[cell] += 1
+        self.cell_counts = counts
+        self.node_cells = node_cells
+        
+        # Build the image as rows of colors: cost depends on image size, not node count
+        image_rows = []
+        for row in range(self.rows):
+            counts = self.cell_counts[row * self.cols:(row + 1) * self.cols]
+            pixels = " ".join(self._cell_color(count) for count in counts for _ in range(self.CELL_SIZE))
+            line = "{" + pixels + "}"
+            image_rows.extend([line] * self.CELL_SIZE)
+        self.image.put(" ".join(image_rows), to=(0, 0))
+        self.update_viewport()
+    
+    def update_viewport(self):
+        """Move the viewport rectangle to match the main canvas view"""
+        canvas = self.graph_canvas
+        left, top = canvas.screen_to_world(0, 0)
+        right, bottom = canvas.screen_to_world(canvas.winfo_width(), canvas.winfo_height())
+        x1, y1 = self.world_to_minimap(left, top)
+        x2, y2 = self.world_to_minimap(right, bottom)
+        self.coords(self.viewport_item, x1, y1, x2, y2)
+    
+    def world_to_minimap(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert world coordinates to minimap pixels"""
+        min_x, min_y, max_x, max_y = self.bounds
+        scale = self._scale()
+        return ((x - min_x) * scale, (y - min_y) * scale)
+    
+    def minimap_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        """Convert minimap pixels to world coordinates"""
+        min_x, min_y, max_x, max_y = self.bounds
+        scale = self._scale()
+        return (x / scale + min_x, y / scale + min_y)
+    
+    def on_drag(self, event):
+        """Center the main view on the clicked or dragged-to point"""
+        world_x, world_y = self.minimap_to_world(event.x, event.y)
+        self.graph_canvas.center_on(world_x, world_y)
+    
+    def _scale(self) -> float:
+        """Uniform world-to-minimap scale that fits the bounds"""
+        min_x, min_y, max_x, max_y = self.bounds
+        return min(self.WIDTH / max(1.0, max_x - min_x), self.HEIGHT / max(1.0, max_y - min_y))
+    
+    def _in_bounds(self, pos: Tuple[float, float]) -> bool:
+        """Check if a world position lies inside the mapped area"""
+        min_x, min_y, max_x, max_y = self.bounds
+        return min_x <= pos[0] <= max_x and min_y <= pos[1] <= max_y
+    
+    def _cell_for(self, pos: Tuple[float, float]) -> int:
+        """Get the cell index for a world position"""
+        x, y = self.world_to_minimap(pos[0], pos[1])
+        col = min(self.cols - 1, max(0, int(x) // self.CELL_SIZE))
+        row = min(self.rows - 1, max(0, int(y) // self.CELL_SIZE))
+        return row * self.cols + col
+    
+    def _cell_color(self, count: int) -> str:
+        """Color for a cell holding the given number of nodes"""
+        if count == 0:
+            return self.BG_COLOR
+        return self.NODE_COLOR if count < 4 else self.DENSE_COLOR
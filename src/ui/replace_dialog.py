@@ -0,0 +1,177 @@
+"""Window for previewing and applying a find-and-replace across all topics"""
+
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from ..graph.history import ReplaceEdit
+from ..graph.replace import KIND_EFFECT, KIND_TEXT, KIND_TOPIC_ID, KIND_VAR
+
+
+# Replacement kinds in display order
+KIND_LABELS = {
+    KIND_TEXT: "Text",
+    KIND_TOPIC_ID: "Topic IDs",
+    KIND_VAR: "Var names",
+    KIND_EFFECT: "Effect IDs",
+}
+
+MAX_PREVIEW_CHANGES = 2000  # Changes written out in the preview; all of them are applied
+
+
+class ReplaceDialog:
+    """Previews every change a replacement makes as a diff, then applies or reverts it in one undo step"""
+    
+    def __init__(self, parent, bulk_replace, history, on_change=None, find: str = ""):
+        self.bulk_replace = bulk_replace
+        self.history = history  # Undo history the replacement is recorded in
+        self.on_change = on_change  # Called with the old-to-new topic IDs after applying or reverting
+        self.transaction = None  # Previewed changes
+        self.applied = None  # Undo step of the last applied changes, until reverted
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Replace")
+        self.dialog.transient(parent)
+        self.dialog.geometry("760x560")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.dialog.destroy)
+        
+        self.create_widgets()
+        self.find_var.set(find)
+        self.find_entry.focus_set()
+    
+    def create_widgets(self):
+        """Create find and replace fields, options, diff preview and buttons"""
+        fields = ttk.Frame(self.dialog)
+        fields.pack(fill="x", padx=10, pady=(10, 5))
+        ttk.Label(fields, text="Find:").grid(row=0, column=0, sticky="w")
+        self.find_var = tk.StringVar()
+        self.find_entry = ttk.Entry(fields, textvariable=self.find_var)
+        self.find_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=2)
+        ttk.Label(fields, text="Replace with:").grid(row=1, column=0, sticky="w")
+        self.replace_var = tk.StringVar()
+        ttk.Entry(fields, textvariable=self.replace_var).grid(row=1, column=1, sticky="ew", padx=5, pady=2)
+        fields.grid_columnconfigure(1, weight=1)
+        
+        options = ttk.Frame(self.dialog)
+        options.pack(fill="x", padx=10)
+        self.kind_var = tk.StringVar(value=KIND_TEXT)
+        for kind, label in KIND_LABELS.items():
+            ttk.Radiobutton(options, text=label, variable=self.kind_var, value=kind, command=self.clear_preview).pack(side="left")
+        self.regex_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Regex", variable=self.regex_var, command=self.clear_preview).pack(side="left", padx=(15, 0))
+        self.case_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Match case", variable=self.case_var, command=self.clear_preview).pack(side="left")
+        
+        # Unified-diff style preview
+        preview_frame = ttk.Frame(self.dialog)
+        preview_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.preview = tk.Text(preview_frame, wrap="none", font=("Courier", 9), state="disabled")
+        v_scrollbar = ttk.Scrollbar(preview_frame, orient="vertical", command=self.preview.yview)
+        h_scrollbar = ttk.Scrollbar(preview_frame, orient="horizontal", command=self.preview.xview)
+        self.preview.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.preview.grid(row=0, column=0, sticky="nsew")
+        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        preview_frame.grid_rowconfigure(0, weight=1)
+        preview_frame.grid_columnconfigure(0, weight=1)
+        self.preview.tag_configure("header", foreground="#2E5C8A", font=("Courier", 9, "bold"))
+        self.preview.tag_configure("removed", foreground="#C0392B")
+        self.preview.tag_configure("added", foreground="#1E8449")
+        self.preview.tag_configure("conflict", foreground="#D35400")
+        
+        self.status_var = tk.StringVar(value="Preview to see what would change")
+        ttk.Label(self.dialog, textvariable=self.status_var).pack(fill="x", padx=10)
+        
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(pady=5)
+        ttk.Button(btn_frame, text="Preview", command=self.show_preview).pack(side="left", padx=5)
+        self.apply_button = ttk.Button(btn_frame, text="Apply", command=self.apply, state="disabled")
+        self.apply_button.pack(side="left", padx=5)
+        self.revert_button = ttk.Button(btn_frame, text="Undo Replace", command=self.revert, state="disabled")
+        self.revert_button.pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(side="left", padx=5)
+        
+        self.find_entry.bind("<Return>", lambda e: self.show_preview())
+        self.find_var.trace_add("write", lambda *args: self.clear_preview())
+        self.replace_var.trace_add("write", lambda *args: self.clear_preview())
+    
+    def clear_preview(self):
+        """Forget the preview once the query changes, so stale changes cannot be applied"""
+        self.transaction = None
+        self.apply_button.configure(state="disabled")
+    
+    def show_preview(self):
+        """Work out the changes and list them as a diff"""
+        try:
+            transaction = self.bulk_replace.preview(
+                self.kind_var.get(),
+                self.find_var.get(),
+                self.replace_var.get(),
+                regex=self.regex_var.get(),
+                case_sensitive=self.case_var.get()
+            )
+        except re.error as e:
+            self.status_var.set(f"Invalid regex: {e}")
+            return
+        
+        self.preview.configure(state="normal")
+        self.preview.delete("1.0", tk.END)
+        for conflict in transaction.conflicts:
+            self.preview.insert(tk.END, f"! {conflict}\n", "conflict")
+        for change in transaction.changes[:MAX_PREVIEW_CHANGES]:
+            self.preview.insert(tk.END, f"{change.topic_id}  {change.path}\n", "header")
+            self.preview.insert(tk.END, f"- {change.old}\n", "removed")
+            self.preview.insert(tk.END, f"+ {change.new}\n", "added")
+        if len(transaction.changes) > MAX_PREVIEW_CHANGES:
+            self.preview.insert(tk.END, f"... and {len(transaction.changes) - MAX_PREVIEW_CHANGES} more\n")
+        self.preview.configure(state="disabled")
+        
+        self.transaction = transaction
+        topics = len(transaction.topic_ids())
+        if transaction.conflicts:
+            self.status_var.set(f"{len(transaction.conflicts)} conflicts - nothing can be applied")
+        else:
+            self.status_var.set(f"{len(transaction.changes)} changes in {topics} topics")
+        can_apply = transaction.changes and not transaction.conflicts
+        self.apply_button.configure(state="normal" if can_apply else "disabled")
+    
+    def apply(self):
+        """Make the previewed changes"""
+        if self.transaction is None:
+            return
+        try:
+            self.applied = self.history.execute(ReplaceEdit(self.transaction))
+        except ValueError as e:
+            messagebox.showerror("Replace", f"Nothing was changed:\n{e}\n\nPreview again.", parent=self.dialog)
+            self.clear_preview()
+            return
+        self.clear_preview()
+        self.revert_button.configure(state="normal")
+        self.status_var.set(f"Applied {len(self.applied.transaction.changes)} changes")
+        if self.on_change:
+            self.on_change(self.applied.renames)
+    
+    def revert(self):
+        """Undo the last applied replacement"""
+        if self.applied is None:
+            return
+        if not self.applied.transaction.applied:
+            # Already undone from the main window
+            self.applied = None
+            self.revert_button.configure(state="disabled")
+            self.status_var.set("Replacement already undone")
+            return
+        if self.history.next_undo() is not self.applied:
+            messagebox.showerror("Replace", "Cannot undo after later edits - undo those first (Ctrl+Z)", parent=self.dialog)
+            return
+        try:
+            self.history.undo()
+        except ValueError as e:
+            messagebox.showerror("Replace", f"Cannot undo after later edits:\n{e}", parent=self.dialog)
+            return
+        renames = {new: old for old, new in self.applied.renames.items()}
+        self.applied = None
+        self.revert_button.configure(state="disabled")
+        self.status_var.set("Replacement undone")
+        if self.on_change:
+            self.on_change(renames)
@@ -0,0 +1,182 @@
+"""Window for searching topic text and jumping the canvas to matches"""
+
+import re
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from ..graph.search import (
+    FIELD_CONDITION, FIELD_EFFECT, FIELD_ID, FIELD_LINE, FIELD_RESPONSE, FIELD_TRUEFALSE, FIELD_VAR,
+    MAX_RESULTS, MIN_QUERY_LENGTH, MODE_PREFIX, MODE_REGEX, MODE_SUBSTRING
+)
+
+
+# Field checkboxes in display order
+FIELD_LABELS = {
+    FIELD_ID: "Topic IDs",
+    FIELD_LINE: "Lines",
+    FIELD_RESPONSE: "Responses",
+    FIELD_TRUEFALSE: "True/false text",
+    FIELD_CONDITION: "Condition keys",
+    FIELD_VAR: "Var names",
+    FIELD_EFFECT: "Effect IDs",
+}
+
+SEARCH_DELAY_MS = 150  # Wait after the last keystroke before searching
+INDEX_POLL_MS = 200  # Check this often whether the background index build is done
+SNIPPET_CONTEXT = 30  # Characters shown either side of a match
+
+
+class SearchPanel:
+    """Searches topic IDs, lines, responses, condition keys and names as you type and selects the matching topic"""
+    
+    def __init__(self, parent, search_index, on_topic=None, on_replace=None):
+        self.search_index = search_index
+        self.on_topic = on_topic  # Called with the topic of the chosen match
+        self.on_replace = on_replace  # Called with the query to open the replace dialog
+        self.matches = []
+        self._pending = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Search")
+        self.dialog.transient(parent)
+        self.dialog.geometry("720x480")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.create_widgets()
+        self.query_entry.focus_set()
+    
+    def create_widgets(self):
+        """Create query options, result list and status line"""
+        query_frame = ttk.Frame(self.dialog)
+        query_frame.pack(fill="x", padx=10, pady=(10, 5))
+        ttk.Label(query_frame, text="Find:").pack(side="left")
+        self.query_var = tk.StringVar()
+        self.query_entry = ttk.Entry(query_frame, textvariable=self.query_var)
+        self.query_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.query_entry.bind("<Return>", lambda e: self.next_match())
+        ttk.Button(query_frame, text="Replace...", command=self.replace).pack(side="left")
+        self.dialog.bind("<Escape>", lambda e: self.close())
+        
+        options = ttk.Frame(self.dialog)
+        options.pack(fill="x", padx=10)
+        self.mode_var = tk.StringVar(value=MODE_SUBSTRING)
+        for label, mode in (("Contains", MODE_SUBSTRING), ("Word prefix", MODE_PREFIX), ("Regex", MODE_REGEX)):
+            ttk.Radiobutton(options, text=label, variable=self.mode_var, value=mode, command=self.search).pack(side="left")
+        self.case_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Match case", variable=self.case_var, command=self.search).pack(side="left", padx=(15, 0))
+        
+        fields = ttk.Frame(self.dialog)
+        fields.pack(fill="x", padx=10, pady=(2, 5))
+        self.field_vars = {}
+        for field, label in FIELD_LABELS.items():
+            self.field_vars[field] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(fields, text=label, variable=self.field_vars[field], command=self.search).pack(side="left")
+        
+        # One row per matching document
+        results_frame = ttk.Frame(self.dialog)
+        results_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.results = ttk.Treeview(results_frame, columns=("topic", "where", "text"), show="headings", selectmode="browse")
+        self.results.heading("topic", text="Topic")
+        self.results.heading("where", text="Where")
+        self.results.heading("text", text="Text")
+        self.results.column("topic", width=170, stretch=False)
+        self.results.column("where", width=170, stretch=False)
+        self.results.column("text", width=340)
+        scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.results.yview)
+        self.results.configure(yscrollcommand=scrollbar.set)
+        self.results.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.results.bind("<<TreeviewSelect>>", self.on_result_select)
+        
+        self.status_var = tk.StringVar(value="Type to search")
+        ttk.Label(self.dialog, textvariable=self.status_var).pack(fill="x", padx=10, pady=(0, 10))
+        
+        self.query_var.trace_add("write", lambda *args: self.schedule_search())
+    
+    def set_index(self, search_index):
+        """Search another index (after a file was imported) and refresh the results"""
+        self.search_index = search_index
+        self.search()
+    
+    def schedule_search(self):
+        """Search shortly after typing stops"""
+        if self._pending is not None:
+            self.dialog.after_cancel(self._pending)
+        self._pending = self.dialog.after(SEARCH_DELAY_MS, self.search)
+    
+    def search(self):
+        """Run the query and list the matches"""
+        self._pending = None
+        query = self.query_var.get()
+        self.results.delete(*self.results.get_children())
+        self.matches = []
+        if not query:
+            self.status_var.set("Type to search")
+            return
+        if not self.search_index.built:
+            # Never block the window on the build; search once it is done
+            self.search_index.start_build()
+            self.status_var.set("Indexing topics...")
+            self._pending = self.dialog.after(INDEX_POLL_MS, self.search)
+            return
+        
+        fields = [field for field, var in self.field_vars.items() if var.get()]
+        started = time.perf_counter()
+        try:
+            self.matches = self.search_index.search(query, self.mode_var.get(), self.case_var.get(), fields)
+        except re.error as e:
+            self.status_var.set(f"Invalid regex: {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        if not self.matches and len(query) < MIN_QUERY_LENGTH:
+            self.status_var.set(f"Type at least {MIN_QUERY_LENGTH} characters")
+            return
+        
+        for position, match in enumerate(self.matches):
+            self.results.insert("", "end", iid=str(position), values=(match.topic_id, match.path, self.snippet(match)))
+        topics = len({match.topic_id for match in self.matches})
+        count = f"first {len(self.matches)}" if len(self.matches) >= MAX_RESULTS else str(len(self.matches))
+        self.status_var.set(f"{count} matches in {topics} topics ({elapsed:.1f} ms)")
+    
+    @staticmethod
+    def snippet(match) -> str:
+        """Get the matched text with some context, on one line"""
+        text = match.text
+        start = max(0, match.start - SNIPPET_CONTEXT)
+        end = match.end + SNIPPET_CONTEXT
+        snippet = text[start:end].replace("\n", " ")
+        if start > 0:
+            snippet = "…" + snippet
+        if end < len(text):
+            snippet += "…"
+        return snippet
+    
+    def on_result_select(self, event=None):
+        """Jump to the topic of the selected match"""
+        selection = self.results.selection()
+        if selection and self.on_topic:
+            self.on_topic(self.matches[int(selection[0])].topic_id)
+    
+    def next_match(self):
+        """Select the match after the current one, wrapping around"""
+        if self._pending is not None:
+            self.dialog.after_cancel(self._pending)
+            self.search()
+        if not self.matches:
+            return
+        selection = self.results.selection()
+        position = (int(selection[0]) + 1) % len(self.matches) if selection else 0
+        self.results.selection_set(str(position))
+        self.results.see(str(position))
+    
+    def replace(self):
+        """Open the replace dialog for the current query"""
+        if self.on_replace:
+            self.on_replace(self.query_var.get())
+    
+    def close(self):
+        """Close the window"""
+        if self._pending is not None:
+            self.dialog.after_cancel(self._pending)
+        self.dialog.destroy()
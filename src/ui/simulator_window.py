@@ -0,0 +1,168 @@
+"""Window for playing through conversations against a mock game state"""
+
+import json
+import tkinter as tk
+from tkinter import ttk
+
+from ..simulation.engine import DialogueSimulator
+from ..simulation.state import GameState
+
+
+# Trial outcome choices and the success chance each sets
+TRIAL_CHANCES = {"Random (50%)": 0.5, "Always succeed": 1.0, "Always fail": 0.0}
+
+
+class SimulatorWindow:
+    """Shows NPC lines and the responses available in the current state, following the canvas along"""
+    
+    def __init__(self, parent, dialogue_graph, start_topic: str, on_topic=None):
+        self.dialogue_graph = dialogue_graph
+        self.start_topic = start_topic
+        self.on_topic = on_topic  # Called with each topic entered
+        self.simulator = DialogueSimulator(dialogue_graph)
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Dialogue Simulator")
+        self.dialog.transient(parent)
+        self.dialog.geometry("640x620")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.create_widgets()
+        self.restart()
+    
+    def create_widgets(self):
+        """Create state options, transcript and response buttons"""
+        options = ttk.LabelFrame(self.dialog, text="Game State")
+        options.pack(fill="x", padx=10, pady=5)
+        
+        self.u_male_var = tk.BooleanVar(value=True)
+        self.npc_male_var = tk.BooleanVar(value=True)
+        ttk.Label(options, text="Player:").grid(row=0, column=0, sticky="w", padx=5)
+        ttk.Radiobutton(options, text="Male", variable=self.u_male_var, value=True).grid(row=0, column=1, sticky="w")
+        ttk.Radiobutton(options, text="Female", variable=self.u_male_var, value=False).grid(row=0, column=2, sticky="w")
+        ttk.Label(options, text="NPC:").grid(row=1, column=0, sticky="w", padx=5)
+        ttk.Radiobutton(options, text="Male", variable=self.npc_male_var, value=True).grid(row=1, column=1, sticky="w")
+        ttk.Radiobutton(options, text="Female", variable=self.npc_male_var, value=False).grid(row=1, column=2, sticky="w")
+        
+        ttk.Label(options, text="Days since cataclysm:").grid(row=0, column=3, sticky="w", padx=(15, 5))
+        self.days_var = tk.IntVar(value=0)
+        ttk.Spinbox(options, from_=0, to=10000, width=6, textvariable=self.days_var).grid(row=0, column=4, sticky="w")
+        ttk.Label(options, text="Trials:").grid(row=1, column=3, sticky="w", padx=(15, 5))
+        self.trial_var = tk.StringVar(value=next(iter(TRIAL_CHANCES)))
+        ttk.Combobox(
+            options, textvariable=self.trial_var, values=list(TRIAL_CHANCES), state="readonly", width=16
+        ).grid(row=1, column=4, sticky="w")
+        
+        self.unknown_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Treat unmodelled conditions as true", variable=self.unknown_var).grid(
+            row=2, column=0, columnspan=5, sticky="w", padx=5, pady=(2, 5)
+        )
+        
+        # Conversation transcript
+        transcript_frame = ttk.Frame(self.dialog)
+        transcript_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.transcript = tk.Text(transcript_frame, wrap="word", height=14, state="disabled")
+        scrollbar = ttk.Scrollbar(transcript_frame, orient="vertical", command=self.transcript.yview)
+        self.transcript.configure(yscrollcommand=scrollbar.set)
+        self.transcript.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.transcript.tag_configure("topic", foreground="#888888")
+        self.transcript.tag_configure("npc", font=("Arial", 10, "bold"))
+        self.transcript.tag_configure("player", foreground="#2E5C8A")
+        self.transcript.tag_configure("note", foreground="#D35400")
+        
+        # One button per available response
+        self.responses_frame = ttk.LabelFrame(self.dialog, text="Responses")
+        self.responses_frame.pack(fill="x", padx=10, pady=5)
+        
+        # Variables, effects and missions after the last step
+        self.state_var = tk.StringVar()
+        ttk.Label(self.dialog, textvariable=self.state_var, wraplength=600, justify="left").pack(fill="x", padx=10)
+        
+        btn_frame = ttk.Frame(self.dialog)
+        btn_frame.pack(pady=5)
+        ttk.Button(btn_frame, text="Restart", command=self.restart).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Close", command=self.close).pack(side="left", padx=5)
+    
+    def initial_state(self) -> GameState:
+        """Build the starting state from the options"""
+        try:
+            days = int(self.days_var.get())
+        except (tk.TclError, ValueError):
+            days = 0
+        return GameState(
+            u_male=self.u_male_var.get(),
+            npc_male=self.npc_male_var.get(),
+            days_since_cataclysm=days,
+            default_trial_chance=TRIAL_CHANCES.get(self.trial_var.get(), 0.5),
+            unknown_conditions=self.unknown_var.get(),
+        )
+    
+    def restart(self):
+        """Start the conversation over from the starting topic"""
+        self.transcript.configure(state="normal")
+        self.transcript.delete("1.0", tk.END)
+        self.transcript.configure(state="disabled")
+        self.show_step(self.simulator.start(self.start_topic, self.initial_state()))
+    
+    def choose(self, index: int):
+        """Pick a response and show where it leads"""
+        response = self.simulator.current.responses[index]
+        self.write(f"> {response.text}\n", "player")
+        self.show_step(self.simulator.choose(index))
+    
+    def show_step(self, step):
+        """Add a step to the transcript and list its responses"""
+        if step.message:
+            self.write(f"({step.message})\n", "note")
+        if step.topic_id:
+            self.write(f"[{step.topic_id}]\n", "topic")
+            if step.line:
+                self.write(f"{step.line}\n", "npc")
+            if self.on_topic:
+                self.on_topic(step.topic_id)
+        
+        for widget in self.responses_frame.winfo_children():
+            widget.destroy()
+        if step.ended:
+            ttk.Label(self.responses_frame, text="The conversation has ended.").pack(anchor="w", padx=5, pady=2)
+        elif not step.responses:
+            ttk.Label(self.responses_frame, text="No response is available in this state.").pack(anchor="w", padx=5, pady=2)
+        for position, response in enumerate(step.responses):
+            label = response.text
+            if response.failure is not None:
+                label = f"[{response.trial_type}] {label}"
+            ttk.Button(
+                self.responses_frame, text=label, command=lambda i=position: self.choose(i)
+            ).pack(fill="x", padx=5, pady=1)
+        self.show_state()
+    
+    def show_state(self):
+        """Summarize the variables, effects and missions of the current state"""
+        state = self.simulator.state
+        parts = []
+        for label, values in (
+            ("Player vars", state.u_vars),
+            ("NPC vars", state.npc_vars),
+            ("Player effects", list(state.u_effects)),
+            ("NPC effects", list(state.npc_effects)),
+            ("Missions", sorted(state.u_missions)),
+        ):
+            if values:
+                parts.append(f"{label}: {json.dumps(values)}")
+        conditions, effects = self.simulator.unsupported()
+        if conditions or effects:
+            parts.append(f"Not modelled: {', '.join(conditions + effects)}")
+        self.state_var.set("\n".join(parts) or "State unchanged")
+    
+    def write(self, text: str, tag: str):
+        """Append text to the read-only transcript"""
+        self.transcript.configure(state="normal")
+        self.transcript.insert(tk.END, text, tag)
+        self.transcript.configure(state="disabled")
+        self.transcript.see(tk.END)
+    
+    def close(self):
+        """Stop following graph edits and close the window"""
+        self.simulator.close()
+        self.dialog.destroy()
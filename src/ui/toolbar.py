@@ -7,7 +7,7 @@ from tkinter import ttk, filedialog, messagebox
 class Toolbar(ttk.Frame):
     """Toolbar with common actions"""
     
-    def __init__(self, parent, on_import=None, on_export=None, on_new_topic=None, on_validate=None, on_layout=None, on_untangle=None, on_zoom_in=None, on_zoom_out=None, on_zoom_reset=None, on_help=None, on_back=None):
+    def __init__(self, parent, on_import=None, on_export=None, on_new_topic=None, on_validate=None, on_layout=None, on_untangle=None, on_zoom_in=None, on_zoom_out=None, on_zoom_reset=None, on_help=None, on_back=None, on_bundle=None, on_export_image=None, on_neighbourhood=None, on_neighbourhood_hops=None, on_analyze=None, on_simulate=None, on_search=None, on_undo=None, on_redo=None, on_diff=None):
         super().__init__(parent)
         self.on_import = on_import
         self.on_export = on_export
@@ -20,6 +20,16 @@ class Toolbar(ttk.Frame):
         self.on_zoom_reset = on_zoom_reset
         self.on_help = on_help
         self.on_back = on_back
+        self.on_bundle = on_bundle
+        self.on_export_image = on_export_image
+        self.on_neighbourhood = on_neighbourhood
+        self.on_neighbourhood_hops = on_neighbourhood_hops
+        self.on_analyze = on_analyze
+        self.on_simulate = on_simulate
+        self.on_search = on_search
+        self.on_undo = on_undo
+        self.on_redo = on_redo
+        self.on_diff = on_diff
         
         self.create_widgets()
     
@@ -27,18 +37,31 @@ class Toolbar(ttk.Frame):
         """Create toolbar widgets"""
         ttk.Button(self, text="Import", command=self.import_file).pack(side="left", padx=2)
         ttk.Button(self, text="Export", command=self.export_file).pack(side="left", padx=2)
+        ttk.Button(self, text="Export Image", command=self.export_image).pack(side="left", padx=2)
         ttk.Separator(self, orient="vertical").pack(side="left", fill="y", padx=5)
         ttk.Button(self, text="← Back", command=self.go_back).pack(side="left", padx=2)
+        ttk.Button(self, text="Search", command=self.search).pack(side="left", padx=2)
         ttk.Separator(self, orient="vertical").pack(side="left", fill="y", padx=5)
         ttk.Button(self, text="New Topic", command=self.new_topic).pack(side="left", padx=2)
+        ttk.Button(self, text="Undo", command=self.undo).pack(side="left", padx=2)
+        ttk.Button(self, text="Redo", command=self.redo).pack(side="left", padx=2)
         ttk.Separator(self, orient="vertical").pack(side="left", fill="y", padx=5)
         ttk.Button(self, text="Validate", command=self.validate).pack(side="left", padx=2)
+        ttk.Button(self, text="Analyze", command=self.analyze).pack(side="left", padx=2)
+        ttk.Button(self, text="Simulate", command=self.simulate).pack(side="left", padx=2)
+        ttk.Button(self, text="Diff", command=self.diff).pack(side="left", padx=2)
         ttk.Button(self, text="Auto Layout", command=self.auto_layout).pack(side="left", padx=2)
         ttk.Button(self, text="Untangle", command=self.untangle).pack(side="left", padx=2)
         ttk.Separator(self, orient="vertical").pack(side="left", fill="y", padx=5)
         ttk.Button(self, text="Zoom In", command=self.zoom_in).pack(side="left", padx=2)
         ttk.Button(self, text="Zoom Out", command=self.zoom_out).pack(side="left", padx=2)
         ttk.Button(self, text="Reset Zoom", command=self.zoom_reset).pack(side="left", padx=2)
+        ttk.Button(self, text="Bundle Edges", command=self.bundle).pack(side="left", padx=2)
+        ttk.Button(self, text="Neighbourhood", command=self.neighbourhood).pack(side="left", padx=2)
+        self.hops_var = tk.IntVar(value=2)
+        ttk.Spinbox(
+            self, from_=1, to=6, width=3, textvariable=self.hops_var, command=self.neighbourhood_hops
+        ).pack(side="left", padx=2)
         ttk.Separator(self, orient="vertical").pack(side="left", fill="y", padx=5)
         ttk.Button(self, text="ℹ Information Atlas", command=self.show_help).pack(side="left", padx=2)
     
@@ -52,6 +75,26 @@ class Toolbar(ttk.Frame):
         if self.on_back:
             self.on_back()
     
+    def search(self):
+        """Handle search panel action"""
+        if self.on_search:
+            self.on_search()
+    
+    def bundle(self):
+        """Handle edge bundling toggle"""
+        if self.on_bundle:
+            self.on_bundle()
+    
+    def neighbourhood(self):
+        """Handle neighbourhood view toggle"""
+        if self.on_neighbourhood:
+            self.on_neighbourhood()
+    
+    def neighbourhood_hops(self):
+        """Handle neighbourhood hop count change"""
+        if self.on_neighbourhood_hops:
+            self.on_neighbourhood_hops(self.hops_var.get())
+    
     def zoom_in(self):
         """Handle zoom in action"""
         if self.on_zoom_in:
@@ -88,16 +131,52 @@ class Toolbar(ttk.Frame):
             if filename:
                 self.on_export(filename)
     
+    def export_image(self):
+        """Handle export image action"""
+        if self.on_export_image:
+            filename = filedialog.asksaveasfilename(
+                title="Export Graph Image",
+                defaultextension=".svg",
+                filetypes=[("SVG image", "*.svg"), ("PNG image", "*.png"), ("PostScript", "*.ps"), ("All files", "*.*")]
+            )
+            if filename:
+                self.on_export_image(filename)
+    
     def new_topic(self):
         """Handle new topic action"""
         if self.on_new_topic:
             self.on_new_topic()
     
+    def undo(self):
+        """Handle undo action"""
+        if self.on_undo:
+            self.on_undo()
+    
+    def redo(self):
+        """Handle redo action"""
+        if self.on_redo:
+            self.on_redo()
+    
     def validate(self):
         """Handle validate action"""
         if self.on_validate:
             self.on_validate()
     
+    def analyze(self):
+        """Handle reachability analysis toggle"""
+        if self.on_analyze:
+            self.on_analyze()
+    
+    def simulate(self):
+        """Handle dialogue simulator action"""
+        if self.on_simulate:
+            self.on_simulate()
+    
+    def diff(self):
+        """Handle diff overlay toggle"""
+        if self.on_diff:
+            self.on_diff()
+    
     def auto_layout(self):
         """Handle auto layout action"""
         if self.on_layout:
@@ -1,16 +1,24 @@
 """Helper utility functions"""
 
-from typing import Tuple
+from typing import Any, Tuple
 
+from .text_metrics import TextMetrics
 
-def calculate_node_size(text_lines: list, min_width: int = 150, min_height: int = 60) -> Tuple[int, int]:
+
+def calculate_node_size(
+    text_lines: list,
+    min_width: int = 150,
+    min_height: int = 60,
+    max_width: int = 300,
+    font: tuple = ("Arial", 9)
+) -> Tuple[int, int]:
     """Calculate node size based on content"""
     if not text_lines:
         return (min_width, min_height)
     
-    # Estimate width based on longest line
-    max_line_length = max(len(line) for line in text_lines if line)
-    width = max(min_width, min(300, max_line_length * 7 + 40))
+    # Width of the longest line as actually rendered in the given font
+    max_line_width = max((TextMetrics.measure(font, line) for line in text_lines if line), default=0)
+    width = max(min_width, min(max_width, max_line_width + 40))
     
     # Estimate height based on number of lines
     height = max(min_height, len(text_lines) * 20 + 60)
@@ -18,6 +26,21 @@ def calculate_node_size(text_lines: list, min_width: int = 150, min_height: int
     return (width, height)
 
 
+def get_preview_text(dynamic_line: Any) -> str:
+    """Get the text shown as a node's dialogue preview"""
+    if dynamic_line is None:
+        return ""
+    if isinstance(dynamic_line, str):
+        return dynamic_line
+    if isinstance(dynamic_line, dict):
+        # Conditional - show yes branch if available (which may be conditional or a list itself)
+        return get_preview_text(dynamic_line["yes"]) if "yes" in dynamic_line else str(dynamic_line)
+    if isinstance(dynamic_line, list):
+        # Array for random selection - get first item
+        return get_preview_text(dynamic_line[0]) if len(dynamic_line) > 0 else ""
+    return str(dynamic_line)
+
+
 def truncate_text(text: str, max_length: int = 40) -> str:
     """Truncate text with ellipsis"""
     if len(text) <= max_length:
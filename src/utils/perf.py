@@ -0,0 +1,117 @@
+"""Lightweight timing instrumentation with an optional structured log"""
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PerfLog:
+    """Collects timing events from any module and thread, and optionally writes them as JSON lines"""
+    
+    MAX_EVENTS = 2000  # Recent events kept in memory
+    
+    def __init__(self):
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        # Always-on aggregates per event name: [count, total ms, max ms]
+        self.totals: Dict[str, List[float]] = {}
+        self._log_file = None
+        self._lock = threading.Lock()  # Exports record from a worker thread
+    
+    def record(self, name: str, duration_ms: float, **fields) -> Dict[str, Any]:
+        """Record one timed event"""
+        event = {"name": name, "time": time.time(), "ms": round(duration_ms, 3)}
+        event.update(fields)
+        with self._lock:
+            self.events.append(event)
+            self.latest[name] = event
+            totals = self.totals.get(name)
+            if totals is None:
+                self.totals[name] = [1, duration_ms, duration_ms]
+            else:
+                totals[0] += 1
+                totals[1] += duration_ms
+                totals[2] = max(totals[2], duration_ms)
+            if self._log_file is not None:
+                self._log_file.write(json.dumps(event, default=str) + "\n")
+        return event
+    
+    @contextmanager
+    def span(self, name: str, **fields):
+        """Time a block; extra fields can be added to the yielded dict before it ends"""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, **fields)
+    
+    def timed(self, name: str, fields: Tuple[str, ...] = ()):
+        """Decorator that records every call of a function, plus the named arguments"""
+        def decorator(func):
+            signature = inspect.signature(func) if fields else None
+            
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    duration = (time.perf_counter() - start) * 1000
+                    extra = {}
+                    if signature is not None:
+                        bound = signature.bind(*args, **kwargs)
+                        bound.apply_defaults()
+                        extra = {field: bound.arguments.get(field) for field in fields}
+                    self.record(name, duration, **extra)
+            return wrapper
+        return decorator
+    
+    def last(self, prefix: str) -> Optional[Dict[str, Any]]:
+        """Get the most recent event whose name starts with prefix"""
+        with self._lock:
+            matches = [event for name, event in self.latest.items() if name.startswith(prefix)]
+        return max(matches, key=lambda event: event["time"]) if matches else None
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Get count, total, mean and max time per event name, slowest total first"""
+        with self._lock:
+            totals = [(name, tuple(values)) for name, values in self.totals.items()]
+        rows = [
+            {"name": name, "count": int(count), "total_ms": round(total, 3),
+             "mean_ms": round(total / count, 3), "max_ms": round(peak, 3)}
+            for name, (count, total, peak) in totals
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+    
+    def format_summary(self) -> str:
+        """Format the aggregate timings as a text table"""
+        lines = [f"{'name':<32} {'count':>7} {'total ms':>12} {'mean ms':>10} {'max ms':>10}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:<32} {row['count']:>7} {row['total_ms']:>12.1f} "
+                f"{row['mean_ms']:>10.2f} {row['max_ms']:>10.2f}"
+            )
+        return "\n".join(lines)
+    
+    def open_log(self, path: str) -> None:
+        """Start appending every event to a JSON-lines file"""
+        self.close_log()
+        log_file = open(path, "a", encoding="utf-8", buffering=1)
+        with self._lock:
+            self._log_file = log_file
+    
+    def close_log(self) -> None:
+        """Stop writing the structured log"""
+        with self._lock:
+            log_file, self._log_file = self._log_file, None
+        if log_file is not None:
+            log_file.close()
+
+
+# Shared instance - modules record into this
+perf = PerfLog()
@@ -0,0 +1,109 @@
+"""cProfile capture of selected editor actions"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from .perf import perf
+
+
+ACTIONS = ("import", "layout", "validate", "export")
+
+
+class Profiler:
+    """Profiles chosen actions and writes one .prof file plus a text report per run"""
+    
+    TOP_FUNCTIONS = 25  # Rows in each report
+    SUMMARY_FUNCTIONS = 5  # Hot spots per run listed in summary.txt
+    
+    def __init__(self):
+        self.directory: Optional[str] = None
+        self.actions = set()
+        self.runs = 0
+        self._active = False  # A profile is running (on any thread)
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        """Check if profiling output is configured"""
+        return self.directory is not None
+    
+    def configure(self, directory: str, actions: Iterable[str] = ACTIONS) -> None:
+        """Start writing profiles of the given actions into a directory"""
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.actions = set(actions)
+    
+    @contextmanager
+    def profile(self, action: str):
+        """Time an action, and profile it if that action was selected"""
+        # Timing is always recorded; cProfile only runs when asked for and
+        # never nests or overlaps (an import that triggers a layout, or an edit
+        # made while a background export is profiled, is not profiled again)
+        with self._lock:
+            profiling = self.enabled and action in self.actions and not self._active
+            self._active = self._active or profiling
+        if not profiling:
+            with perf.span(f"action.{action}"):
+                yield
+            return
+        
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            duration = (time.perf_counter() - start) * 1000
+            perf.record(f"action.{action}", duration, profiled=True)
+            try:
+                # Still active, so no other thread writes a profile meanwhile
+                self.write(action, profile, duration)
+            finally:
+                with self._lock:
+                    self._active = False
+    
+    def write(self, action: str, profile: cProfile.Profile, duration_ms: float) -> str:
+        """Save a profile with its report and add its hot spots to summary.txt"""
+        self.runs += 1
+        base = os.path.join(self.directory, f"{self.runs:03d}-{action}")
+        profile.dump_stats(base + ".prof")
+        
+        report = io.StringIO()
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats("cumulative").print_stats(self.TOP_FUNCTIONS)
+        stats.sort_stats("tottime").print_stats(self.TOP_FUNCTIONS)
+        with open(base + ".txt", "w", encoding="utf-8") as handle:
+            handle.write(f"{action}: {duration_ms:.1f} ms\n")
+            handle.write(report.getvalue())
+        
+        with open(os.path.join(self.directory, "summary.txt"), "a", encoding="utf-8") as handle:
+            handle.write(f"{os.path.basename(base)}: {action} took {duration_ms:.1f} ms\n")
+            for (filename, line, function), row in self.hot_spots(stats):
+                handle.write(
+                    f"    {row[2] * 1000:9.1f} ms self  {row[3] * 1000:9.1f} ms total  "
+                    f"{function} ({os.path.basename(filename)}:{line})\n"
+                )
+        return base + ".prof"
+    
+    def hot_spots(self, stats: pstats.Stats):
+        """Get the functions with the most time spent in their own code"""
+        # stats.stats maps (file, line, function) -> (calls, primitive calls, self s, total s, callers)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        return rows[:self.SUMMARY_FUNCTIONS]
+    
+    def write_timings(self) -> None:
+        """Write the always-on timing aggregates next to the profiles"""
+        if self.enabled:
+            with open(os.path.join(self.directory, "timings.txt"), "w", encoding="utf-8") as handle:
+                handle.write(perf.format_summary() + "\n")
+
+
+# Shared instance used by the UI; inactive until configure() is called
+profiler = Profiler()
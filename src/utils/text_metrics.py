@@ -0,0 +1,125 @@
+"""Cached text measurement and pixel-accurate truncation"""
+
+from typing import Any, Dict, Tuple
+
+try:
+    import tkinter as tk
+    import tkinter.font as tkfont
+except ImportError:  # Headless Python builds without Tk
+    tk = None
+    tkfont = None
+
+
+FontSpec = Tuple  # ("Arial", 9) or ("Arial", 9, "bold"), as used for canvas items
+
+
+class TextMetrics:
+    """Measures text with real Tk fonts, caching results by (font, size, string)"""
+    
+    # Width of an average character relative to the font size, used when no
+    # Tk root exists (CLI, SVG export); close to Arial's real average
+    FALLBACK_CHAR_WIDTH = 0.6
+    ELLIPSIS = "..."
+    MAX_CACHED = 20000  # Widths and truncations kept each, least recently used dropped first
+    
+    _fonts: Dict[FontSpec, object] = {}
+    _widths: Dict[Tuple[FontSpec, str], int] = {}
+    _truncated: Dict[Tuple[FontSpec, str, int], str] = {}
+    
+    @classmethod
+    def get_font(cls, font: FontSpec):
+        """Get a Tk font for the spec, or None when Tk is not running"""
+        if font in cls._fonts:
+            return cls._fonts[font]
+        tk_font = None
+        if tkfont is not None and getattr(tk, "_default_root", None) is not None:
+            try:
+                tk_font = tkfont.Font(
+                    family=font[0],
+                    size=font[1],
+                    weight="bold" if "bold" in font[2:] else "normal"
+                )
+            except (RuntimeError, tk.TclError):
+                tk_font = None
+        # Only cache real fonts so measuring switches to Tk once a window exists
+        if tk_font is not None:
+            if not cls._fonts:
+                # Drop truncations worked out with estimated widths
+                cls._widths.clear()
+                cls._truncated.clear()
+            cls._fonts[font] = tk_font
+        return tk_font
+    
+    @classmethod
+    def _remember(cls, cache: Dict, key: Tuple, value: Any) -> None:
+        """Cache a result, dropping the least recently used one when the cache is full"""
+        if len(cache) >= cls.MAX_CACHED:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = value
+    
+    @staticmethod
+    def _recall(cache: Dict, key: Tuple) -> Any:
+        """Get a cached result (None if missing), marking it as recently used"""
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+        return value
+    
+    @classmethod
+    def measure(cls, font: FontSpec, text: Any) -> int:
+        """Get the width of text in pixels"""
+        text = text if isinstance(text, str) else str(text)
+        key = (font, text)
+        width = cls._recall(cls._widths, key)
+        if width is not None:
+            return width
+        tk_font = cls.get_font(font)
+        if tk_font is not None:
+            width = tk_font.measure(text)
+            cls._remember(cls._widths, key, width)
+        else:
+            width = int(len(text) * font[1] * cls.FALLBACK_CHAR_WIDTH + 0.5)
+        return width
+    
+    @classmethod
+    def truncate(cls, font: FontSpec, text: Any, max_width: float) -> str:
+        """Shorten text with an ellipsis so it fits in max_width pixels"""
+        text = text if isinstance(text, str) else str(text)
+        max_width = int(max_width)
+        key = (font, text, max_width)
+        result = cls._recall(cls._truncated, key)
+        if result is not None:
+            return result
+        
+        tk_font = cls.get_font(font)
+        if cls.measure(font, text) <= max_width:
+            result = text
+        else:
+            # Binary search for the longest prefix that fits with the ellipsis.
+            # Prefix measurements are not cached to keep the width cache small.
+            ellipsis_width = cls.measure(font, cls.ELLIPSIS)
+            low, high = 0, len(text)
+            while low < high:
+                mid = (low + high + 1) // 2
+                prefix = text[:mid]
+                if tk_font is not None:
+                    width = tk_font.measure(prefix)
+                else:
+                    width = len(prefix) * font[1] * cls.FALLBACK_CHAR_WIDTH
+                if width + ellipsis_width <= max_width:
+                    low = mid
+                else:
+                    high = mid - 1
+            result = text[:low] + cls.ELLIPSIS
+        
+        # Estimated truncations are cheap to redo and would be wrong once Tk is running
+        if tk_font is not None:
+            cls._remember(cls._truncated, key, result)
+        return result
+    
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all cached measurements"""
+        cls._fonts.clear()
+        cls._widths.clear()
+        cls._truncated.clear()
@@ -0,0 +1,37 @@
+"""Command line layout and render"""
+
+import json
+import re
+
+from src import cli
+
+
+def write_dialogue(path):
+    topics = [
+        {"type": "talk_topic", "id": "TALK_A", "dynamic_line": "Hello",
+         "responses": [{"text": "go", "topic": "TALK_B"}]},
+        {"type": "talk_topic", "id": "TALK_B", "dynamic_line": "Bye",
+         "responses": [{"text": "bye", "topic": "TALK_DONE"}]},
+    ]
+    path.write_text(json.dumps(topics), encoding="utf-8")
+
+
+def test_render_uses_layout_written_to_output_dir(tmp_path):
+    source = tmp_path / "talk.json"
+    write_dialogue(source)
+    out = tmp_path / "out"
+    out.mkdir()
+    assert cli.main(["layout", "-q", "-j", "1", "-o", str(out), str(source)]) == cli.EXIT_OK
+    
+    # Move the laid-out topics somewhere the grid layout would never put them
+    sidecar = out / ("talk" + cli.SIDECAR_SUFFIX)
+    data = json.loads(sidecar.read_text(encoding="utf-8"))
+    data["positions"] = {"TALK_A": [5000.0, 7000.0], "TALK_B": [9000.0, 7000.0]}
+    sidecar.write_text(json.dumps(data), encoding="utf-8")
+    assert not (tmp_path / ("talk" + cli.SIDECAR_SUFFIX)).exists()
+    
+    assert cli.main(["render", "-q", "-j", "1", "-o", str(out), str(source)]) == cli.EXIT_OK
+    svg = (out / "talk.svg").read_text(encoding="utf-8")
+    view_box = re.search(r'viewBox="([^"]+)"', svg).group(1)
+    min_x, min_y = (float(value) for value in view_box.split()[:2])
+    assert min_x > 4000 and min_y > 6000
@@ -0,0 +1,158 @@
+"""Undo history and edit commands"""
+
+import pytest
+
+from src.graph.graph_manager import GraphManager
+from src.graph.history import (
+    MAX_BYTES, MAX_STEPS, Command, MoveNodes, RenameTopic, ResponseEdit, TopicFieldEdit, UndoHistory
+)
+from src.models.dialogue import DialogueGraph, DialogueTopic
+
+
+def make_graph():
+    graph = DialogueGraph()
+    graph.add_topic(DialogueTopic(id="TALK_A", dynamic_line="Hi", responses=[
+        {"text": "To B", "topic": "TALK_B"},
+        {"text": "To C", "topic": "TALK_C"},  # Dangling until something is named TALK_C
+        {"text": "Try", "trial": {"type": "LIE"}, "success": {"topic": "TALK_B"}, "failure": {"topic": "TALK_A"}},
+    ]))
+    graph.add_topic(DialogueTopic(id="TALK_B", dynamic_line="Bye", responses=[{"text": "Back", "topic": "TALK_B"}]))
+    graph.entry_points = ["TALK_B"]
+    return graph
+
+
+def targets(graph, topic_id):
+    topic = graph.topics[topic_id]
+    return [(response.get("topic"), response.get("success", {}).get("topic")) for response in topic.responses]
+
+
+class Sized(Command):
+    """Step of a fixed size"""
+    
+    def __init__(self, size):
+        self._size = size
+    
+    def do(self):
+        pass
+    
+    def undo(self):
+        pass
+    
+    def size(self):
+        return self._size
+
+
+def test_steps_past_the_count_are_dropped_oldest_first():
+    history = UndoHistory()
+    steps = [history.record(Sized(1)) for _ in range(MAX_STEPS + 5)]
+    assert len(history) == MAX_STEPS
+    assert history.size == MAX_STEPS
+    assert history.next_undo() is steps[-1]
+    for _ in range(MAX_STEPS):
+        history.undo()
+    assert not history.can_undo
+    assert history.redo() is steps[5]
+
+
+def test_steps_past_the_size_are_dropped_but_the_newest_is_kept():
+    history = UndoHistory()
+    for _ in range(3):
+        history.record(Sized(MAX_BYTES // 2))
+    assert len(history) == 2
+    assert history.size == MAX_BYTES
+    huge = history.record(Sized(MAX_BYTES * 2))
+    assert len(history) == 1
+    assert history.next_undo() is huge
+
+
+def test_recording_clears_redo():
+    history = UndoHistory()
+    history.record(Sized(1))
+    history.undo()
+    assert history.can_redo
+    history.record(Sized(1))
+    assert not history.can_redo
+
+
+def test_moves_in_one_drag_make_one_step():
+    graph = make_graph()
+    manager = GraphManager(graph)
+    manager.set_node_position("TALK_A", 0, 0)
+    manager.set_node_position("TALK_B", 10, 0)
+    history = UndoHistory()
+    for x in (1, 2, 3):
+        manager.set_node_position("TALK_A", x, 0)
+        history.record(MoveNodes(manager, {"TALK_A": ((x - 1, 0), (x, 0))}, gesture=1))
+    manager.set_node_position("TALK_B", 20, 0)
+    history.record(MoveNodes(manager, {"TALK_B": ((10, 0), (20, 0))}, gesture=1))
+    manager.set_node_position("TALK_A", 9, 9)
+    history.record(MoveNodes(manager, {"TALK_A": ((3, 0), (9, 9))}, gesture=2))
+    assert len(history) == 2
+    history.undo()
+    assert manager.node_positions["TALK_A"] == (3, 0)
+    history.undo()
+    assert manager.node_positions["TALK_A"] == (0, 0)
+    assert manager.node_positions["TALK_B"] == (10, 0)
+    history.redo()
+    assert manager.node_positions["TALK_A"] == (3, 0)
+    assert manager.node_positions["TALK_B"] == (20, 0)
+
+
+def test_field_edit_round_trip():
+    graph = make_graph()
+    history = UndoHistory()
+    history.execute(TopicFieldEdit(graph, "TALK_A", "dynamic_line", "Hi", {"u_male": True, "yes": "Sir", "no": "Ma'am"}))
+    assert graph.topics["TALK_A"].dynamic_line["yes"] == "Sir"
+    history.undo()
+    assert graph.topics["TALK_A"].dynamic_line == "Hi"
+
+
+def test_response_edit_round_trip():
+    graph = make_graph()
+    original = [dict(response) for response in graph.topics["TALK_A"].responses]
+    history = UndoHistory()
+    history.execute(ResponseEdit(graph, "TALK_A", 1, None, {"text": "New", "topic": "TALK_DONE"}))
+    history.execute(ResponseEdit(graph, "TALK_A", 0, original[0], {"text": "To B!", "topic": "TALK_B"}))
+    history.execute(ResponseEdit(graph, "TALK_A", 3, original[2], None))
+    assert [response["text"] for response in graph.topics["TALK_A"].responses] == ["To B!", "New", "To C"]
+    assert graph.get_predecessors("TALK_DONE") == {"TALK_A"}
+    while history.can_undo:
+        history.undo()
+    assert graph.topics["TALK_A"].responses == original
+    assert graph.get_predecessors("TALK_DONE") == set()
+    while history.can_redo:
+        history.redo()
+    assert [response["text"] for response in graph.topics["TALK_A"].responses] == ["To B!", "New", "To C"]
+
+
+def test_rename_round_trip_keeps_dangling_references():
+    graph = make_graph()
+    history = UndoHistory()
+    command = history.execute(RenameTopic(graph, "TALK_B", "TALK_C"))
+    assert command.rewritten == ["TALK_A", "TALK_C"]
+    assert targets(graph, "TALK_A") == [("TALK_C", None), ("TALK_C", None), (None, "TALK_C")]
+    assert targets(graph, "TALK_C") == [("TALK_C", None)]
+    assert graph.entry_points == ["TALK_C"]
+    
+    history.undo()
+    assert list(graph.topics) == ["TALK_A", "TALK_B"]
+    assert graph.topics["TALK_B"].id == "TALK_B"
+    # The response that already led to the missing TALK_C still does
+    assert targets(graph, "TALK_A") == [("TALK_B", None), ("TALK_C", None), (None, "TALK_B")]
+    assert targets(graph, "TALK_B") == [("TALK_B", None)]
+    assert graph.entry_points == ["TALK_B"]
+    assert graph.get_predecessors("TALK_C") == {"TALK_A"}
+    assert graph.get_predecessors("TALK_B") == {"TALK_A", "TALK_B"}
+    
+    history.redo()
+    assert targets(graph, "TALK_A") == [("TALK_C", None), ("TALK_C", None), (None, "TALK_C")]
+
+
+def test_rename_undo_refuses_when_the_old_id_was_taken():
+    graph = make_graph()
+    command = RenameTopic(graph, "TALK_B", "TALK_C")
+    command.do()
+    graph.add_topic(DialogueTopic(id="TALK_B"))
+    with pytest.raises(ValueError):
+        command.undo()
+    assert "TALK_C" in graph.topics
@@ -0,0 +1,31 @@
+"""Callbacks the main window hands to its panels and windows"""
+
+import ast
+import inspect
+
+from src.ui import main_window
+from src.ui.main_window import MainWindow
+
+
+def callback_names():
+    """Get the names of the self.<method> values passed as on_* keyword arguments"""
+    tree = ast.parse(inspect.getsource(main_window))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.keyword) and node.arg and node.arg.startswith("on_"):
+            value = node.value
+            if isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name) and value.value.id == "self":
+                names.add(value.attr)
+    return names
+
+
+def test_focus_topic_is_a_method():
+    # The simulator and the search panel follow topics through it
+    assert callable(getattr(MainWindow, "focus_topic", None))
+
+
+def test_every_callback_is_a_method():
+    names = callback_names()
+    assert "focus_topic" in names
+    missing = sorted(name for name in names if not callable(getattr(MainWindow, name, None)))
+    assert missing == []
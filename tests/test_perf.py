@@ -0,0 +1,42 @@
+"""Timing aggregates recorded from several threads"""
+
+import threading
+
+from src.utils.perf import PerfLog
+from src.utils.profiling import Profiler
+
+
+def test_record_from_threads_keeps_every_event():
+    log = PerfLog()
+    
+    def work():
+        for _ in range(2000):
+            log.record("export", 1.0)
+    
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert log.summary()[0]["count"] == 8000
+
+
+def test_profiles_do_not_overlap_across_threads(tmp_path):
+    profiler = Profiler()
+    profiler.configure(str(tmp_path), actions=("export", "layout"))
+    started, release = threading.Event(), threading.Event()
+    
+    def export():
+        with profiler.profile("export"):
+            started.set()
+            release.wait(5)
+    
+    thread = threading.Thread(target=export)
+    thread.start()
+    started.wait(5)
+    with profiler.profile("layout"):
+        pass
+    release.set()
+    thread.join()
+    assert profiler.runs == 1
+    assert sorted(path.name for path in tmp_path.glob("*.prof")) == ["001-export.prof"]
@@ -0,0 +1,75 @@
+"""Renaming and moving topics"""
+
+import pytest
+
+from src.models.dialogue import DialogueGraph, DialogueTopic
+
+
+def make_graph():
+    graph = DialogueGraph()
+    graph.add_topic(DialogueTopic(id="TALK_A", responses=[
+        {"text": "To B", "topic": "TALK_B"},
+        {"text": "Try", "trial": {"type": "PERSUADE"},
+         "success": {"topic": "TALK_B"}, "failure": {"topic": "TALK_B", "effect": "hostile"}},
+        {"text": "Stay", "topic": "TALK_A"},
+    ]))
+    graph.add_topic(DialogueTopic(id="TALK_B", responses=[{"text": "Back", "topic": "TALK_A"}]))
+    graph.add_topic(DialogueTopic(id="TALK_C", responses=[{"text": "Done", "topic": "TALK_DONE"}]))
+    graph.entry_points = ["TALK_A", "TALK_C"]
+    return graph
+
+
+def test_rename_rewrites_responses_and_trial_outcomes():
+    graph = make_graph()
+    paths = []
+    assert graph.rename_topic("TALK_B", "TALK_NEW", paths) == ["TALK_A"]
+    responses = graph.topics["TALK_A"].responses
+    assert responses[0]["topic"] == "TALK_NEW"
+    assert responses[1]["success"]["topic"] == "TALK_NEW"
+    assert responses[1]["failure"] == {"topic": "TALK_NEW", "effect": "hostile"}
+    assert paths == [
+        ("TALK_A", "responses/0/topic"),
+        ("TALK_A", "responses/1/success/topic"),
+        ("TALK_A", "responses/1/failure/topic"),
+    ]
+    assert list(graph.topics) == ["TALK_A", "TALK_C", "TALK_NEW"]
+    assert graph.topics["TALK_NEW"].id == "TALK_NEW"
+    assert graph.get_predecessors("TALK_NEW") == {"TALK_A"}
+    assert graph.get_predecessors("TALK_B") == set()
+    assert graph.validate_references() == []
+
+
+def test_rename_of_a_self_referencing_entry_point():
+    graph = make_graph()
+    notified = []
+    graph.add_change_listener(notified.append)
+    assert sorted(graph.rename_topic("TALK_A", "TALK_START")) == ["TALK_B", "TALK_START"]
+    assert graph.entry_points == ["TALK_START", "TALK_C"]
+    assert graph.topics["TALK_START"].responses[2]["topic"] == "TALK_START"
+    assert graph.topics["TALK_B"].responses[0]["topic"] == "TALK_START"
+    assert set(notified) == {"TALK_A", "TALK_START", "TALK_B"}
+
+
+@pytest.mark.parametrize("new_id", ["", "TALK_DONE", "TALK_NONE", "TALK_C"])
+def test_rename_rejects_empty_special_and_existing_ids(new_id):
+    graph = make_graph()
+    with pytest.raises(ValueError):
+        graph.rename_topic("TALK_B", new_id)
+    assert list(graph.topics) == ["TALK_A", "TALK_B", "TALK_C"]
+    assert graph.topics["TALK_A"].responses[0]["topic"] == "TALK_B"
+
+
+def test_rename_rejects_a_missing_topic():
+    with pytest.raises(ValueError):
+        make_graph().rename_topic("TALK_MISSING", "TALK_X")
+
+
+def test_move_topics_swaps_ids_and_entry_points_but_not_responses():
+    graph = make_graph()
+    topic_a, topic_c = graph.topics["TALK_A"], graph.topics["TALK_C"]
+    graph.move_topics({"TALK_A": "TALK_C", "TALK_C": "TALK_A"})
+    assert graph.topics["TALK_C"] is topic_a and topic_a.id == "TALK_C"
+    assert graph.topics["TALK_A"] is topic_c and topic_c.id == "TALK_A"
+    assert graph.entry_points == ["TALK_C", "TALK_A"]
+    assert graph.topics["TALK_B"].responses[0]["topic"] == "TALK_A"
+    assert graph.topics["TALK_C"].responses[0]["topic"] == "TALK_B"
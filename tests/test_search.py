@@ -0,0 +1,49 @@
+"""Trigram search index"""
+
+from src.graph.search import MODE_PREFIX, MODE_REGEX, MODE_SUBSTRING, SearchIndex
+from src.models.dialogue import DialogueGraph, DialogueTopic
+
+
+def make_graph():
+    graph = DialogueGraph()
+    graph.add_topic(DialogueTopic(id="TALK_ROAD", dynamic_line="The zombies block the road.",
+                                  responses=[{"text": "Evac shelter?", "topic": "TALK_DONE"}]))
+    graph.add_topic(DialogueTopic(id="TALK_SHELTER", dynamic_line=["Road ahead", "zombie"],
+                                  responses=[{"text": "Shelter evac", "topic": "TALK_DONE"}]))
+    return graph
+
+
+def found(index, query, mode=MODE_SUBSTRING, **options):
+    return [(match.topic_id, match.path) for match in index.search(query, mode, **options)]
+
+
+def test_background_build_indexes_topics_edited_meanwhile():
+    graph = make_graph()
+    index = SearchIndex(graph)
+    index.start_build()
+    graph.topics["TALK_ROAD"].dynamic_line = "A horde at the bridge"
+    graph.notify_topic_changed("TALK_ROAD")
+    graph.add_topic(DialogueTopic(id="TALK_NEW", dynamic_line="Bridge is out"))
+    index.build()
+    assert found(index, "bridge") == [("TALK_ROAD", "dynamic_line"), ("TALK_NEW", "dynamic_line")]
+    assert found(index, "block the road") == []
+
+
+def test_short_queries_need_a_trigram_unless_scanning():
+    index = SearchIndex(make_graph())
+    assert found(index, "oa") == []
+    assert found(index, "ro", MODE_PREFIX, fields=["line"]) == [("TALK_ROAD", "dynamic_line"), ("TALK_SHELTER", "dynamic_line/0")]
+    assert found(index, "oa", fields=["line"], full_scan=True) == [("TALK_ROAD", "dynamic_line"), ("TALK_SHELTER", "dynamic_line/0")]
+
+
+def test_words_in_separate_documents_do_not_match_a_phrase():
+    index = SearchIndex(make_graph())
+    assert found(index, "evac shelter") == [("TALK_ROAD", "responses/0/text")]
+    assert found(index, r"zombie\w* \w+", MODE_REGEX) == [("TALK_ROAD", "dynamic_line")]
+
+
+def test_anchored_regexes_match_any_document():
+    index = SearchIndex(make_graph())
+    assert found(index, r"^zombie$", MODE_REGEX) == [("TALK_SHELTER", "dynamic_line/1")]
+    assert found(index, r"\Azombie\Z", MODE_REGEX) == [("TALK_SHELTER", "dynamic_line/1")]
+    assert found(index, r"ahead(?!\s)", MODE_REGEX) == [("TALK_SHELTER", "dynamic_line/0")]
@@ -0,0 +1,123 @@
+"""Persistent maps and graph snapshots"""
+
+import json
+
+from src.models.dialogue import DialogueGraph, DialogueTopic
+from src.models.snapshot import WIDTH, PersistentMap, _Bucket
+
+
+class Key:
+    """Key with a chosen hash, to force collisions"""
+    
+    def __init__(self, name, key_hash):
+        self.name = name
+        self.key_hash = key_hash
+    
+    def __hash__(self):
+        return self.key_hash
+    
+    def __eq__(self, other):
+        return isinstance(other, Key) and other.name == self.name
+    
+    def __repr__(self):
+        return self.name
+
+
+def test_set_and_delete_with_equal_hashes():
+    a, b, c = Key("a", 7), Key("b", 7), Key("c", 7)
+    empty = PersistentMap()
+    both = empty.set(a, 1).set(b, 2)
+    assert type(both._root) is _Bucket and len(both._root.items) == 2
+    assert (both[a], both[b], len(both)) == (1, 2, 2)
+    assert both.get(c) is None and c not in both
+    
+    replaced = both.set(b, 3)
+    assert (replaced[b], both[b], len(replaced)) == (3, 2, 2)
+    
+    without_a = both.delete(a)
+    assert dict(without_a) == {b: 2} and len(without_a) == 1
+    assert both.delete(c) is both
+    assert len(without_a.delete(b)) == 0 and without_a.delete(b)._root is None
+    assert dict(both) == {a: 1, b: 2}
+
+
+def test_hashes_sharing_low_bits_branch_and_collapse_back():
+    # Same index at the first level, different at the second
+    a, b = Key("a", 3), Key("b", 3 + WIDTH)
+    tree = PersistentMap().set(a, "a").set(b, "b")
+    assert type(tree._root) is tuple
+    assert (tree[a], tree[b]) == ("a", "b")
+    
+    single = tree.delete(b)
+    # The lone bucket left moves up instead of staying under empty branches
+    assert type(single._root) is _Bucket
+    assert dict(single) == {a: "a"}
+    assert dict(tree) == {a: "a", b: "b"}
+
+
+def test_many_keys_and_shared_structure():
+    items = {f"TALK_{number}": number for number in range(2000)}
+    tree = PersistentMap(items)
+    assert len(tree) == 2000 and dict(tree) == items
+    edited = tree.set("TALK_5", -5).set("TALK_NEW", 0).delete("TALK_7")
+    assert sorted(tree.changed_keys(edited)) == ["TALK_5", "TALK_7", "TALK_NEW"]
+    assert list(tree.changed_keys(tree)) == []
+    same_value = tree.set("TALK_9", tree["TALK_9"])
+    assert list(tree.changed_keys(same_value)) == []
+    for number in range(2000):
+        tree = tree.delete(f"TALK_{number}")
+    assert len(tree) == 0 and tree._root is None
+
+
+def make_graph():
+    graph = DialogueGraph()
+    for name in ("A", "B", "C"):
+        graph.add_topic(DialogueTopic(id=f"TALK_{name}", dynamic_line=f"Line {name}",
+                                      responses=[{"text": "Next", "topic": "TALK_DONE"}]))
+    graph.entry_points = ["TALK_A"]
+    return graph
+
+
+def export(graph_or_snapshot):
+    return json.dumps(graph_or_snapshot.to_json(), indent=2)
+
+
+def test_snapshot_exports_like_the_graph_and_ignores_later_edits():
+    graph = make_graph()
+    snapshot = graph.snapshot()
+    assert export(snapshot) == export(graph)
+    saved = export(snapshot)
+    
+    topic = graph.topics["TALK_B"]
+    topic.dynamic_line = "Changed"
+    topic.responses[0]["text"] = "Changed too"
+    graph.notify_topic_changed("TALK_B")
+    graph.entry_points.append("TALK_C")
+    assert export(snapshot) == saved
+    
+    later = graph.snapshot()
+    assert export(later) == export(graph) != saved
+    # Untouched topics are shared, not copied again
+    assert later.get_topic("TALK_A") is snapshot.get_topic("TALK_A")
+    assert later.get_topic("TALK_B") is not snapshot.get_topic("TALK_B")
+    assert graph.snapshot() is later
+
+
+def test_snapshot_follows_added_removed_and_moved_topics():
+    graph = make_graph()
+    first = graph.snapshot()
+    graph.remove_topic("TALK_A")
+    graph.add_topic(DialogueTopic(id="TALK_D"))
+    second = graph.snapshot()
+    assert list(second.topics) == ["TALK_B", "TALK_C", "TALK_D"]
+    assert list(first.topics) == ["TALK_A", "TALK_B", "TALK_C"]
+    assert second.get_topic("TALK_A") is None
+    
+    graph.move_topics({"TALK_B": "TALK_C", "TALK_C": "TALK_B"})
+    graph.notify_topic_changed("TALK_B")
+    graph.notify_topic_changed("TALK_C")
+    third = graph.snapshot()
+    assert list(third.topics) == list(graph.topics)
+    assert third.get_topic("TALK_C").dynamic_line == "Line B"
+    assert export(third) == export(graph)
+    assert export(third.to_graph()) == export(graph)
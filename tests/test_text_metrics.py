@@ -0,0 +1,52 @@
+"""Node text of conditional and random dynamic lines"""
+
+import json
+
+from src import cli
+from src.utils.helpers import calculate_node_size, get_preview_text
+from src.utils.text_metrics import TextMetrics
+
+
+NESTED_LINE = {"u_male": True, "yes": {"npc_female": True, "yes": "hi", "no": "hey"}, "no": "x"}
+LIST_LINE = {"u_male": True, "yes": ["a", "b"], "no": "x"}
+
+
+def test_preview_of_nested_conditional_line():
+    assert get_preview_text(NESTED_LINE) == "hi"
+
+
+def test_preview_of_conditional_list_line():
+    assert get_preview_text(LIST_LINE) == "a"
+    assert get_preview_text([NESTED_LINE, "b"]) == "hi"
+
+
+def test_measure_and_truncate_accept_non_strings():
+    font = ("Arial", 9)
+    assert TextMetrics.measure(font, {"yes": "hi"}) == TextMetrics.measure(font, str({"yes": "hi"}))
+    assert TextMetrics.truncate(font, ["a", "b"], 1000) == "['a', 'b']"
+    assert calculate_node_size(["TALK_A", NESTED_LINE])[0] >= 150
+
+
+def test_truncation_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(TextMetrics, "MAX_CACHED", 3)
+    cache = {}
+    for number in range(10):
+        TextMetrics._remember(cache, (number,), str(number))
+    assert list(cache) == [(7,), (8,), (9,)]
+    TextMetrics._recall(cache, (7,))
+    TextMetrics._remember(cache, (10,), "10")
+    assert list(cache) == [(9,), (7,), (10,)]
+
+
+def test_layout_and_render_with_conditional_lines(tmp_path):
+    topics = [
+        {"type": "talk_topic", "id": "TALK_A", "dynamic_line": NESTED_LINE,
+         "responses": [{"text": "go", "topic": "TALK_B"}]},
+        {"type": "talk_topic", "id": "TALK_B", "dynamic_line": LIST_LINE,
+         "responses": [{"text": "bye", "topic": "TALK_DONE"}]},
+    ]
+    path = tmp_path / "talk.json"
+    path.write_text(json.dumps(topics), encoding="utf-8")
+    assert cli.main(["layout", "-q", "-j", "1", str(path)]) == cli.EXIT_OK
+    assert cli.main(["render", "-q", "-j", "1", str(path)]) == cli.EXIT_OK
+    assert (tmp_path / "talk.svg").exists()
@@ -0,0 +1,42 @@
+"""Incremental validation of duplicate topic IDs"""
+
+from src.models.dialogue import DialogueGraph, DialogueTopic
+from src.parsers.validator import DuplicateIdRule, IncrementalValidator, Validator
+
+
+def make_graph(*topic_ids):
+    graph = DialogueGraph()
+    for topic_id in topic_ids:
+        graph.add_topic(DialogueTopic(id=topic_id, dynamic_line="Hi", responses=[{"text": "Bye", "topic": "TALK_DONE"}]))
+    return graph
+
+
+def duplicates(errors):
+    return [error for error in errors if error.startswith("Duplicate topic ID")]
+
+
+def test_removing_one_of_two_duplicates_clears_the_other():
+    graph = make_graph("TALK_A", "TALK_B")
+    validator = IncrementalValidator(graph, [DuplicateIdRule()])
+    validator.validate()
+    
+    graph.topics["TALK_B"].id = "TALK_A"
+    graph.notify_topic_changed("TALK_B")
+    assert duplicates(validator.validate()) == ["Duplicate topic ID: TALK_A"]
+    
+    graph.remove_topic("TALK_A")
+    assert duplicates(validator.validate()) == []
+    assert validator.validate() == Validator.validate_graph(graph, [DuplicateIdRule()])
+
+
+def test_renaming_one_of_two_duplicates_clears_the_other_and_adding_it_back_restores_it():
+    graph = make_graph("TALK_A", "TALK_B")
+    validator = IncrementalValidator(graph, [DuplicateIdRule()])
+    graph.topics["TALK_B"].id = "TALK_A"
+    assert duplicates(validator.validate()) == ["Duplicate topic ID: TALK_A"]
+    
+    graph.rename_topic("TALK_A", "TALK_C")
+    assert duplicates(validator.validate()) == []
+    
+    graph.add_topic(DialogueTopic(id="TALK_A", dynamic_line="Again"))
+    assert duplicates(validator.validate()) == ["Duplicate topic ID: TALK_A"]